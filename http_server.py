@@ -8,7 +8,7 @@ import logging
 from typing import Any, Dict, Optional
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 import uvicorn
 import sys
@@ -143,107 +143,103 @@ async def health_check():
         "timestamp": "2025-07-12"
     }
 
-@app.get("/tools/list")
-@app.post("/tools/list")
-async def list_tools_mcp():
-    """Lista todas las herramientas en formato MCP estándar"""
-    try:
-        tools = [
-            {
-                "name": "find_class",
-                "description": "Localiza clases específicas en repositorios C# con búsqueda directa o profunda",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "repo_url": {"type": "string", "description": "URL del repositorio"},
-                        "class_name": {"type": "string", "description": "Nombre de la clase"},
-                        "search_type": {"type": "string", "enum": ["direct", "deep"], "default": "direct"}
-                    },
-                    "required": ["repo_url", "class_name"]
-                }
+# Herramientas en formato MCP: la lista es estática, así que se serializa una sola vez
+_MCP_TOOLS = [
+    {
+        "name": "find_class",
+        "description": "Localiza clases específicas en repositorios C# con búsqueda directa o profunda",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio"},
+                "class_name": {"type": "string", "description": "Nombre de la clase"},
+                "search_type": {"type": "string", "enum": ["direct", "deep"], "default": "direct"}
             },
-            {
-                "name": "get_file_content",
-                "description": "Obtiene el contenido completo de archivos",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "repo_url": {"type": "string", "description": "URL del repositorio"},
-                        "file_path": {"type": "string", "description": "Ruta del archivo"}
-                    },
-                    "required": ["repo_url", "file_path"]
-                }
+            "required": ["repo_url", "class_name"]
+        }
+    },
+    {
+        "name": "get_file_content",
+        "description": "Obtiene el contenido completo de archivos",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio"},
+                "file_path": {"type": "string", "description": "Ruta del archivo"}
             },
-            {
-                "name": "find_elements",
-                "description": "Busca elementos específicos como DTOs, Services, Controllers, Interfaces, Enums",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "repo_url": {"type": "string", "description": "URL del repositorio"},
-                        "element_type": {"type": "string", "enum": ["dto", "service", "controller", "interface", "enum"]},
-                        "element_name": {"type": "string", "description": "Nombre del elemento"}
-                    },
-                    "required": ["repo_url", "element_type", "element_name"]
-                }
+            "required": ["repo_url", "file_path"]
+        }
+    },
+    {
+        "name": "find_elements",
+        "description": "Busca elementos específicos como DTOs, Services, Controllers, Interfaces, Enums",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio"},
+                "element_type": {"type": "string", "enum": ["dto", "service", "controller", "interface", "enum"]},
+                "element_name": {"type": "string", "description": "Nombre del elemento"}
             },
-            {
-                "name": "get_solution_structure",
-                "description": "Obtiene la estructura completa de soluciones C# organizadas por namespaces",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "repo_url": {"type": "string", "description": "URL del repositorio"}
-                    },
-                    "required": ["repo_url"]
-                }
+            "required": ["repo_url", "element_type", "element_name"]
+        }
+    },
+    {
+        "name": "get_solution_structure",
+        "description": "Obtiene la estructura completa de soluciones C# organizadas por namespaces",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio"}
             },
-            {
-                "name": "git_status",
-                "description": "Obtiene el estado actual del repositorio Git",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "repo_url": {"type": "string", "description": "URL del repositorio"}
-                    },
-                    "required": ["repo_url"]
-                }
+            "required": ["repo_url"]
+        }
+    },
+    {
+        "name": "git_status",
+        "description": "Obtiene el estado actual del repositorio Git",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio"}
             },
-            {
-                "name": "git_commit",
-                "description": "Realiza commits con mensajes descriptivos",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "repo_url": {"type": "string", "description": "URL del repositorio"},
-                        "message": {"type": "string", "description": "Mensaje del commit"},
-                        "files": {"type": "array", "items": {"type": "string"}},
-                        "add_all": {"type": "boolean", "default": False}
-                    },
-                    "required": ["repo_url", "message"]
-                }
+            "required": ["repo_url"]
+        }
+    },
+    {
+        "name": "git_commit",
+        "description": "Realiza commits con mensajes descriptivos",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio"},
+                "message": {"type": "string", "description": "Mensaje del commit"},
+                "files": {"type": "array", "items": {"type": "string"}},
+                "add_all": {"type": "boolean", "default": False}
             },
-            {
-                "name": "list_files",
-                "description": "Lista archivos del repositorio con patrones y filtros",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "repo_url": {"type": "string", "description": "URL del repositorio"},
-                        "file_pattern": {"type": "string", "description": "Patrón de archivos"},
-                        "max_depth": {"type": "integer", "default": -1}
-                    },
-                    "required": ["repo_url"]
-                }
-            }
-        ]
-        
-        return {
-            "tools": tools
+            "required": ["repo_url", "message"]
         }
-    except Exception as e:
-        logger.error(f"Error listando herramientas: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    },
+    {
+        "name": "list_files",
+        "description": "Lista archivos del repositorio con patrones y filtros",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio"},
+                "file_pattern": {"type": "string", "description": "Patrón de archivos"},
+                "max_depth": {"type": "integer", "default": -1}
+            },
+            "required": ["repo_url"]
+        }
+    }
+]
+_MCP_TOOLS_BODY = json.dumps({"tools": _MCP_TOOLS}, ensure_ascii=False).encode("utf-8")
+
+@app.get("/tools/list")
+@app.post("/tools/list")
+async def list_tools_mcp():
+    """Lista todas las herramientas en formato MCP estándar"""
+    return Response(content=_MCP_TOOLS_BODY, media_type="application/json")
 
 @app.post("/tools/call")
 async def call_tool_mcp(request: dict):
@@ -1,6 +1,7 @@
 """
 Handler para operaciones de código C#
 """
+import copy
 import os
 import re
 import json
@@ -10,8 +11,104 @@ from pathlib import Path
 from services.code_analyzer import CodeAnalyzer
 from services.file_manager import FileManager
 from utils.exceptions import CodeAnalysisError, FileOperationError
+from utils.python_utils import PythonUtils
 from utils.validators import validate_class_name, validate_element_type, validate_search_type
 
+# Directorios que no contienen código fuente
+_EXCLUDED_DIRS = {'.git', 'bin', 'obj', 'packages', 'node_modules'}
+
+# Archivos que determinan el resultado del análisis de una solución
+_CS_TREE_SUFFIXES = ('.cs', '.csproj', '.sln')
+
+# Resultados por (ruta, operación, argumentos) -> (firma, resultado); se
+# descartan en orden de inserción al superar el máximo
+_RESULT_CACHE: Dict[tuple, tuple] = {}
+_RESULT_CACHE_MAX = 256
+
+def _cs_tree_signature(repo_path: str) -> Optional[str]:
+    """
+    Firma de los archivos C# de un repositorio
+    
+    Resume la ruta, el mtime y el tamaño de cada .cs/.csproj/.sln, así que
+    cambia tanto con un commit o checkout como con ediciones sin confirmar.
+    
+    Args:
+        repo_path: Ruta del repositorio
+        
+    Returns:
+        Resumen hexadecimal, o None si el árbol no se puede leer
+    """
+    return PythonUtils.source_tree_signature(
+        repo_path, suffixes=_CS_TREE_SUFFIXES, is_excluded_dir=_EXCLUDED_DIRS.__contains__
+    )
+
+def _contains_class(content: str, class_name: str) -> bool:
+    """
+    Indica si un código fuente define un tipo con el nombre dado
+    
+    Args:
+        content: Código fuente C#
+        class_name: Nombre de la clase, interfaz, record, enum o struct
+        
+    Returns:
+        True si aparece su definición
+    """
+    pattern = rf'\b(?:class|interface|record|enum|struct)\s+{re.escape(class_name)}\b'
+    return re.search(pattern, content, re.IGNORECASE | re.MULTILINE) is not None
+
+def _file_signature(path: str) -> Optional[tuple]:
+    """
+    Firma de un archivo: mtime en nanosegundos y tamaño
+    
+    Args:
+        path: Ruta del archivo
+        
+    Returns:
+        Tupla (mtime_ns, tamaño), o None si el archivo no existe
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _cache_get(key: tuple, signature: Any) -> Any:
+    """
+    Devuelve una copia del resultado cacheado si su firma sigue vigente
+    
+    La copia es profunda: los resultados tienen listas y diccionarios anidados
+    que el llamador puede modificar sin alterar la cache.
+    
+    Args:
+        key: Clave (ruta, operación, argumentos)
+        signature: Firma actual; None desactiva la cache
+        
+    Returns:
+        Copia del resultado cacheado o None
+    """
+    if signature is None:
+        return None
+    cached = _RESULT_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+    return None
+
+def _cache_put(key: tuple, signature: Any, result: Any) -> None:
+    """
+    Guarda una copia de un resultado con su firma, descartando el más antiguo si hace falta
+    
+    Args:
+        key: Clave (ruta, operación, argumentos)
+        signature: Firma con la que se calculó el resultado
+        result: Resultado a guardar
+    """
+    if signature is None:
+        return
+    _RESULT_CACHE.pop(key, None)
+    if len(_RESULT_CACHE) >= _RESULT_CACHE_MAX:
+        _RESULT_CACHE.pop(next(iter(_RESULT_CACHE)))
+    _RESULT_CACHE[key] = (signature, copy.deepcopy(result))
+
 class CodeHandler:
     """Handler para gestión y análisis de código C#"""
     
@@ -44,14 +141,24 @@ class CodeHandler:
             # Obtener directorio local del repositorio
             repo_path = await self.file_manager.get_repo_path(repo_url)
             
+            # Reutilizar el resultado si los archivos C# no han cambiado
+            cache_key = (repo_path, "find_class", class_name, search_type)
+            signature = _cs_tree_signature(repo_path)
+            cached = _cache_get(cache_key, signature)
+            if cached is not None:
+                return cached
+            
             # Búsqueda directa por nombre de archivo
+            result = None
             if search_type == "direct":
                 result = await self._direct_search(repo_path, class_name)
-                if result:
-                    return result
             
             # Búsqueda profunda en toda la solución
-            return await self._deep_search(repo_path, class_name)
+            if not result:
+                result = await self._deep_search(repo_path, class_name)
+            
+            _cache_put(cache_key, signature, result)
+            return result
             
         except Exception as e:
             raise CodeAnalysisError(f"Error buscando clase '{class_name}': {str(e)}")
@@ -71,9 +178,16 @@ class CodeHandler:
             repo_path = await self.file_manager.get_repo_path(repo_url)
             full_path = os.path.join(repo_path, file_path)
             
-            if not os.path.exists(full_path):
+            signature = _file_signature(full_path)
+            if signature is None:
                 raise FileOperationError(f"Archivo no encontrado: {file_path}")
             
+            # Reutilizar el contenido si el archivo no ha cambiado
+            cache_key = (repo_path, "get_file_content", file_path)
+            cached = _cache_get(cache_key, signature)
+            if cached is not None:
+                return cached
+            
             content = await self.file_manager.read_file(full_path)
             
             # Analizar el archivo si es C#
@@ -81,7 +195,7 @@ class CodeHandler:
             if file_path.endswith('.cs'):
                 analysis = await self.code_analyzer.analyze_file(full_path)
             
-            return {
+            result = {
                 "file_path": file_path,
                 "full_path": full_path,
                 "content": content,
@@ -90,6 +204,8 @@ class CodeHandler:
                 "analysis": analysis,
                 "encoding": "utf-8"
             }
+            _cache_put(cache_key, signature, result)
+            return result
             
         except Exception as e:
             raise FileOperationError(f"Error obteniendo contenido de '{file_path}': {str(e)}")
@@ -118,36 +234,228 @@ class CodeHandler:
             
             repo_path = await self.file_manager.get_repo_path(repo_url)
             
+            cache_key = (repo_path, "find_elements", element_type, element_name)
+            signature = _cs_tree_signature(repo_path)
+            cached = _cache_get(cache_key, signature)
+            if cached is not None:
+                return cached
+            
             # Buscar archivos C# en el repositorio
             cs_files = await self._find_cs_files(repo_path)
             
-            results = []
-            for file_path in cs_files:
+            # El análisis se reparte entre procesos para no bloquear el bucle de eventos
+            analyses = await self.code_analyzer.analyze_files(cs_files)
+            
+            results = self._collect_elements(repo_path, cs_files, analyses, element_type, element_name)
+            
+            _cache_put(cache_key, signature, results)
+            return results
+            
+        except Exception as e:
+            raise CodeAnalysisError(f"Error buscando elementos '{element_name}': {str(e)}")
+    
+    async def find_classes(
+        self, 
+        repo_url: str, 
+        class_names: List[str], 
+        search_type: str = "direct"
+    ) -> Dict[str, Any]:
+        """
+        Localiza varias clases en una sola pasada por el repositorio
+        
+        Cada archivo C# se lee y se analiza como mucho una vez para todos los
+        nombres, en lugar de una vez por llamada a find_class.
+        
+        Args:
+            repo_url: URL del repositorio
+            class_names: Nombres de las clases a buscar
+            search_type: Tipo de búsqueda ("direct" o "deep")
+            
+        Returns:
+            Diccionario nombre -> resultado de find_class, o {"error": mensaje}
+            si esa clase no es válida o no se encontró
+        """
+        try:
+            search_type = validate_search_type(search_type)
+            repo_path = await self.file_manager.get_repo_path(repo_url)
+            signature = _cs_tree_signature(repo_path)
+            
+            cs_files = None
+            contents: Dict[str, Optional[str]] = {}
+            analyses: Dict[str, Dict[str, Any]] = {}
+            
+            async def contains(file_path: str, class_name: str) -> bool:
+                if file_path not in contents:
+                    try:
+                        contents[file_path] = await self.file_manager.read_file(file_path)
+                    except Exception:
+                        contents[file_path] = None
+                content = contents[file_path]
+                return content is not None and _contains_class(content, class_name)
+            
+            async def found(file_path: str, class_name: str, found_by: str) -> Dict[str, Any]:
+                if file_path not in analyses:
+                    analyses[file_path] = await self.code_analyzer.analyze_file(file_path)
+                return {
+                    "class_name": class_name,
+                    "file_path": os.path.relpath(file_path, repo_path),
+                    "full_path": file_path,
+                    "search_type": found_by,
+                    "analysis": analyses[file_path]
+                }
+            
+            results: Dict[str, Any] = {}
+            for requested in class_names:
                 try:
-                    analysis = await self.code_analyzer.analyze_file(file_path)
-                    matches = self._filter_elements_by_type(analysis, element_type, element_name)
-                    
-                    for match in matches:
-                        relative_path = os.path.relpath(file_path, repo_path)
-                        results.append({
-                            "element_name": match["name"],
-                            "element_type": match["type"],
-                            "file_path": relative_path,
-                            "full_path": file_path,
-                            "line_number": match.get("line_number", 0),
-                            "namespace": match.get("namespace"),
-                            "modifiers": match.get("modifiers", []),
-                            "summary": match.get("summary")
-                        })
-                        
+                    class_name = validate_class_name(requested)
                 except Exception as e:
-                    # Continuar con otros archivos si uno falla
+                    results[requested] = {"error": str(e)}
                     continue
+                
+                cache_key = (repo_path, "find_class", class_name, search_type)
+                cached = _cache_get(cache_key, signature)
+                if cached is not None:
+                    results[requested] = cached
+                    continue
+                
+                if cs_files is None:
+                    cs_files = await self._find_cs_files(repo_path)
+                    by_name: Dict[str, List[str]] = {}
+                    for file_path in cs_files:
+                        by_name.setdefault(os.path.basename(file_path).lower(), []).append(file_path)
+                
+                result = None
+                if search_type == "direct":
+                    patterns = [
+                        f"{class_name}.cs",
+                        f"I{class_name}.cs",
+                        f"{class_name}Dto.cs",
+                        f"{class_name}Service.cs",
+                        f"{class_name}Controller.cs",
+                    ]
+                    for pattern in patterns:
+                        for file_path in by_name.get(pattern.lower(), []):
+                            if await contains(file_path, class_name):
+                                result = await found(file_path, class_name, "direct")
+                                break
+                        if result:
+                            break
+                
+                if not result:
+                    for file_path in cs_files:
+                        if await contains(file_path, class_name):
+                            result = await found(file_path, class_name, "deep")
+                            break
+                
+                if result:
+                    _cache_put(cache_key, signature, result)
+                    results[requested] = result
+                else:
+                    results[requested] = {"error": f"Clase '{class_name}' no encontrada en el repositorio"}
             
             return results
             
         except Exception as e:
-            raise CodeAnalysisError(f"Error buscando elementos '{element_name}': {str(e)}")
+            raise CodeAnalysisError(f"Error buscando clases: {str(e)}")
+    
+    async def find_elements_batch(
+        self, 
+        repo_url: str, 
+        element_type: str, 
+        element_names: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Busca varios elementos del mismo tipo analizando la solución una sola vez
+        
+        Args:
+            repo_url: URL del repositorio
+            element_type: Tipo de elemento a buscar
+            element_names: Nombres de los elementos (búsqueda parcial)
+            
+        Returns:
+            Diccionario nombre -> lista de elementos encontrados, o
+            {"error": mensaje} si ese nombre no es válido
+        """
+        try:
+            element_type = validate_element_type(element_type)
+            repo_path = await self.file_manager.get_repo_path(repo_url)
+            signature = _cs_tree_signature(repo_path)
+            
+            cs_files = None
+            analyses = None
+            results: Dict[str, Any] = {}
+            for requested in element_names:
+                try:
+                    element_name = validate_class_name(requested)
+                except Exception as e:
+                    results[requested] = {"error": str(e)}
+                    continue
+                
+                cache_key = (repo_path, "find_elements", element_type, element_name)
+                cached = _cache_get(cache_key, signature)
+                if cached is not None:
+                    results[requested] = cached
+                    continue
+                
+                if analyses is None:
+                    cs_files = await self._find_cs_files(repo_path)
+                    analyses = await self.code_analyzer.analyze_files(cs_files)
+                
+                matches = self._collect_elements(repo_path, cs_files, analyses, element_type, element_name)
+                _cache_put(cache_key, signature, matches)
+                results[requested] = matches
+            
+            return results
+            
+        except Exception as e:
+            raise CodeAnalysisError(f"Error buscando elementos: {str(e)}")
+    
+    def _collect_elements(
+        self, 
+        repo_path: str, 
+        cs_files: List[str], 
+        analyses: List[Optional[Dict[str, Any]]], 
+        element_type: str, 
+        element_name: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Reúne los elementos que coinciden a partir de los análisis ya hechos
+        
+        Args:
+            repo_path: Ruta del repositorio
+            cs_files: Archivos C# analizados
+            analyses: Análisis de cada archivo (None si falló)
+            element_type: Tipo de elemento
+            element_name: Nombre del elemento
+            
+        Returns:
+            Lista de elementos encontrados
+        """
+        results = []
+        for file_path, analysis in zip(cs_files, analyses):
+            if analysis is None:
+                continue
+            try:
+                matches = self._filter_elements_by_type(analysis, element_type, element_name)
+                
+                for match in matches:
+                    relative_path = os.path.relpath(file_path, repo_path)
+                    results.append({
+                        "element_name": match["name"],
+                        "element_type": match["type"],
+                        "file_path": relative_path,
+                        "full_path": file_path,
+                        "line_number": match.get("line_number", 0),
+                        "namespace": match.get("namespace"),
+                        "modifiers": match.get("modifiers", []),
+                        "summary": match.get("summary")
+                    })
+                    
+            except Exception:
+                # Continuar con otros archivos si uno falla
+                continue
+        
+        return results
     
     async def get_solution_structure(self, repo_url: str) -> Dict[str, Any]:
         """
@@ -161,6 +469,13 @@ class CodeHandler:
         """
         try:
             repo_path = await self.file_manager.get_repo_path(repo_url)
+            
+            cache_key = (repo_path, "get_solution_structure")
+            signature = _cs_tree_signature(repo_path)
+            cached = _cache_get(cache_key, signature)
+            if cached is not None:
+                return cached
+            
             cs_files = await self._find_cs_files(repo_path)
             
             structure = {
@@ -187,10 +502,12 @@ class CodeHandler:
             }
             
             # Analizar cada archivo C#
-            for file_path in cs_files:
+            analyses = await self.code_analyzer.analyze_files(cs_files)
+            for file_path, analysis in zip(cs_files, analyses):
+                if analysis is None:
+                    continue
                 try:
                     relative_path = os.path.relpath(file_path, repo_path)
-                    analysis = await self.code_analyzer.analyze_file(file_path)
                     
                     # Organizar por namespace
                     namespace = analysis.get('namespace', 'Global')
@@ -240,6 +557,7 @@ class CodeHandler:
             # Asignar archivos a proyectos
             self._assign_files_to_projects(structure)
             
+            _cache_put(cache_key, signature, structure)
             return structure
             
         except Exception as e:
@@ -324,7 +642,7 @@ class CodeHandler:
         for pattern in patterns:
             for root, dirs, files in os.walk(repo_path):
                 # Excluir directorios comunes que no contienen código fuente
-                dirs[:] = [d for d in dirs if d not in {'.git', 'bin', 'obj', 'packages', 'node_modules'}]
+                dirs[:] = [d for d in dirs if d not in _EXCLUDED_DIRS]
                 
                 for file in files:
                     if file.lower() == pattern.lower():
@@ -387,7 +705,7 @@ class CodeHandler:
         
         for root, dirs, files in os.walk(repo_path):
             # Excluir directorios irrelevantes
-            dirs[:] = [d for d in dirs if d not in {'.git', 'bin', 'obj', 'packages', 'node_modules'}]
+            dirs[:] = [d for d in dirs if d not in _EXCLUDED_DIRS]
             
             for file in files:
                 if file.endswith('.cs'):
@@ -408,21 +726,7 @@ class CodeHandler:
         """
         try:
             content = await self.file_manager.read_file(file_path)
-            
-            # Patrones para buscar definiciones de clase
-            patterns = [
-                rf'\bclass\s+{re.escape(class_name)}\b',
-                rf'\binterface\s+{re.escape(class_name)}\b',
-                rf'\brecord\s+{re.escape(class_name)}\b',
-                rf'\benum\s+{re.escape(class_name)}\b',
-                rf'\bstruct\s+{re.escape(class_name)}\b'
-            ]
-            
-            for pattern in patterns:
-                if re.search(pattern, content, re.IGNORECASE | re.MULTILINE):
-                    return True
-            
-            return False
+            return _contains_class(content, class_name)
             
         except Exception:
             return False
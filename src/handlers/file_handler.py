@@ -1,26 +1,92 @@
 """
 Handler para operaciones de archivos
 """
+import asyncio
+import fnmatch
 import os
+import re
 import shutil
-from typing import Dict, Any, Optional, List
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
+try:
+    # Opcional: google-re2 compila la unión de patrones a un autómata sin backtracking
+    import re2
+except ImportError:
+    re2 = None
+
 from services.file_manager import FileManager
 from utils.exceptions import FileOperationError
 from utils.validators import validate_file_path, validate_file_content
 
+# Pool persistente para stat/scandir/rmdir bloqueantes; los hilos se crean bajo demanda
+_IO_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 4),
+    thread_name_prefix="file_handler_io"
+)
+
+# Último sondeo Git por repositorio: (st_mtime_ns de .git/config, resultado)
+_GIT_PROBE_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+@lru_cache(maxsize=128)
+def _compile_exclude_patterns(patterns: Tuple[str, ...]):
+    """
+    Compila los patrones de exclusión en una única expresión regular
+    
+    Cada patrón excluye un nombre si coincide como glob o si aparece como
+    subcadena, igual que _matches_exclude_pattern. Se usa re2 si está
+    instalado y el patrón es compatible; si no, el módulo re estándar.
+    
+    Args:
+        patterns: Patrones de exclusión
+        
+    Returns:
+        Expresión compilada para usar con fullmatch sobre el nombre en minúsculas
+    """
+    alternatives = []
+    for pattern in patterns:
+        pattern = pattern.lower()
+        glob_regex = fnmatch.translate(pattern)
+        if glob_regex.endswith('\\Z'):
+            glob_regex = glob_regex[:-2]
+        alternatives.append(glob_regex)
+        alternatives.append('.*' + re.escape(pattern) + '.*')
+    source = '(?s:' + '|'.join(alternatives) + ')' if alternatives else '(?!)'
+    
+    if re2 is not None:
+        try:
+            # Los grupos atómicos de fnmatch solo evitan backtracking; re2 no lo necesita
+            return re2.compile(source.replace('(?>', '(?:'))
+        except Exception:
+            pass
+    return re.compile(source)
+
+@lru_cache(maxsize=None)
+def _get_winshell():
+    """Importa winshell la primera vez que se necesita (solo Windows); None si no está disponible"""
+    if sys.platform != "win32":
+        return None
+    try:
+        import winshell
+    except ImportError:
+        print("[WARNING] winshell no disponible - eliminación a papelera deshabilitada", file=sys.stderr)
+        return None
+    return winshell
+
 class FileHandler:
     async def get_file_content(self, repo_url: str, file_path: str) -> Dict[str, Any]:
-        """Obtiene el contenido de un archivo"""
+        """Obtiene el contenido de un archivo (también los errores se devuelven como texto en "content")"""
         try:
             file_path = validate_file_path(file_path, allow_absolute=True)
             repo_path = await self.file_manager.get_repo_path(repo_url)
             full_path = os.path.join(repo_path, file_path)
             if not os.path.exists(full_path):
-                return {"error": f"El archivo '{file_path}' no existe"}
+                return {"content": f"El archivo '{file_path}' no existe"}
             if not os.path.isfile(full_path):
-                return {"error": f"'{file_path}' no es un archivo"}
+                return {"content": f"'{file_path}' no es un archivo"}
             try:
                 content = await self.file_manager.read_file(full_path)
             except UnicodeDecodeError:
@@ -31,7 +97,7 @@ class FileHandler:
                     content = f.read()
             return {"content": f"Contenido de '{file_path}':\n\n{content}"}
         except Exception as e:
-            return {"error": f"Error leyendo archivo: {str(e)}"}
+            return {"content": f"Error leyendo archivo: {str(e)}"}
 
     async def create_directory(self, repo_url: str, directory_path: str) -> Dict[str, Any]:
         """Crea un nuevo directorio"""
@@ -64,19 +130,14 @@ class FileHandler:
                 return {"error": f"❌ Error: '{directory_path}' no existe"}
             if not os.path.isdir(full_path):
                 return {"error": f"❌ Error: '{directory_path}' no es un directorio"}
-            import sys
             moved_to_trash = False
-            try:
-                if sys.platform == "win32":
-                    import winshell
-                    try:
-                        winshell.delete_file(str(full_path))
-                        moved_to_trash = True
-                    except Exception:
-                        pass
-            except ImportError:
-                pass
-            import shutil
+            winshell = _get_winshell()
+            if winshell is not None:
+                try:
+                    winshell.delete_file(str(full_path))
+                    moved_to_trash = True
+                except Exception:
+                    pass
             if not moved_to_trash:
                 shutil.rmtree(full_path)
             response_text = f"✅ Directorio eliminado exitosamente\n🗑️ **Directorio eliminado:** {directory_path}\n"
@@ -100,7 +161,6 @@ class FileHandler:
                 return {"error": f"❌ Error: '{old_path}' no es un directorio"}
             if os.path.exists(full_new):
                 return {"error": f"❌ Error: '{new_path}' ya existe"}
-            import shutil
             shutil.move(full_old, full_new)
             response_text = f"✅ Directorio renombrado exitosamente\n📁 **Origen:** {old_path}\n📂 **Destino:** {new_path}\n"
             return {"message": response_text}
@@ -121,7 +181,6 @@ class FileHandler:
                 return {"error": f"❌ Error: '{source_path}' no es un archivo"}
             if os.path.exists(full_dest):
                 return {"error": f"❌ Error: '{dest_path}' ya existe"}
-            import shutil
             shutil.move(full_source, full_dest)
             response_text = f"✅ Archivo renombrado exitosamente\n📄 **Origen:** {source_path}\n📝 **Destino:** {dest_path}\n"
             return {"message": response_text}
@@ -129,15 +188,15 @@ class FileHandler:
             return {"error": f"❌ Error renombrando archivo: {str(e)}"}
 
     async def list_directory(self, repo_url: str, directory_path: str) -> Dict[str, Any]:
-        """Lista el contenido de un directorio"""
+        """Lista el contenido de un directorio (también los errores se devuelven como texto en "content")"""
         try:
             directory_path = validate_file_path(directory_path, allow_absolute=True)
             repo_path = await self.file_manager.get_repo_path(repo_url)
             full_path = os.path.join(repo_path, directory_path)
             if not os.path.exists(full_path):
-                return {"error": f"Error: El directorio '{directory_path}' no existe"}
+                return {"content": f"Error: El directorio '{directory_path}' no existe"}
             if not os.path.isdir(full_path):
-                return {"error": f"Error: '{directory_path}' no es un directorio"}
+                return {"content": f"Error: '{directory_path}' no es un directorio"}
             items = []
             for item in sorted(os.listdir(full_path)):
                 item_path = os.path.join(full_path, item)
@@ -152,7 +211,7 @@ class FileHandler:
                 content = f"Contenido de '{directory_path}':\n\n" + "\n".join(items)
             return {"content": content}
         except Exception as e:
-            return {"error": f"Error listando directorio: {str(e)}"}
+            return {"content": f"Error listando directorio: {str(e)}"}
     """Handler para gestión de archivos en repositorios"""
     
     def __init__(self):
@@ -208,6 +267,64 @@ class FileHandler:
         except Exception as e:
             raise FileOperationError(f"Error creando archivo '{file_path}': {str(e)}")
     
+    async def write_file(
+        self, 
+        repo_url: str, 
+        file_path: str, 
+        content: str,
+        repo_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Escribe un archivo creándolo si no existe o actualizándolo si ya existe
+        
+        La creación usa O_CREAT|O_EXCL, de modo que la decisión entre crear y
+        actualizar la toma el propio open sin un os.path.exists previo.
+        
+        Args:
+            repo_url: URL del repositorio
+            file_path: Ruta relativa del archivo
+            content: Contenido del archivo
+            repo_path: Ruta local del repositorio ya resuelta (opcional)
+            
+        Returns:
+            Información del archivo creado o de la actualización
+        """
+        try:
+            file_path = validate_file_path(file_path, allow_absolute=True)
+            content = validate_file_content(content, file_path)
+            
+            if repo_path is None:
+                repo_path = await self.file_manager.get_repo_path(repo_url)
+            full_path = os.path.join(repo_path, file_path)
+            
+            created = await self._run_blocking(self._create_file_exclusive_sync, full_path, content)
+            if created:
+                file_info = await self._get_file_info(full_path, file_path)
+                return {
+                    "status": "created",
+                    "message": f"Archivo creado exitosamente: {file_path}",
+                    "file_info": file_info
+                }
+            
+            # Ya existía: se actualiza con la ruta ya validada y resuelta
+            return await self._update_existing_file(full_path, file_path, content)
+            
+        except Exception as e:
+            raise FileOperationError(f"Error escribiendo archivo '{file_path}': {str(e)}")
+    
+    @staticmethod
+    def _create_file_exclusive_sync(full_path: str, content: str) -> bool:
+        """Crea el archivo con el contenido dado; devuelve False si ya existía"""
+        parent_dir = os.path.dirname(full_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        try:
+            with open(full_path, 'x', encoding='utf-8') as f:
+                f.write(content)
+        except FileExistsError:
+            return False
+        return True
+    
     async def update_file(
         self, 
         repo_url: str, 
@@ -238,32 +355,46 @@ class FileHandler:
             if not os.path.exists(full_path):
                 raise FileOperationError(f"El archivo no existe: {file_path}")
             
-            # Hacer backup del contenido anterior
-            original_content = await self.file_manager.read_file(full_path)
-            
-            # Escribir el nuevo contenido
-            await self.file_manager.write_file(full_path, content)
-            
-            # Obtener información del archivo actualizado
-            file_info = await self._get_file_info(full_path, file_path)
-            
-            return {
-                "status": "updated",
-                "message": f"Archivo actualizado exitosamente: {file_path}",
-                "file_info": file_info,
-                "changes": {
-                    "original_size": len(original_content),
-                    "new_size": len(content),
-                    "size_diff": len(content) - len(original_content),
-                    "original_lines": len(original_content.splitlines()),
-                    "new_lines": len(content.splitlines()),
-                    "lines_diff": len(content.splitlines()) - len(original_content.splitlines())
-                }
-            }
+            return await self._update_existing_file(full_path, file_path, content)
             
         except Exception as e:
             raise FileOperationError(f"Error actualizando archivo '{file_path}': {str(e)}")
     
+    async def _update_existing_file(self, full_path: str, file_path: str, content: str) -> Dict[str, Any]:
+        """
+        Sobrescribe un archivo existente con parámetros ya validados
+        
+        Args:
+            full_path: Ruta absoluta del archivo
+            file_path: Ruta relativa del archivo
+            content: Nuevo contenido del archivo
+            
+        Returns:
+            Información de la actualización
+        """
+        # Hacer backup del contenido anterior
+        original_content = await self.file_manager.read_file(full_path)
+        
+        # Escribir el nuevo contenido
+        await self.file_manager.write_file(full_path, content)
+        
+        # Obtener información del archivo actualizado
+        file_info = await self._get_file_info(full_path, file_path)
+        
+        return {
+            "status": "updated",
+            "message": f"Archivo actualizado exitosamente: {file_path}",
+            "file_info": file_info,
+            "changes": {
+                "original_size": len(original_content),
+                "new_size": len(content),
+                "size_diff": len(content) - len(original_content),
+                "original_lines": len(original_content.splitlines()),
+                "new_lines": len(content.splitlines()),
+                "lines_diff": len(content.splitlines()) - len(original_content.splitlines())
+            }
+        }
+    
     async def delete_file(self, repo_url: str, file_path: str) -> Dict[str, Any]:
         """
         Elimina un archivo del repositorio
@@ -452,6 +583,7 @@ class FileHandler:
             # Patrones por defecto a excluir
             if exclude_patterns is None:
                 exclude_patterns = ["bin", "obj", ".git", "node_modules", "packages", ".vs", "Debug", "Release"]
+            exclude_matcher = _compile_exclude_patterns(tuple(exclude_patterns))
             
             files_info = []
             total_size = 0
@@ -469,9 +601,7 @@ class FileHandler:
                     continue
                 
                 # Filtrar directorios excluidos
-                dirs[:] = [d for d in dirs if not any(
-                    self._matches_exclude_pattern(d, pattern) for pattern in exclude_patterns
-                )]
+                dirs[:] = [d for d in dirs if not exclude_matcher.fullmatch(d.lower())]
                 
                 # Añadir directorios si se solicita
                 if include_directories:
@@ -500,7 +630,7 @@ class FileHandler:
                         continue
                     
                     # Verificar si está excluido
-                    if any(self._matches_exclude_pattern(file_name, pattern) for pattern in exclude_patterns):
+                    if exclude_matcher.fullmatch(file_name.lower()):
                         continue
                     
                     file_path = os.path.join(root, file_name)
@@ -692,11 +822,12 @@ class FileHandler:
                 "can_modify_files": caps["writable"] and path_exists,
                 "can_create_new_files": caps["can_create_files"],
                 "can_delete_existing_files": caps["can_delete_files"] and caps["writable"],
-                "fully_functional": all([
-                    caps["readable"] or caps["can_create_files"],
-                    caps["can_create_files"],
-                    caps["can_delete_files"] or caps["writable"]
-                ]) and len(permissions["errors"]) == 0
+                # "readable or can_create_files" queda implícito al exigir can_create_files
+                "fully_functional": (
+                    caps["can_create_files"]
+                    and (caps["can_delete_files"] or caps["writable"])
+                    and not permissions["errors"]
+                )
             }
             
             return permissions
@@ -722,7 +853,22 @@ class FileHandler:
             "remotes_accessible": False,
             "errors": []
         }
-        
+
+        # Sondeo rápido: sin .git (directorio, o archivo en worktrees) no hace falta construir Repo
+        git_dir = os.path.join(repo_path, '.git')
+        if not os.path.exists(git_dir):
+            git_info["errors"].append("El directorio no es un repositorio Git válido")
+            return git_info
+
+        # Si .git/config no ha cambiado desde el último sondeo, reutilizar el resultado
+        try:
+            config_mtime = os.stat(os.path.join(git_dir, 'config')).st_mtime_ns
+        except OSError:
+            config_mtime = None
+        cached = _GIT_PROBE_CACHE.get(repo_path)
+        if config_mtime is not None and cached is not None and cached[0] == config_mtime:
+            return {**cached[1], "errors": list(cached[1]["errors"])}
+
         try:
             from git import Repo, InvalidGitRepositoryError
             
@@ -762,6 +908,10 @@ class FileHandler:
                 
         except ImportError:
             git_info["errors"].append("GitPython no está disponible")
+            return git_info
+        
+        if config_mtime is not None and git_info["is_git_repository"]:
+            _GIT_PROBE_CACHE[repo_path] = (config_mtime, {**git_info, "errors": list(git_info["errors"])})
         
         return git_info
     
@@ -776,11 +926,7 @@ class FileHandler:
         Returns:
             True si debe ser excluido
         """
-        import fnmatch
-        return (
-            fnmatch.fnmatch(name.lower(), pattern.lower()) or
-            pattern.lower() in name.lower()
-        )
+        return _compile_exclude_patterns((pattern,)).fullmatch(name.lower()) is not None
     
     async def _get_file_info(self, full_path: str, relative_path: str) -> Dict[str, Any]:
         """
@@ -794,7 +940,7 @@ class FileHandler:
             Información del archivo
         """
         try:
-            stat = os.stat(full_path)
+            stat = await self._run_blocking(os.stat, full_path)
             
             # Leer contenido para obtener más información
             content = await self.file_manager.read_file(full_path)
@@ -823,27 +969,55 @@ class FileHandler:
         """
         Elimina directorios vacíos hasta el directorio del repositorio
         
+        Args:
+            dir_path: Directorio a verificar
+            repo_path: Directorio raíz del repositorio
+        """
+        await self._run_blocking(self._cleanup_empty_dirs_sync, dir_path, repo_path)
+    
+    def _cleanup_empty_dirs_sync(self, dir_path: str, repo_path: str) -> None:
+        """
+        Versión bloqueante de _cleanup_empty_dirs, ejecutada en el pool de E/S
+        
         Args:
             dir_path: Directorio a verificar
             repo_path: Directorio raíz del repositorio
         """
         try:
-            # No eliminar el directorio del repositorio
-            if dir_path == repo_path:
+            relative = os.path.relpath(dir_path, repo_path)
+            
+            # No eliminar el directorio del repositorio ni nada fuera de él
+            if relative == os.curdir or relative.startswith(os.pardir):
                 return
             
-            # Verificar si el directorio está vacío
-            if os.path.exists(dir_path) and not os.listdir(dir_path):
-                os.rmdir(dir_path)
-                
-                # Recursivamente verificar el directorio padre
-                parent_dir = os.path.dirname(dir_path)
-                await self._cleanup_empty_dirs(parent_dir, repo_path)
+            # Cadena de directorios de abajo hacia arriba, sin incluir la raíz
+            parts = relative.split(os.sep)
+            chain = [os.path.join(repo_path, *parts[:i]) for i in range(len(parts), 0, -1)]
+            
+            # rmdir falla con ENOTEMPTY/ENOENT en cuanto encuentra un directorio no vacío
+            for directory in chain:
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
                 
         except Exception:
             # Ignorar errores en la limpieza de directorios
             pass
     
+    async def _run_blocking(self, func, *args):
+        """
+        Ejecuta una llamada bloqueante de sistema de archivos en el pool de E/S
+        
+        Args:
+            func: Función bloqueante
+            *args: Argumentos de la función
+            
+        Returns:
+            Resultado de la función
+        """
+        return await asyncio.get_running_loop().run_in_executor(_IO_EXECUTOR, func, *args)
+    
     def _format_file_size(self, size_bytes: int) -> str:
         """
         Formatea el tamaño del archivo en unidades legibles
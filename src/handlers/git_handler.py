@@ -4,7 +4,7 @@ Handler para operaciones Git
 from typing import Dict, List, Any, Optional
 import json
 
-from services.git_manager import GitManager
+from services.git_manager import GitManager, _clone_blocking, run_git_network
 from utils.exceptions import GitError
 from utils.validators import (
     validate_git_branch_name, 
@@ -82,6 +82,24 @@ class GitHandler:
         except Exception as e:
             raise GitError(f"Error realizando commit: {str(e)}")
     
+    async def commit_all(self, repo_url: str, message: str) -> Dict[str, Any]:
+        """
+        Añade todos los cambios y realiza el commit en un solo paso
+        
+        Args:
+            repo_url: URL del repositorio
+            message: Mensaje del commit
+            
+        Returns:
+            Información del commit realizado
+        """
+        try:
+            message = validate_commit_message(message)
+            
+            return await self.git_manager.commit_all(repo_url, message)
+        except Exception as e:
+            raise GitError(f"Error realizando commit: {str(e)}")
+    
     async def push(
         self, 
         repo_url: str, 
@@ -331,6 +349,21 @@ class GitHandler:
             return await self.git_manager.manage_remote(repo_url, action, remote_name, remote_url)
         except Exception as e:
             raise GitError(f"Error gestionando remoto: {str(e)}")
+    
+    async def list_all_refs(self, repo_url: str) -> Dict[str, Any]:
+        """
+        Lista ramas, etiquetas y remotos en una sola lectura
+        
+        Args:
+            repo_url: URL del repositorio
+            
+        Returns:
+            Diccionario con las listas "branches", "tags" y "remotes"
+        """
+        try:
+            return await self.git_manager.list_all_refs(repo_url)
+        except Exception as e:
+            raise GitError(f"Error listando referencias: {str(e)}")
 
     async def init(
         self, 
@@ -413,12 +446,7 @@ class GitHandler:
         try:
             # Si se indica carpeta destino, usarla; si no, usa la lógica interna de cache
             if dest_path:
-                from git import Repo, GitCommandError
-                import os, shutil
-                if os.path.exists(dest_path) and force:
-                    shutil.rmtree(dest_path)
-                if not os.path.exists(dest_path):
-                    Repo.clone_from(repo_url, dest_path)
+                await run_git_network(_clone_blocking, repo_url, dest_path, force)
                 return {"success": True, "path": dest_path}
             else:
                 # Usa la lógica de cache interna
@@ -3,24 +3,255 @@ Handler para operaciones de testing y gestión de proyectos Python
 """
 import os
 import asyncio
-from typing import Dict, List, Any, Optional
+import functools
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Sequence
 from pathlib import Path
 
 from services.python_service import PythonService
 from services.file_manager import FileManager
 from utils.exceptions import CodeAnalysisError, FileOperationError
-from utils.python_utils import PythonUtils
+from utils.python_utils import PythonUtils, ProjectScan
+
+# Respuestas constantes: se construyen una vez al importar el módulo
+_STATIC_ENVIRONMENT_INFO = {
+    "available_tools": PythonUtils.QUALITY_TOOLS,
+    "testing_frameworks": PythonUtils.TESTING_FRAMEWORKS
+}
+
+_COMMON_TEST_PATTERNS = PythonUtils.get_common_test_patterns()
+
+_TEST_PATTERNS_INFO = {
+    "patterns": _COMMON_TEST_PATTERNS,
+    "total": len(_COMMON_TEST_PATTERNS),
+    "testing_frameworks": PythonUtils.TESTING_FRAMEWORKS,
+    "usage_examples": [
+        "Usar -k para filtros en pytest: pytest -k 'test_calculate'",
+        "Ejecutar archivo específico: pytest test_models.py",
+        "Usar marcadores: pytest -m slow",
+        "Unittest con patrón: python -m unittest discover -p '*integration*'"
+    ]
+}
+
+_QUALITY_TOOLS_INFO = {
+    "quality_tools": {
+        "linting": [
+            {"name": "flake8", "description": "Linter completo y popular"},
+            {"name": "pylint", "description": "Linter muy detallado"}
+        ],
+        "formatting": [
+            {"name": "black", "description": "Formateador opinionado"},
+            {"name": "autopep8", "description": "Formateador basado en PEP8"}
+        ]
+    },
+    "testing_frameworks": [
+        {"name": "pytest", "description": "Framework moderno y extensible"},
+        {"name": "unittest", "description": "Framework incluido en Python"}
+    ],
+    "recommended_workflow": [
+        "1. Crear entorno virtual: python_create_venv",
+        "2. Instalar dependencias: python_install_requirements",
+        "3. Ejecutar tests: python_run_pytest o python_run_unittest",
+        "4. Linting: python_lint (flake8 recomendado)",
+        "5. Formatear: python_format (black recomendado)",
+        "6. Generar requirements: python_freeze"
+    ]
+}
+# Nombres de cada grupo ya unidos para mostrarlos en una línea
+_QUALITY_TOOLS_INFO.update({
+    "linting_names": ", ".join(tool["name"] for tool in _QUALITY_TOOLS_INFO["quality_tools"]["linting"]),
+    "formatting_names": ", ".join(tool["name"] for tool in _QUALITY_TOOLS_INFO["quality_tools"]["formatting"]),
+    "testing_names": ", ".join(framework["name"] for framework in _QUALITY_TOOLS_INFO["testing_frameworks"])
+})
+
+# Sondeos del intérprete por proyecto: clave -> (instante monotónico, resultado)
+_ENV_PROBE_CACHE: Dict[str, tuple] = {}
+_ENV_PROBE_TTL = 300.0
+
+# Resultados de linting: (proyecto, venv, linter, formateado) -> (firma del árbol, resultado)
+_LINT_CACHE: Dict[tuple, tuple] = {}
+_LINT_CACHE_MAX = 64
+
+# Pool propio para recorrer el proyecto: el executor por defecto del bucle es
+# compartido y puede estar ocupado por otras tareas bloqueantes
+_FS_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fs-scan")
+
+def _wrap_errors(prefix: str):
+    """
+    Convierte los errores de un método del handler en CodeAnalysisError
+    
+    Un CodeAnalysisError se propaga tal cual (sin volver a envolverlo); el
+    resto se envuelve con el prefijo y conserva la causa original. Admite
+    corrutinas y generadores asíncronos.
+    
+    Args:
+        prefix: Texto que precede al mensaje del error original
+    """
+    def decorator(func):
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def gen_wrapper(*args, **kwargs):
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                except CodeAnalysisError:
+                    raise
+                except Exception as e:
+                    raise CodeAnalysisError(f"{prefix}: {e}") from e
+            return gen_wrapper
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except CodeAnalysisError:
+                raise
+            except Exception as e:
+                raise CodeAnalysisError(f"{prefix}: {e}") from e
+        return wrapper
+    return decorator
+
+@dataclass
+class ResolvedPaths:
+    """Rutas de una operación, construidas una sola vez al inicio del método"""
+    repo: str
+    project: str
+    venv: Optional[str] = None
+    extras: Dict[str, str] = field(default_factory=dict)
+
+def _env_probe_key(repo_path: Optional[str]) -> str:
+    """Clave de _ENV_PROBE_CACHE: la ruta resuelta del repositorio (no la del subproyecto)"""
+    return os.fspath(repo_path) if repo_path else "<global>"
+
+def _invalidate_env_probe(repo_path: Optional[str], venv_path: Optional[str]) -> None:
+    """
+    Descarta sondeos de entorno y resultados de linting afectados por una instalación o un nuevo venv
+    
+    Args:
+        repo_path: Ruta resuelta del repositorio, la misma con la que se guardó el sondeo
+        venv_path: Entorno virtual modificado; None si se tocó el intérprete global
+    """
+    if venv_path is None:
+        # El intérprete global aparece en todos los sondeos
+        _ENV_PROBE_CACHE.clear()
+    else:
+        _ENV_PROBE_CACHE.pop(_env_probe_key(repo_path), None)
+    # Un linter o plugin recién instalado puede cambiar el resultado aunque el código no cambie
+    for key in [key for key in _LINT_CACHE if key[1] == venv_path]:
+        _LINT_CACHE.pop(key, None)
 
 class PythonTestHandler:
     """Handler para gestión de proyectos Python y ejecución de tests"""
     
+    # Servicios compartidos por todas las instancias, para que sus caches también lo sean
+    _shared_services = None
+    
+    # Análisis por proyecto: ruta -> (firma del directorio, ProjectScan)
+    _scan_cache: Dict[str, tuple] = {}
+    
     def __init__(self):
-        self.python_service = PythonService()
-        self.file_manager = FileManager()
-        self.python_utils = PythonUtils()
+        if PythonTestHandler._shared_services is None:
+            PythonTestHandler._shared_services = (PythonService(), FileManager(), PythonUtils())
+        self.python_service, self.file_manager, self.python_utils = PythonTestHandler._shared_services
+    
+    # Rutas locales ya resueltas: repo_url -> ruta
+    _repo_path_cache: Dict[str, str] = {}
+    
+    async def _run_blocking(self, func, *args):
+        """
+        Ejecuta una llamada bloqueante de sistema de archivos en el pool dedicado
+        
+        Args:
+            func: Función bloqueante
+            *args: Argumentos de la función
+            
+        Returns:
+            Resultado de la función
+        """
+        return await asyncio.get_running_loop().run_in_executor(_FS_EXECUTOR, func, *args)
+    
+    async def _get_repo_path(self, repo_url: str) -> str:
+        """
+        Resuelve la ruta local del repositorio, memorizando el resultado
+        
+        Una ruta memorizada solo se reutiliza si el directorio sigue existiendo.
+        
+        Args:
+            repo_url: URL del repositorio o ruta local
+            
+        Returns:
+            Ruta local del repositorio
+        """
+        cached = self._repo_path_cache.get(repo_url)
+        if cached is not None and os.path.isdir(cached):
+            return cached
+        
+        repo_path = await self.file_manager.get_repo_path(repo_url)
+        # Sin URL se usa el directorio actual, que puede cambiar entre llamadas
+        if repo_url and repo_url.strip():
+            self._repo_path_cache[repo_url] = repo_path
+        return repo_path
+    
+    async def _resolve_paths(self, repo_url: str, base_path: str = "", venv_name: str = None,
+                             extra_files: Sequence[str] = ()) -> ResolvedPaths:
+        """
+        Resuelve de una vez las rutas que usa una operación
+        
+        Args:
+            repo_url: URL del repositorio
+            base_path: Subdirectorio del proyecto
+            venv_name: Nombre del entorno virtual (opcional)
+            extra_files: Archivos relativos al proyecto
+            
+        Returns:
+            Rutas del repositorio, proyecto, entorno virtual y archivos extra
+        """
+        repo = os.fspath(await self._get_repo_path(repo_url))
+        project = os.path.join(repo, base_path) if base_path else repo
+        return ResolvedPaths(
+            repo=repo,
+            project=project,
+            venv=os.path.join(project, venv_name) if venv_name else None,
+            extras={name: os.path.join(project, name) for name in extra_files}
+        )
+    
+    def _scan_project_cached(self, project_path: str, copy_files: bool = True) -> ProjectScan:
+        """
+        Analiza el proyecto reutilizando el último recorrido si no cambió
+        
+        La firma es la de PythonUtils.project_signature.
+        
+        Args:
+            project_path: Directorio del proyecto
+            copy_files: Si copiar las listas de archivos; sin ellas python_files queda vacío
+            
+        Returns:
+            Resultado del recorrido del proyecto
+        """
+        signature = self.python_utils.project_signature(project_path)
+        if signature is None:
+            return self.python_utils.scan_project(project_path)
+        
+        cached = self._scan_cache.get(project_path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, self.python_utils.scan_project(project_path))
+            self._scan_cache[project_path] = cached
+        
+        scan = cached[1]
+        return ProjectScan(
+            python_files={kind: list(files) for kind, files in scan.python_files.items()} if copy_files else {},
+            testing_framework=scan.testing_framework,
+            requirements=scan.requirements,
+            venv_dirs=list(scan.venv_dirs),
+            file_summary=dict(scan.file_summary)
+        )
     
     # === Gestión de Entorno ===
     
+    @_wrap_errors("Error verificando entorno Python")
     async def check_python_environment(self, repo_url: str = None) -> Dict[str, Any]:
         """
         Verifica el entorno Python disponible
@@ -31,21 +262,29 @@ class PythonTestHandler:
         Returns:
             Información del entorno Python
         """
-        try:
-            # Obtener directorio del proyecto si hay repo
-            project_path = None
-            if repo_url:
-                project_path = await self.file_manager.get_repo_path(repo_url)
+        # Obtener directorio del proyecto si hay repo
+        project_path = None
+        if repo_url:
+            project_path = await self._get_repo_path(repo_url)
+        
+        async def probe_environment() -> Dict[str, Any]:
+            # El intérprete cambia poco: reutilizar el sondeo reciente sin lanzar subprocesos
+            cache_key = _env_probe_key(project_path)
+            cached = _ENV_PROBE_CACHE.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < _ENV_PROBE_TTL:
+                return cached[1]
             
             # Verificar entorno con timeout más agresivo
             try:
-                result = await asyncio.wait_for(
+                probe = await asyncio.wait_for(
                     self.python_service.check_python_environment(project_path),
                     timeout=15.0  # Reducido a 15 segundos para mejor experiencia
                 )
+                _ENV_PROBE_CACHE[cache_key] = (time.monotonic(), probe)
+                return probe
             except asyncio.TimeoutError:
                 # Return basic environment info if timeout
-                result = {
+                return {
                     "python_version": "Available (timeout protection)",
                     "pip_version": "Available (timeout protection)",
                     "python_executable": "python",
@@ -53,62 +292,55 @@ class PythonTestHandler:
                     "has_python": True,
                     "has_pip": True
                 }
-            
+        
+        async def collect_project_info() -> Dict[str, Any]:
             # Agregar información adicional del proyecto con timeout protection
-            project_info = {}
-            if project_path and os.path.exists(project_path):
-                try:
-                    # Buscar archivos Python con timeout reducido
-                    python_files = await asyncio.wait_for(
-                        asyncio.get_event_loop().run_in_executor(
-                            None, self.python_utils.find_python_files, project_path
-                        ),
-                        timeout=5.0  # Reducido a 5 segundos para mejor experiencia
-                    )
-                    
-                    # Detectar framework de testing (quick operation)
-                    testing_framework = self.python_utils.detect_testing_framework(project_path)
-                    
-                    # Parsear requirements si existe (quick operation)
-                    requirements_path = os.path.join(project_path, "requirements.txt")
-                    requirements_info = self.python_utils.parse_requirements_file(requirements_path)
-                    
-                    project_info = {
-                        "python_files": python_files,
-                        "testing_framework": testing_framework,
-                        "requirements": requirements_info,
-                        "file_summary": {
-                            "source_files": len(python_files.get("source_files", [])),
-                            "test_files": len(python_files.get("test_files", [])),
-                            "config_files": len(python_files.get("config_files", [])),
-                            "other_files": len(python_files.get("other_files", []))
-                        }
-                    }
-                except asyncio.TimeoutError:
-                    project_info = {
-                        "python_files": {"source_files": [], "test_files": [], "config_files": [], "other_files": []},
-                        "testing_framework": "Unknown (timeout)",
-                        "requirements": {"packages": [], "file_exists": False},
-                        "file_summary": {"source_files": 0, "test_files": 0, "config_files": 0, "other_files": 0}
-                    }
-                except Exception:
-                    project_info = {
-                        "python_files": {"source_files": [], "test_files": [], "config_files": [], "other_files": []},
-                        "testing_framework": "Unknown (error)",
-                        "requirements": {"packages": [], "file_exists": False},
-                        "file_summary": {"source_files": 0, "test_files": 0, "config_files": 0, "other_files": 0}
+            if not (project_path and os.path.exists(project_path)):
+                return {}
+            try:
+                # Un único recorrido: archivos, framework de testing y requirements
+                scan = await asyncio.wait_for(
+                    self._run_blocking(self._scan_project_cached, project_path),
+                    timeout=5.0  # Reducido a 5 segundos para mejor experiencia
+                )
+                python_files = scan.python_files
+                
+                return {
+                    "python_files": python_files,
+                    "testing_framework": scan.testing_framework,
+                    "requirements": scan.requirements,
+                    "file_summary": {
+                        "source_files": len(python_files.get("source_files", [])),
+                        "test_files": len(python_files.get("test_files", [])),
+                        "config_files": len(python_files.get("config_files", [])),
+                        "other_files": len(python_files.get("other_files", []))
                     }
-            
-            return {
-                "environment": result,
-                "project": project_info,
-                "available_tools": self.python_utils.QUALITY_TOOLS,
-                "testing_frameworks": self.python_utils.TESTING_FRAMEWORKS
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error verificando entorno Python: {str(e)}")
+                }
+            except asyncio.TimeoutError:
+                return {
+                    "python_files": {"source_files": [], "test_files": [], "config_files": [], "other_files": []},
+                    "testing_framework": "Unknown (timeout)",
+                    "requirements": {"packages": [], "file_exists": False},
+                    "file_summary": {"source_files": 0, "test_files": 0, "config_files": 0, "other_files": 0}
+                }
+            except Exception:
+                return {
+                    "python_files": {"source_files": [], "test_files": [], "config_files": [], "other_files": []},
+                    "testing_framework": "Unknown (error)",
+                    "requirements": {"packages": [], "file_exists": False},
+                    "file_summary": {"source_files": 0, "test_files": 0, "config_files": 0, "other_files": 0}
+                }
+        
+        # El sondeo del intérprete (subprocesos) y el recorrido del proyecto (disco) son independientes
+        result, project_info = await asyncio.gather(probe_environment(), collect_project_info())
+        
+        return {
+            "environment": result,
+            "project": project_info,
+            **_STATIC_ENVIRONMENT_INFO
+        }
     
+    @_wrap_errors("Error creando entorno virtual")
     async def create_virtual_environment(self, repo_url: str, venv_name: str = "venv", 
                                        base_path: str = "") -> Dict[str, Any]:
         """
@@ -122,41 +354,34 @@ class PythonTestHandler:
         Returns:
             Información del entorno creado
         """
-        try:
-            # Validar nombre del entorno
-            venv_name = self.python_utils.validate_venv_name(venv_name)
-            
-            # Obtener directorio del repositorio
-            repo_path = await self.file_manager.get_repo_path(repo_url)
-            
-            # Construir ruta del proyecto
-            if base_path:
-                project_path = os.path.join(repo_path, base_path)
-            else:
-                project_path = repo_path
-            
-            # Crear entorno virtual
-            result = await self.python_service.create_virtual_environment(project_path, venv_name)
-            
-            # Obtener comandos de activación
-            activation_commands = self.python_utils.get_venv_activation_command(result["venv_path"])
-            
-            return {
-                "success": True,
-                "message": result["message"],
-                "venv_name": venv_name,
-                "venv_path": result["venv_path"],
-                "project_path": project_path,
-                "activation_commands": activation_commands,
-                "python_executable": result["python_executable"],
-                "output": result["output"]
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error creando entorno virtual: {str(e)}")
+        # Validar nombre del entorno
+        venv_name = self.python_utils.validate_venv_name(venv_name)
+        
+        # Resolver ruta del proyecto
+        paths = await self._resolve_paths(repo_url, base_path)
+        project_path = paths.project
+        
+        # Crear entorno virtual
+        result = await self.python_service.create_virtual_environment(project_path, venv_name)
+        _invalidate_env_probe(paths.repo, result["venv_path"])
+        
+        # Obtener comandos de activación
+        activation_commands = self.python_utils.get_venv_activation_command(result["venv_path"])
+        
+        return {
+            "success": True,
+            "message": result["message"],
+            "venv_name": venv_name,
+            "venv_path": result["venv_path"],
+            "project_path": project_path,
+            "activation_commands": activation_commands,
+            "python_executable": result["python_executable"],
+            "output": result["output"]
+        }
     
     # === Gestión de Dependencias ===
     
+    @_wrap_errors("Error instalando paquetes")
     async def install_packages(self, repo_url: str, packages: List[str], 
                              venv_name: str = None, base_path: str = "") -> Dict[str, Any]:
         """
@@ -171,37 +396,26 @@ class PythonTestHandler:
         Returns:
             Resultado de la instalación
         """
-        try:
-            # Obtener directorio del repositorio
-            repo_path = await self.file_manager.get_repo_path(repo_url)
-            
-            # Construir ruta del proyecto
-            if base_path:
-                project_path = os.path.join(repo_path, base_path)
-            else:
-                project_path = repo_path
-            
-            # Construir ruta del entorno virtual si se especifica
-            venv_path = None
-            if venv_name:
-                venv_path = os.path.join(project_path, venv_name)
-            
-            # Instalar paquetes
-            result = await self.python_service.install_packages(packages, venv_path)
-            
-            return {
-                "success": True,
-                "message": result["message"],
-                "packages": packages,
-                "venv_name": venv_name,
-                "venv_path": venv_path,
-                "project_path": project_path,
-                "output": result["output"]
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error instalando paquetes: {str(e)}")
+        # Resolver rutas del repositorio, proyecto y entorno virtual
+        paths = await self._resolve_paths(repo_url, base_path, venv_name)
+        project_path, venv_path = paths.project, paths.venv
+        
+        # Instalar paquetes
+        result = await self.python_service.install_packages(packages, venv_path)
+        _invalidate_env_probe(paths.repo, venv_path)
+        
+        return {
+            "success": True,
+            "message": result["message"],
+            "packages": result["packages"],
+            "venv_name": venv_name,
+            "venv_display": venv_name or "Sistema",
+            "venv_path": venv_path,
+            "project_path": project_path,
+            "output": result["output"]
+        }
     
+    @_wrap_errors("Error instalando requirements")
     async def install_requirements(self, repo_url: str, requirements_file: str = "requirements.txt", 
                                  venv_name: str = None, base_path: str = "") -> Dict[str, Any]:
         """
@@ -216,48 +430,42 @@ class PythonTestHandler:
         Returns:
             Resultado de la instalación
         """
+        # Resolver rutas del proyecto, requirements y entorno virtual
+        paths = await self._resolve_paths(repo_url, base_path, venv_name, (requirements_file,))
+        project_path, venv_path = paths.project, paths.venv
+        full_requirements_path = paths.extras[requirements_file]
+        
+        # Parsear archivo requirements para información (su stat hace de comprobación de existencia)
         try:
-            # Obtener directorio del repositorio
-            repo_path = await self.file_manager.get_repo_path(repo_url)
-            
-            # Construir ruta del proyecto
-            if base_path:
-                project_path = os.path.join(repo_path, base_path)
-            else:
-                project_path = repo_path
-            
-            # Construir ruta completa del requirements
-            full_requirements_path = os.path.join(project_path, requirements_file)
-            
-            if not os.path.exists(full_requirements_path):
-                raise CodeAnalysisError(f"Archivo requirements no encontrado: {requirements_file}")
-            
-            # Construir ruta del entorno virtual si se especifica
-            venv_path = None
-            if venv_name:
-                venv_path = os.path.join(project_path, venv_name)
-            
+            requirements_info = self.python_utils.parse_requirements_file(full_requirements_path, missing_ok=False)
+        except FileNotFoundError:
+            raise CodeAnalysisError(f"Archivo requirements no encontrado: {requirements_file}")
+        
+        # Sin paquetes no hace falta arrancar pip ni su resolver
+        if requirements_info["total_packages"] == 0:
+            result = {
+                "message": f"No hay paquetes que instalar en {requirements_file}",
+                "output": ""
+            }
+        else:
             # Instalar desde requirements
             result = await self.python_service.install_packages([], venv_path, full_requirements_path)
-            
-            # Parsear archivo requirements para información
-            requirements_info = self.python_utils.parse_requirements_file(full_requirements_path)
-            
-            return {
-                "success": True,
-                "message": result["message"],
-                "requirements_file": requirements_file,
-                "packages_installed": requirements_info["total_packages"],
-                "venv_name": venv_name,
-                "venv_path": venv_path,
-                "project_path": project_path,
-                "requirements_info": requirements_info,
-                "output": result["output"]
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error instalando requirements: {str(e)}")
+            _invalidate_env_probe(paths.repo, venv_path)
+        
+        return {
+            "success": True,
+            "message": result["message"],
+            "requirements_file": requirements_file,
+            "packages_installed": requirements_info["total_packages"],
+            "venv_name": venv_name,
+            "venv_display": venv_name or "Sistema",
+            "venv_path": venv_path,
+            "project_path": project_path,
+            "requirements_info": requirements_info,
+            "output": result["output"]
+        }
     
+    @_wrap_errors("Error generando requirements")
     async def generate_requirements(self, repo_url: str, venv_name: str = None, 
                                   base_path: str = "") -> Dict[str, Any]:
         """
@@ -271,43 +479,32 @@ class PythonTestHandler:
         Returns:
             Resultado de la generación
         """
-        try:
-            # Obtener directorio del repositorio
-            repo_path = await self.file_manager.get_repo_path(repo_url)
-            
-            # Construir ruta del proyecto
-            if base_path:
-                project_path = os.path.join(repo_path, base_path)
-            else:
-                project_path = repo_path
-            
-            # Construir ruta del entorno virtual si se especifica
-            venv_path = None
-            if venv_name:
-                venv_path = os.path.join(project_path, venv_name)
-            
-            # Generar requirements
-            result = await self.python_service.generate_requirements(project_path, venv_path)
-            
-            return {
-                "success": True,
-                "message": result["message"],
-                "requirements_file": result["requirements_file"],
-                "package_count": result["package_count"],
-                "venv_name": venv_name,
-                "venv_path": venv_path,
-                "project_path": project_path,
-                "content": result["content"]
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error generando requirements: {str(e)}")
+        # Resolver rutas del repositorio, proyecto y entorno virtual
+        paths = await self._resolve_paths(repo_url, base_path, venv_name)
+        project_path, venv_path = paths.project, paths.venv
+        
+        # Generar requirements
+        result = await self.python_service.generate_requirements(project_path, venv_path)
+        
+        return {
+            "success": True,
+            "message": result["message"],
+            "requirements_file": result["requirements_file"],
+            "package_count": result["package_count"],
+            "venv_name": venv_name,
+            "venv_display": venv_name or "Sistema",
+            "venv_path": venv_path,
+            "project_path": project_path,
+            "content": result["content"]
+        }
     
     # === Testing ===
     
+    @_wrap_errors("Error ejecutando tests pytest")
     async def run_tests_pytest(self, repo_url: str, test_path: str = ".", 
                              venv_name: str = None, test_pattern: str = None,
-                             collect_coverage: bool = False, verbose: bool = False) -> Dict[str, Any]:
+                             collect_coverage: bool = False, verbose: bool = False,
+                             include_formatted: bool = True) -> Dict[str, Any]:
         """
         Ejecuta tests usando pytest
         
@@ -318,56 +515,51 @@ class PythonTestHandler:
             test_pattern: Patrón de tests específicos
             collect_coverage: Si recopilar coverage
             verbose: Salida verbose
+            include_formatted: Si formatear la salida; si es False, "output" es None
             
         Returns:
             Resultados de los tests
         """
-        try:
-            # Obtener directorio del repositorio
-            repo_path = await self.file_manager.get_repo_path(repo_url)
-            
-            # Construir rutas
-            if test_path == ".":
-                full_test_path = repo_path
-            else:
-                full_test_path = os.path.join(repo_path, test_path)
-            
-            # Construir ruta del entorno virtual si se especifica
-            venv_path = None
-            if venv_name:
-                venv_path = os.path.join(repo_path, venv_name)
-            
-            # Ejecutar tests
-            result = await self.python_service.run_tests_pytest(
-                full_test_path, venv_path, test_pattern, collect_coverage, verbose
-            )
-            
-            # Formatear salida
-            formatted_output = self.python_utils.format_test_output(result["output"], "pytest")
-            
-            return {
-                "success": result["success"],
-                "message": result["message"],
-                "framework": "pytest",
-                "test_path": test_path,
-                "pattern": test_pattern,
-                "coverage": collect_coverage,
-                "verbose": verbose,
-                "venv_name": venv_name,
-                "output": formatted_output,
-                "raw_output": result["output"],
-                "analysis": result["analysis"],
-                "test_summary": result["analysis"]["summary"],
-                "failed_tests": result["analysis"]["failed_tests"],
-                "success_rate": result["analysis"]["success_rate"]
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error ejecutando tests pytest: {str(e)}")
+        # Resolver rutas del repositorio y del entorno virtual
+        paths = await self._resolve_paths(repo_url, venv_name=venv_name)
+        venv_path = paths.venv
+        full_test_path = paths.repo if test_path == "." else os.path.join(paths.repo, test_path)
+        
+        # Ejecutar tests
+        result = await self.python_service.run_tests_pytest(
+            full_test_path, venv_path, test_pattern, collect_coverage, verbose, include_formatted
+        )
+        
+        return self._pytest_response(result, test_path, test_pattern, collect_coverage, verbose, venv_name,
+                                     include_formatted)
     
+    @staticmethod
+    def _pytest_response(result: Dict[str, Any], test_path: str, test_pattern: Optional[str],
+                         collect_coverage: bool, verbose: bool, venv_name: Optional[str],
+                         include_formatted: bool = True) -> Dict[str, Any]:
+        """Construye la respuesta de run_tests_pytest a partir del resultado del servicio"""
+        # La salida ya viene formateada línea a línea desde el servicio
+        return {
+            "success": result["success"],
+            "message": result["message"],
+            "framework": "pytest",
+            "test_path": test_path,
+            "pattern": test_pattern,
+            "coverage": collect_coverage,
+            "verbose": verbose,
+            "venv_name": venv_name,
+            "output": result["formatted_output"] if include_formatted else None,
+            "raw_output": result["output"],
+            "analysis": result["analysis"],
+            "test_summary": result["analysis"]["summary"],
+            "failed_tests": result["analysis"]["failed_tests"],
+            "success_rate": result["analysis"]["success_rate"]
+        }
+    
+    @_wrap_errors("Error ejecutando tests unittest")
     async def run_tests_unittest(self, repo_url: str, test_path: str = ".", 
                                venv_name: str = None, test_pattern: str = None,
-                               verbose: bool = False) -> Dict[str, Any]:
+                               verbose: bool = False, include_formatted: bool = True) -> Dict[str, Any]:
         """
         Ejecuta tests usando unittest
         
@@ -377,56 +569,46 @@ class PythonTestHandler:
             venv_name: Nombre del entorno virtual (opcional)
             test_pattern: Patrón de tests específicos
             verbose: Salida verbose
+            include_formatted: Si formatear la salida; si es False, "output" es None
             
         Returns:
             Resultados de los tests
         """
-        try:
-            # Obtener directorio del repositorio
-            repo_path = await self.file_manager.get_repo_path(repo_url)
-            
-            # Construir rutas
-            if test_path == ".":
-                full_test_path = repo_path
-            else:
-                full_test_path = os.path.join(repo_path, test_path)
-            
-            # Construir ruta del entorno virtual si se especifica
-            venv_path = None
-            if venv_name:
-                venv_path = os.path.join(repo_path, venv_name)
-            
-            # Ejecutar tests
-            result = await self.python_service.run_tests_unittest(
-                full_test_path, venv_path, test_pattern, verbose
-            )
-            
-            # Formatear salida
-            formatted_output = self.python_utils.format_test_output(result["output"], "unittest")
-            
-            return {
-                "success": result["success"],
-                "message": result["message"],
-                "framework": "unittest",
-                "test_path": test_path,
-                "pattern": test_pattern,
-                "verbose": verbose,
-                "venv_name": venv_name,
-                "output": formatted_output,
-                "raw_output": result["output"],
-                "analysis": result["analysis"],
-                "test_summary": result["analysis"]["summary"],
-                "failed_tests": result["analysis"]["failed_tests"],
-                "success_rate": result["analysis"]["success_rate"]
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error ejecutando tests unittest: {str(e)}")
+        # Resolver rutas del repositorio y del entorno virtual
+        paths = await self._resolve_paths(repo_url, venv_name=venv_name)
+        venv_path = paths.venv
+        full_test_path = paths.repo if test_path == "." else os.path.join(paths.repo, test_path)
+        
+        # Ejecutar tests
+        result = await self.python_service.run_tests_unittest(
+            full_test_path, venv_path, test_pattern, verbose, include_formatted
+        )
+        
+        # La salida ya viene formateada línea a línea desde el servicio
+        formatted_output = result["formatted_output"] if include_formatted else None
+        
+        return {
+            "success": result["success"],
+            "message": result["message"],
+            "framework": "unittest",
+            "test_path": test_path,
+            "pattern": test_pattern,
+            "verbose": verbose,
+            "venv_name": venv_name,
+            "output": formatted_output,
+            "raw_output": result["output"],
+            "analysis": result["analysis"],
+            "test_summary": result["analysis"]["summary"],
+            "failed_tests": result["analysis"]["failed_tests"],
+            "success_rate": result["analysis"]["success_rate"]
+        }
     
     # === Análisis de Código ===
     
+    @_wrap_errors("Error ejecutando linting")
     async def run_linting(self, repo_url: str, linter: str = "flake8", 
-                        venv_name: str = None, base_path: str = "") -> Dict[str, Any]:
+                        venv_name: str = None, base_path: str = "",
+                        include_formatted: bool = True) -> Dict[str, Any]:
         """
         Ejecuta linting de código Python
         
@@ -435,47 +617,49 @@ class PythonTestHandler:
             linter: Herramienta de linting (flake8, pylint)
             venv_name: Nombre del entorno virtual (opcional)
             base_path: Subdirectorio del proyecto
+            include_formatted: Si formatear la salida; si es False, "output" es None
             
         Returns:
             Resultados del linting
         """
-        try:
-            # Obtener directorio del repositorio
-            repo_path = await self.file_manager.get_repo_path(repo_url)
-            
-            # Construir ruta del proyecto
-            if base_path:
-                project_path = os.path.join(repo_path, base_path)
-            else:
-                project_path = repo_path
-            
-            # Construir ruta del entorno virtual si se especifica
-            venv_path = None
-            if venv_name:
-                venv_path = os.path.join(project_path, venv_name)
-            
-            # Ejecutar linting
-            result = await self.python_service.run_linting(project_path, venv_path, linter)
-            
-            # Formatear salida
-            formatted_output = self.python_utils.format_lint_output(result["output"], linter)
-            
-            return {
-                "success": result["success"],
-                "message": result["message"],
-                "linter": linter,
-                "project_path": base_path or "(directorio completo)",
-                "venv_name": venv_name,
-                "output": formatted_output,
-                "raw_output": result["output"],
-                "analysis": result["analysis"],
-                "total_issues": result["analysis"]["total_issues"],
-                "issue_types": result["analysis"]["issue_types"]
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error ejecutando linting: {str(e)}")
+        # Resolver rutas del repositorio, proyecto y entorno virtual
+        paths = await self._resolve_paths(repo_url, base_path, venv_name)
+        project_path, venv_path = paths.project, paths.venv
+        
+        # Con el árbol sin cambios desde el último linting, su resultado sigue siendo válido
+        cache_key = (project_path, venv_path, linter, include_formatted)
+        signature = await self._run_blocking(self.python_utils.source_tree_signature, project_path)
+        cached = _LINT_CACHE.get(cache_key)
+        if signature is not None and cached is not None and cached[0] == signature:
+            return dict(cached[1])
+        
+        # Ejecutar linting
+        result = await self.python_service.run_linting(project_path, venv_path, linter, include_formatted)
+        
+        # La salida ya viene formateada línea a línea desde el servicio
+        formatted_output = result["formatted_output"] if include_formatted else None
+        
+        response = {
+            "success": result["success"],
+            "message": result["message"],
+            "linter": linter,
+            "project_path": base_path or "(directorio completo)",
+            "venv_name": venv_name,
+            "venv_display": venv_name or "Sistema",
+            "output": formatted_output,
+            "raw_output": result["output"],
+            "analysis": result["analysis"],
+            "total_issues": result["analysis"]["total_issues"],
+            "issue_types": result["analysis"]["issue_types"]
+        }
+        # La firma se tomó antes de ejecutar: una edición durante el linting invalida el resultado
+        if signature is not None:
+            if cache_key not in _LINT_CACHE and len(_LINT_CACHE) >= _LINT_CACHE_MAX:
+                _LINT_CACHE.pop(next(iter(_LINT_CACHE)))
+            _LINT_CACHE[cache_key] = (signature, response)
+        return dict(response)
     
+    @_wrap_errors("Error formateando código")
     async def format_code(self, repo_url: str, formatter: str = "black", 
                         venv_name: str = None, base_path: str = "") -> Dict[str, Any]:
         """
@@ -490,82 +674,57 @@ class PythonTestHandler:
         Returns:
             Resultado del formateo
         """
-        try:
-            # Obtener directorio del repositorio
-            repo_path = await self.file_manager.get_repo_path(repo_url)
-            
-            # Construir ruta del proyecto
-            if base_path:
-                project_path = os.path.join(repo_path, base_path)
-            else:
-                project_path = repo_path
-            
-            # Construir ruta del entorno virtual si se especifica
-            venv_path = None
-            if venv_name:
-                venv_path = os.path.join(project_path, venv_name)
-            
-            # Formatear código
-            result = await self.python_service.format_code(project_path, venv_path, formatter)
-            
-            return {
-                "success": result["success"],
-                "message": result["message"],
-                "formatter": formatter,
-                "project_path": base_path or "(directorio completo)",
-                "venv_name": venv_name,
-                "output": result["output"],
-                "error": result.get("error", "")
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error formateando código: {str(e)}")
+        # Resolver rutas del repositorio, proyecto y entorno virtual
+        paths = await self._resolve_paths(repo_url, base_path, venv_name)
+        project_path, venv_path = paths.project, paths.venv
+        
+        # Formatear código
+        result = await self.python_service.format_code(project_path, venv_path, formatter)
+        
+        return {
+            "success": result["success"],
+            "message": result["message"],
+            "formatter": formatter,
+            "project_path": base_path or "(directorio completo)",
+            "venv_name": venv_name,
+            "venv_display": venv_name or "Sistema",
+            "output": result["output"],
+            "error": result.get("error", "")
+        }
     
     # === Información y Utilidades ===
     
-    async def detect_project_structure(self, repo_url: str) -> Dict[str, Any]:
+    @_wrap_errors("Error analizando estructura")
+    async def detect_project_structure(self, repo_url: str, summary_only: bool = False) -> Dict[str, Any]:
         """
         Analiza la estructura del proyecto Python
         
         Args:
             repo_url: URL del repositorio
+            summary_only: Si omitir las listas de archivos y devolver solo su recuento
             
         Returns:
             Información sobre la estructura del proyecto
         """
-        try:
-            # Obtener directorio del repositorio
-            repo_path = await self.file_manager.get_repo_path(repo_url)
-            
-            # Buscar archivos Python
-            python_files = self.python_utils.find_python_files(repo_path)
-            
-            # Detectar framework de testing
-            testing_framework = self.python_utils.detect_testing_framework(repo_path)
-            
-            # Parsear requirements si existe
-            requirements_path = os.path.join(repo_path, "requirements.txt")
-            requirements_info = self.python_utils.parse_requirements_file(requirements_path)
-            
-            # Buscar entornos virtuales
-            env_result = await self.python_service._check_virtual_environments(repo_path)
-            
-            return {
-                "python_files": python_files,
-                "file_summary": {
-                    "source_files": len(python_files["source_files"]),
-                    "test_files": len(python_files["test_files"]),
-                    "config_files": len(python_files["config_files"]),
-                    "other_files": len(python_files["other_files"])
-                },
-                "testing_framework": testing_framework,
-                "requirements": requirements_info,
-                "virtual_environments": env_result,
-                "project_path": repo_path
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error analizando estructura: {str(e)}")
+        # Obtener directorio del repositorio
+        repo_path = await self._get_repo_path(repo_url)
+        
+        # Un único recorrido: archivos, framework de testing, requirements y entornos virtuales
+        scan = await self._run_blocking(self._scan_project_cached, repo_path, not summary_only)
+        
+        # Validar solo los entornos virtuales vistos en el recorrido
+        env_result = await self.python_service._check_virtual_environments(repo_path, scan.venv_dirs)
+        
+        structure = {
+            "file_summary": scan.file_summary,
+            "testing_framework": scan.testing_framework,
+            "requirements": scan.requirements,
+            "virtual_environments": env_result,
+            "project_path": repo_path
+        }
+        if summary_only:
+            return structure
+        return {"python_files": scan.python_files, **structure}
     
     async def get_test_patterns(self) -> Dict[str, Any]:
         """
@@ -574,23 +733,7 @@ class PythonTestHandler:
         Returns:
             Lista de patrones comunes
         """
-        try:
-            common_patterns = PythonUtils.get_common_test_patterns()
-            
-            return {
-                "patterns": common_patterns,
-                "total": len(common_patterns),
-                "testing_frameworks": PythonUtils.TESTING_FRAMEWORKS,
-                "usage_examples": [
-                    "Usar -k para filtros en pytest: pytest -k 'test_calculate'",
-                    "Ejecutar archivo específico: pytest test_models.py",
-                    "Usar marcadores: pytest -m slow",
-                    "Unittest con patrón: python -m unittest discover -p '*integration*'"
-                ]
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error obteniendo patrones: {str(e)}")
+        return _TEST_PATTERNS_INFO
     
     async def get_quality_tools_info(self) -> Dict[str, Any]:
         """
@@ -599,31 +742,4 @@ class PythonTestHandler:
         Returns:
             Información sobre herramientas de linting, formateo, etc.
         """
-        try:
-            return {
-                "quality_tools": {
-                    "linting": [
-                        {"name": "flake8", "description": "Linter completo y popular"},
-                        {"name": "pylint", "description": "Linter muy detallado"}
-                    ],
-                    "formatting": [
-                        {"name": "black", "description": "Formateador opinionado"},
-                        {"name": "autopep8", "description": "Formateador basado en PEP8"}
-                    ]
-                },
-                "testing_frameworks": [
-                    {"name": "pytest", "description": "Framework moderno y extensible"},
-                    {"name": "unittest", "description": "Framework incluido en Python"}
-                ],
-                "recommended_workflow": [
-                    "1. Crear entorno virtual: python_create_venv",
-                    "2. Instalar dependencias: python_install_requirements",
-                    "3. Ejecutar tests: python_run_pytest o python_run_unittest",
-                    "4. Linting: python_lint (flake8 recomendado)",
-                    "5. Formatear: python_format (black recomendado)",
-                    "6. Generar requirements: python_freeze"
-                ]
-            }
-            
-        except Exception as e:
-            raise CodeAnalysisError(f"Error obteniendo información de herramientas: {str(e)}")
+        return _QUALITY_TOOLS_INFO
@@ -1,269 +1,305 @@
 from pathlib import Path
-import sys
+from collections import deque
+from functools import lru_cache
 import os
+import re
+import fnmatch
+import shutil
+import errno
+import stat as stat_module
 from typing import List
 from mcp.types import TextContent
 
-if sys.platform == "win32":
-    try:
-        import winshell
-    except ImportError:
-        winshell = None
-        print("[WARNING] winshell no disponible - eliminación a papelera deshabilitada", file=sys.stderr)
-
 
 from handlers.file_handler import FileHandler
+from mixin_git import _invalidate_git_status
+from utils.serialization import dumps_json
+from utils.tool_errors import tool_error_response
+
+# Rutas locales ya resueltas: repo_url -> ruta
+# (a nivel de módulo porque el servidor no encadena los __init__ de los mixins)
+_REPO_PATH_CACHE = {}
+
+def _format_result(result, key: str = None) -> str:
+    """Devuelve result[key] si el handler lo incluye; si no, serializa el resultado como JSON"""
+    if key is not None and isinstance(result, dict) and key in result:
+        return result[key]
+    if isinstance(result, (dict, list)):
+        return dumps_json(result)
+    return str(result)
+
+@lru_cache(maxsize=256)
+def _compile_glob(pattern: str):
+    """Compila un patrón glob reutilizando la expresión entre llamadas (normcase como fnmatch.fnmatch)"""
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
+def _copy_file_blocking(source_path: str, dest_path: str):
+    """
+    Copia un archivo con llamadas bloqueantes (se ejecuta en el pool de E/S)
+    
+    Returns:
+        Tupla (mensaje de error o None, tamaño del archivo copiado)
+    """
+    source = Path(source_path)
+    dest = Path(dest_path)
+    
+    if not source.exists():
+        return f"❌ Error: '{source_path}' no existe", 0
+    
+    if not source.is_file():
+        return f"❌ Error: '{source_path}' no es un archivo", 0
+    
+    # Crear directorio destino si no existe
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    
+    if dest.is_dir():
+        dest = dest / source.name
+    _copy_file_data(source, dest)
+    shutil.copystat(source, dest)
+    return None, dest.stat().st_size
+
+def _copy_file_data(source: Path, dest: Path) -> None:
+    """
+    Copia el contenido de un archivo dentro del kernel cuando es posible
+    
+    En Linux usa copy_file_range (que además permite reflink en Btrfs/XFS);
+    si no está disponible o el sistema de archivos no lo admite, recurre a
+    shutil.copyfile, que a su vez usa sendfile en Linux.
+    """
+    if dest.exists() and os.path.samefile(source, dest):
+        raise shutil.SameFileError(f"{source} y {dest} son el mismo archivo")
+    
+    # Archivos que declaran tamaño 0 (p. ej. de /proc) pueden tener contenido: van por shutil
+    if hasattr(os, "copy_file_range") and source.stat().st_size > 0:
+        try:
+            with open(source, "rb") as src, open(dest, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining <= 0:
+                    return
+        except OSError as e:
+            # EXDEV, ENOSYS, EOPNOTSUPP, EINVAL...: el kernel o el sistema de archivos no lo admite
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL, errno.ETXTBSY):
+                raise
+    
+    shutil.copyfile(source, dest)
 
 class FileAdapterMixin:
+    async def _cached_repo_path(self, repo_url: str) -> str:
+        """Resuelve la ruta local del repositorio reutilizándola mientras el directorio siga existiendo"""
+        cached = _REPO_PATH_CACHE.get(repo_url)
+        if cached is not None and os.path.isdir(cached):
+            return cached
+
+        repo_path = await self.file_handler.file_manager.get_repo_path(repo_url)
+        # Sin URL se usa el directorio actual, que puede cambiar entre llamadas
+        if repo_url and repo_url.strip():
+            _REPO_PATH_CACHE[repo_url] = repo_path
+        return repo_path
+
+    async def _after_file_change(self, repo_url: str, *paths: str) -> None:
+        """Descarta el git status cacheado de los repositorios que contienen las rutas modificadas"""
+        repo_path = await self._cached_repo_path(repo_url)
+        for path in paths:
+            _invalidate_git_status(os.path.join(repo_path, path))
+
+    @tool_error_response("❌ Error listando archivos del repositorio")
     async def _list_repository_files(self, repo_url: str, file_pattern: str = None, include_directories: bool = False, exclude_patterns: list = None, max_depth: int = 10) -> List[TextContent]:
         """Lista archivos del repositorio usando FileHandler (wrapper avanzado)"""
-        try:
-            result = await self.file_handler.list_repository_files(
-                repo_url=repo_url,
-                file_pattern=file_pattern,
-                include_directories=include_directories,
-                exclude_patterns=exclude_patterns,
-                max_depth=max_depth
-            )
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error listando archivos del repositorio: {str(e)}")]
+        result = await self.file_handler.list_repository_files(
+            repo_url=repo_url,
+            file_pattern=file_pattern,
+            include_directories=include_directories,
+            exclude_patterns=exclude_patterns,
+            max_depth=max_depth
+        )
+        return [TextContent(type="text", text=_format_result(result))]
 
+    @tool_error_response("❌ Error verificando permisos en el repositorio")
     async def _check_repository_permissions(self, repo_url: str, target_path: str = None) -> List[TextContent]:
         """Verifica permisos en el repositorio usando FileHandler (wrapper avanzado)"""
-        try:
-            result = await self.file_handler.check_repository_permissions(
-                repo_url=repo_url,
-                target_path=target_path
-            )
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error verificando permisos en el repositorio: {str(e)}")]
+        result = await self.file_handler.check_repository_permissions(
+            repo_url=repo_url,
+            target_path=target_path
+        )
+        return [TextContent(type="text", text=_format_result(result))]
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.file_handler = FileHandler()
 
+    @tool_error_response("Error leyendo archivo")
     async def _get_file_content(self, repo_url: str, file_path: str) -> List[TextContent]:
         """Obtiene el contenido de un archivo delegando en FileHandler"""
-        try:
-            result = await self.file_handler.get_file_content(repo_url, file_path)
-            if isinstance(result, dict) and "content" in result:
-                return [TextContent(type="text", text=result["content"])]
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"Error leyendo archivo: {str(e)}")]
+        result = await self.file_handler.get_file_content(repo_url, file_path)
+        return [TextContent(type="text", text=result["content"])]
     
+    @tool_error_response("Error listando directorio")
     async def _list_directory(self, repo_url: str, directory_path: str) -> List[TextContent]:
         """Lista el contenido de un directorio delegando en FileHandler"""
-        try:
-            result = await self.file_handler.list_directory(repo_url, directory_path)
-            if isinstance(result, dict) and "content" in result:
-                return [TextContent(type="text", text=result["content"])]
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"Error listando directorio: {str(e)}")]
+        result = await self.file_handler.list_directory(repo_url, directory_path)
+        return [TextContent(type="text", text=result["content"])]
 
+    @tool_error_response("❌ Error creando directorio")
     async def _create_directory(self, repo_url: str, directory_path: str) -> List[TextContent]:
         """Crea un nuevo directorio delegando en FileHandler"""
-        try:
-            result = await self.file_handler.create_directory(repo_url, directory_path)
-            if isinstance(result, dict) and "message" in result:
-                return [TextContent(type="text", text=result["message"])]
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error creando directorio: {str(e)}")]
+        result = await self.file_handler.create_directory(repo_url, directory_path)
+        return [TextContent(type="text", text=_format_result(result, "message"))]
 
+    @tool_error_response("❌ Error escribiendo archivo")
     async def _set_file_content_enhanced(self, repo_url: str, file_path: str, content: str, create_backup: bool = True) -> List[TextContent]:
         """Establece el contenido de un archivo - crea si no existe, actualiza si existe"""
+        repo_path = await self._cached_repo_path(repo_url)
         try:
-            # Obtener directorio del repositorio
-            repo_path = await self.file_handler.file_manager.get_repo_path(repo_url)
-            full_path = os.path.join(repo_path, file_path)
-            
-            # Verificar si el archivo existe para decidir crear o actualizar
-            if os.path.exists(full_path):
-                # Archivo existe - actualizar
-                result = await self.file_handler.update_file(repo_url, file_path, content)
-            else:
-                # Archivo no existe - crear
-                result = await self.file_handler.create_file(repo_url, file_path, content)
-                
-            if isinstance(result, dict) and "message" in result:
-                return [TextContent(type="text", text=result["message"])]
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error escribiendo archivo: {str(e)}")]
+            result = await self.file_handler.write_file(repo_url, file_path, content, repo_path=repo_path)
+        finally:
+            _invalidate_git_status(os.path.join(repo_path, file_path))
+        return [TextContent(type="text", text=_format_result(result, "message"))]
 
+    @tool_error_response("❌ Error renombrando directorio")
     async def _rename_directory(self, repo_url: str, old_path: str, new_path: str) -> List[TextContent]:
         """Renombra un directorio delegando en FileHandler"""
         try:
             result = await self.file_handler.rename_directory(repo_url, old_path, new_path)
-            if isinstance(result, dict) and "message" in result:
-                return [TextContent(type="text", text=result["message"])]
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error renombrando directorio: {str(e)}")]
+        finally:
+            await self._after_file_change(repo_url, old_path, new_path)
+        return [TextContent(type="text", text=_format_result(result, "message"))]
 
+    @tool_error_response("❌ Error eliminando directorio")
     async def _delete_directory(self, repo_url: str, directory_path: str) -> List[TextContent]:
         """Elimina un directorio delegando en FileHandler"""
         try:
             result = await self.file_handler.delete_directory(repo_url, directory_path)
-            if isinstance(result, dict) and "message" in result:
-                return [TextContent(type="text", text=result["message"])]
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error eliminando directorio: {str(e)}")]
+        finally:
+            await self._after_file_change(repo_url, directory_path)
+        return [TextContent(type="text", text=_format_result(result, "message"))]
 
+    @tool_error_response("❌ Error renombrando archivo")
     async def _rename_file(self, repo_url: str, source_path: str, dest_path: str) -> List[TextContent]:
         """Renombra un archivo delegando en FileHandler"""
         try:
             result = await self.file_handler.rename_file(repo_url, source_path, dest_path)
-            if isinstance(result, dict) and "message" in result:
-                return [TextContent(type="text", text=result["message"])]
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error renombrando archivo: {str(e)}")]
+        finally:
+            await self._after_file_change(repo_url, source_path, dest_path)
+        return [TextContent(type="text", text=_format_result(result, "message"))]
 
+    @tool_error_response("❌ Error eliminando archivo")
     async def _delete_file(self, repo_url: str, file_path: str) -> List[TextContent]:
         """Elimina un archivo delegando en FileHandler"""
         try:
             result = await self.file_handler.delete_file(repo_url, file_path)
-            if isinstance(result, dict) and "message" in result:
-                return [TextContent(type="text", text=result["message"])]
-            return [TextContent(type="text", text=str(result))]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error eliminando archivo: {str(e)}")]
+        finally:
+            await self._after_file_change(repo_url, file_path)
+        return [TextContent(type="text", text=_format_result(result, "message"))]
 
+    @tool_error_response("❌ Error copiando archivo")
     async def _copy_file(self, source_path: str, dest_path: str) -> List[TextContent]:
         """Copia un archivo"""
         try:
-            from pathlib import Path
-            import shutil
-            
-            source = Path(source_path)
-            dest = Path(dest_path)
-            
-            if not source.exists():
-                return [TextContent(type="text", text=f"❌ Error: '{source_path}' no existe")]
-            
-            if not source.is_file():
-                return [TextContent(type="text", text=f"❌ Error: '{source_path}' no es un archivo")]
-            
-            # Crear directorio destino si no existe
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            
-            shutil.copy2(source, dest)
-            size = dest.stat().st_size
-            
-            response_text = f"✅ Archivo copiado exitosamente\n"
-            response_text += f"📄 **Origen:** {source_path}\n"
-            response_text += f"📝 **Destino:** {dest_path}\n"
-            response_text += f"📊 **Tamaño:** {size} bytes\n"
-            
-            return [TextContent(type="text", text=response_text)]
-            
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error copiando archivo: {str(e)}")]
+            error, size = await self.file_handler._run_blocking(_copy_file_blocking, source_path, dest_path)
+        finally:
+            _invalidate_git_status(dest_path)
+        if error:
+            return [TextContent(type="text", text=error)]
+        
+        response_text = f"✅ Archivo copiado exitosamente\n"
+        response_text += f"📄 **Origen:** {source_path}\n"
+        response_text += f"📝 **Destino:** {dest_path}\n"
+        response_text += f"📊 **Tamaño:** {size} bytes\n"
+        
+        return [TextContent(type="text", text=response_text)]
 
+    @tool_error_response("❌ Error verificando permisos")
     async def _check_permissions(self, target_path: str) -> List[TextContent]:
         """Verifica permisos de un archivo o directorio"""
         try:
-            from pathlib import Path
-            import os
-            
-            path = Path(target_path)
-            
-            if not path.exists():
-                return [TextContent(type="text", text=f"❌ Error: '{target_path}' no existe")]
-            
-            # Verificar permisos
-            readable = os.access(path, os.R_OK)
-            writable = os.access(path, os.W_OK)
-            executable = os.access(path, os.X_OK)
-            
-            response_text = f"✅ Permisos de '{target_path}':\n\n"
-            response_text += f"📝 **Lectura:** {'✅' if readable else '❌'}\n"
-            response_text += f"✏️ **Escritura:** {'✅' if writable else '❌'}\n"
-            response_text += f"🔧 **Ejecución:** {'✅' if executable else '❌'}\n"
-            
-            # Información adicional
-            stat = path.stat()
-            if path.is_file():
-                response_text += f"📊 **Tamaño:** {stat.st_size} bytes\n"
-            
-            return [TextContent(type="text", text=response_text)]
-            
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error verificando permisos: {str(e)}")]
+            stat = os.stat(target_path)
+        except FileNotFoundError:
+            return [TextContent(type="text", text=f"❌ Error: '{target_path}' no existe")]
+        
+        # Verificar permisos (os.access tiene en cuenta ACLs y privilegios, que st_mode no refleja)
+        readable = os.access(target_path, os.R_OK)
+        writable = os.access(target_path, os.W_OK)
+        executable = os.access(target_path, os.X_OK)
+        
+        response_text = f"✅ Permisos de '{target_path}':\n\n"
+        response_text += f"📝 **Lectura:** {'✅' if readable else '❌'}\n"
+        response_text += f"✏️ **Escritura:** {'✅' if writable else '❌'}\n"
+        response_text += f"🔧 **Ejecución:** {'✅' if executable else '❌'}\n"
+        
+        # Información adicional
+        if stat_module.S_ISREG(stat.st_mode):
+            response_text += f"📊 **Tamaño:** {stat.st_size} bytes\n"
+        
+        return [TextContent(type="text", text=response_text)]
 
+    @tool_error_response("❌ Error listando archivos")
     async def _list_files(self, directory_path: str, file_pattern: str = None, include_directories: bool = False, max_depth: int = 1) -> List[TextContent]:
         """Lista archivos con filtros avanzados"""
-        try:
-            from pathlib import Path
-            import fnmatch
+        path = Path(directory_path)
 
-            path = Path(directory_path)
+        if not path.exists():
+            return [TextContent(type="text", text=f"❌ Error: '{directory_path}' no existe")]
 
-            if not path.exists():
-                return [TextContent(type="text", text=f"❌ Error: '{directory_path}' no existe")]
+        if not path.is_dir():
+            return [TextContent(type="text", text=f"❌ Error: '{directory_path}' no es un directorio")]
 
-            if not path.is_dir():
-                return [TextContent(type="text", text=f"❌ Error: '{directory_path}' no es un directorio")]
+        # Solo se guardan las entradas que se van a mostrar; del resto basta con contarlas
+        display_limit = 20
+        files = []  # Tuplas (nombre relativo, tamaño)
+        directories = []  # Nombres relativos
+        file_count = 0
+        dir_count = 0
 
-            files = []
-            directories = []
+        matcher = _compile_glob(file_pattern).match if file_pattern else None
 
-            def scan_directory(current_path: Path, current_depth: int):
-                if current_depth > max_depth:
-                    return
-                try:
-                    for item in current_path.iterdir():
-                        if item.is_file():
-                            files.append({
-                                "name": str(item.relative_to(path)),
-                                "size": item.stat().st_size,
-                                "is_directory": False
-                            })
-                        elif item.is_dir():
+        # Recorrido por niveles con os.scandir: el tipo de cada entrada viene del propio
+        # listado del directorio, sin un stat adicional por entrada. El nombre relativo
+        # se obtiene recortando entry.path, que scandir ya construye a partir de la raíz
+        root_len = len(os.path.join(directory_path, ""))
+        pending = deque([(directory_path, 1)])
+        while pending:
+            current_path, current_depth = pending.popleft()
+            try:
+                with os.scandir(current_path) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            name = entry.path[root_len:]
+                            # Los archivos que no cumplen el patrón no se cuentan ni se consulta su tamaño
+                            if matcher is None or matcher(os.path.normcase(name)):
+                                file_count += 1
+                                if len(files) < display_limit:
+                                    files.append((name, entry.stat().st_size))
+                        elif entry.is_dir():
                             if include_directories:
-                                directories.append({
-                                    "name": str(item.relative_to(path)),
-                                    "size": 0,
-                                    "is_directory": True
-                                })
+                                dir_count += 1
+                                if len(directories) < display_limit:
+                                    directories.append(entry.path[root_len:])
                             if current_depth < max_depth:
-                                scan_directory(item, current_depth + 1)
-                except PermissionError:
-                    pass
-
-            scan_directory(path, 1)
-
-            # Aplica el filtro file_pattern después de la recursividad
-            filtered_files = files
-            if file_pattern:
-                filtered_files = [f for f in files if fnmatch.fnmatch(f["name"], file_pattern)]
-
-            response_text = f"📂 **Archivos en '{directory_path}':**\n\n"
-            if file_pattern:
-                response_text += f"🔍 **Patrón:** {file_pattern}\n"
-            response_text += f"📊 **Profundidad:** {max_depth}\n\n"
+                                pending.append((entry.path, current_depth + 1))
+            except PermissionError:
+                pass
 
-            all_items = filtered_files + (directories if include_directories else [])
+        parts = [f"📂 **Archivos en '{directory_path}':**", ""]
+        if file_pattern:
+            parts.append(f"🔍 **Patrón:** {file_pattern}")
+        parts += [f"📊 **Profundidad:** {max_depth}", ""]
 
-            if all_items:
-                for item in all_items[:20]:  # Mostrar máximo 20
-                    icon = "📁" if item["is_directory"] else "📄"
-                    size_info = f" ({item['size']} bytes)" if not item["is_directory"] else ""
-                    response_text += f"{icon} {item['name']}{size_info}\n"
-                if len(all_items) > 20:
-                    response_text += f"\n... y {len(all_items) - 20} archivos más\n"
-                response_text += f"\n📈 **Total:** {len(filtered_files)} archivos"
-                if include_directories:
-                    response_text += f", {len(directories)} directorios"
-            else:
-                response_text += "📭 **Sin archivos encontrados**"
+        total_items = file_count + dir_count
 
-            return [TextContent(type="text", text=response_text)]
+        if total_items:
+            parts.extend(f"📄 {name} ({size} bytes)" for name, size in files)  # Mostrar máximo 20
+            parts.extend(f"📁 {name}" for name in directories[:display_limit - len(files)])
+            if total_items > display_limit:
+                parts += ["", f"... y {total_items - display_limit} archivos más"]
+            total_line = f"📈 **Total:** {file_count} archivos"
+            if include_directories:
+                total_line += f", {dir_count} directorios"
+            parts += ["", total_line]
+        else:
+            parts.append("📭 **Sin archivos encontrados**")
 
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error listando archivos: {str(e)}")]
+        return [TextContent(type="text", text="\n".join(parts))]
@@ -1,392 +1,627 @@
-import sys
-from typing import List
+import asyncio
+import functools
+import itertools
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
 from mcp.types import TextContent
 
+from utils.exceptions import MCPError
+from utils.tool_errors import tool_error_response
+
+# Constructor de respuestas de texto con el tipo ya fijado
+_TEXT = functools.partial(TextContent, type="text")
+
+# Errores esperables de una operación Git (los del handler y los del sistema);
+# cualquier otro es un fallo del propio adaptador y no se disfraza de error de git
+_GIT_TOOL_ERRORS = (MCPError, OSError)
+
+# Lecturas Git recientes: (repo_url, operación, argumentos...) -> (firma de .git, instante, resultado)
+_GIT_CACHE: Dict[tuple, Tuple[tuple, float, Dict[str, Any]]] = {}
+_GIT_CACHE_MAX = 256
+
+# Lecturas en curso: las llamadas idénticas simultáneas esperan al mismo resultado
+_GIT_INFLIGHT: Dict[tuple, asyncio.Future] = {}
+
+# Operaciones Git simultáneas: las interactivas (status, diff, log...) tienen su propio
+# cupo y las de red en segundo plano (push, pull, clone) solo la mitad, para no bloquearlas
+_GIT_CONCURRENCY = max(2, (os.cpu_count() or 4) * 3 // 4)
+_GIT_BACKGROUND_STAGGER_THRESHOLD = 4
+
+# Semáforos creados en el primer uso, dentro del bucle de eventos en ejecución
+_GIT_SLOTS: Dict[str, asyncio.Semaphore] = {}
+_git_background_waiting = 0
+
+@asynccontextmanager
+async def _git_slot(background: bool = False):
+    """
+    Reserva un hueco para lanzar una operación Git
+    
+    Args:
+        background: True para operaciones de red largas (push, pull, clone)
+    """
+    global _git_background_waiting
+    if not _GIT_SLOTS:
+        _GIT_SLOTS["interactive"] = asyncio.Semaphore(_GIT_CONCURRENCY)
+        _GIT_SLOTS["background"] = asyncio.Semaphore(max(1, _GIT_CONCURRENCY // 2))
+    
+    if not background:
+        async with _GIT_SLOTS["interactive"]:
+            yield
+        return
+    
+    _git_background_waiting += 1
+    try:
+        # Con muchas operaciones en cola, escalonar su arranque
+        if _git_background_waiting > _GIT_BACKGROUND_STAGGER_THRESHOLD:
+            await asyncio.sleep(random.uniform(0, 0.01))
+        await _GIT_SLOTS["background"].acquire()
+    finally:
+        _git_background_waiting -= 1
+    try:
+        yield
+    finally:
+        _GIT_SLOTS["background"].release()
+
+# Segundos de validez: el estado depende también del árbol de trabajo, que no cambia la firma
+_GIT_STATUS_TTL = 2.0
+_GIT_REFS_TTL = 30.0
+
+# Entradas de .git que cambian al mover HEAD, el índice, las refs o la configuración
+_GIT_SIGNATURE_ENTRIES = (
+    "HEAD", "index", "packed-refs", "config", "FETCH_HEAD",
+    os.path.join("logs", "HEAD"), os.path.join("refs", "heads"), os.path.join("refs", "tags"),
+    os.path.join("refs", "stash"),
+)
+
+def _git_state_signature(repo_url: str) -> Optional[tuple]:
+    """
+    Firma barata del estado de un repositorio local a partir del mtime de .git
+    
+    Returns:
+        Tupla de mtimes, o None si repo_url no es un repositorio local (sin cache)
+    """
+    if repo_url in (".", ""):
+        path = os.getcwd()
+    elif repo_url.startswith(('http://', 'https://', 'git://', 'ssh://', 'git@')):
+        return None
+    else:
+        path = os.path.abspath(repo_url)
+    
+    git_dir = os.path.join(path, ".git")
+    signature = []
+    for entry in _GIT_SIGNATURE_ENTRIES:
+        try:
+            signature.append(os.stat(os.path.join(git_dir, entry)).st_mtime_ns)
+        except FileNotFoundError:
+            signature.append(None)
+        except OSError:
+            return None
+    if signature[0] is None:
+        # Sin .git/HEAD no es un repositorio (o .git es un archivo de worktree)
+        return None
+    return tuple(signature)
+
+# Líneas fijas de cada acción de modificación (se rellenan con los argumentos de la llamada)
+_BRANCH_ACTION_TEMPLATES = {
+    "create": "🌱 **Nueva rama creada:** {branch_name}\n",
+    "delete": "🗑️ **Rama eliminada:** {branch_name}\n",
+    "switch": "🔄 **Rama cambiada a:** {branch_name}\n",
+    "rename": "🏷️ **Rama renombrada:** {from_branch} → {branch_name}\n",
+}
+
+_REMOTE_ACTION_TEMPLATES = {
+    "add": "➕ **Remoto agregado:** {remote_name}\n🔗 **URL:** {remote_url}\n",
+    "remove": "🗑️ **Remoto eliminado:** {remote_name}\n",
+    "set-url": "🔄 **URL actualizada para:** {remote_name}\n🔗 **Nueva URL:** {remote_url}\n",
+}
+
+def _format_commit_line(commit: Dict[str, Any]) -> str:
+    """Línea de log para un commit: hash, fecha, autor y primera línea del mensaje"""
+    subject = commit["message"].splitlines()[0] if commit["message"] else ""
+    return f"{commit['hash']} {commit['date']} {commit['author']}: {subject}"
+
+def _invalidate_git_cache(repo_url: str) -> None:
+    """Descarta las lecturas cacheadas de un repositorio tras una operación que lo modifica"""
+    for key in [key for key in _GIT_CACHE if key[0] == repo_url]:
+        _GIT_CACHE.pop(key, None)
+
+def _invalidate_git_status(path: str) -> None:
+    """
+    Descarta el estado cacheado de los repositorios que contienen una ruta modificada fuera de Git
+    
+    Las herramientas de archivos reciben rutas absolutas (o relativas a otro repo_url), así que
+    se comparan rutas y no claves: basta con que path esté dentro del repositorio.
+    """
+    target = os.path.abspath(path)
+    for key in [key for key in _GIT_CACHE if key[1] == "status"]:
+        root = os.path.abspath(key[0] or ".")
+        if target == root or target.startswith(root.rstrip(os.sep) + os.sep):
+            _GIT_CACHE.pop(key, None)
+
+# Mensaje de cada listado que se obtiene de la lectura conjunta de referencias
+_REF_LIST_MESSAGES = {
+    "branches": "Ramas listadas: {count} encontradas",
+    "tags": "Tags listados: {count} encontrados",
+    "remotes": "Remotos listados: {count} encontrados",
+}
+
+def _format_file_list(files: List[str], label: str, max_show: int = 5) -> List[str]:
+    """
+    Genera las líneas de una lista de archivos recortada a los primeros elementos
+    
+    Args:
+        files: Archivos a listar
+        label: Título de la sección (p. ej. "Archivos modificados")
+        max_show: Número máximo de archivos mostrados
+    
+    Returns:
+        Líneas terminadas en salto de línea, listas para añadir a la respuesta
+    """
+    total = len(files)
+    lines = [f"📝 **{label}:** {total}\n"]
+    lines.extend(f"  • {file}\n" for file in itertools.islice(files, max_show))
+    if total > max_show:
+        lines.append(f"  ... y {total - max_show} archivos más\n")
+    return lines
+
+
 class GitAdapterMixin:
-    async def _git_status(self, repository_path: str) -> List['TextContent']:
-        """Obtiene el estado del repositorio Git usando el handler"""
+    async def _cached_git_read(self, key: tuple, ttl: float, call):
+        """
+        Devuelve el resultado de una lectura Git reutilizándolo mientras .git no cambie
+        
+        Si ya hay una lectura idéntica en curso, se espera a su resultado en lugar
+        de lanzar otra llamada al handler. Si quien la lanzó se cancela, los que
+        esperaban la repiten (uno de ellos pasa a lanzarla).
+        
+        Args:
+            key: (repo_url, operación, argumentos...) que identifica la lectura
+            ttl: Segundos máximos que se reutiliza el resultado
+            call: Función sin argumentos que devuelve la corrutina del handler
+        """
+        signature = _git_state_signature(key[0])
+        now = time.monotonic()
+        if signature is not None:
+            cached = _GIT_CACHE.get(key)
+            if cached is not None and cached[0] == signature and now - cached[1] < ttl:
+                return cached[2]
+        
+        inflight = _GIT_INFLIGHT.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    # Se canceló esta llamada, no la lectura compartida
+                    raise
+            # Se canceló quien lanzó la lectura: repetirla sin propagar una cancelación ajena
+            return await self._cached_git_read(key, ttl, call)
+        
+        future = asyncio.get_running_loop().create_future()
+        _GIT_INFLIGHT[key] = future
         try:
-            result = await self.git_handler.status(repository_path)
-            if result.get("clean"):
-                response_text = "✅ Repositorio limpio"
-            else:
-                response_text = "❌ Cambios pendientes"
-            if result.get("last_commit"):
-                response_text += f"\nÚltimo commit: {result['last_commit']}"
-            return [TextContent(type="text", text=response_text)]
+            async with _git_slot():
+                result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
         except Exception as e:
-            self.logger.log_error(e, f"Error en _git_status para ruta: {repository_path}")
-            return [TextContent(type="text", text=f"❌ Error ejecutando git status: {str(e)}")]
+            future.set_exception(e)
+            # Marcar la excepción como recuperada aunque nadie más la espere
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            _GIT_INFLIGHT.pop(key, None)
+        
+        # Los fallos no se cachean. La firma se vuelve a tomar tras la lectura porque
+        # la propia lectura puede tocar .git (status hace fetch y reescribe FETCH_HEAD)
+        if signature is not None and not (isinstance(result, dict) and result.get("success") is False):
+            signature = _git_state_signature(key[0])
+            if signature is not None:
+                _GIT_CACHE[key] = (signature, now, result)
+                if len(_GIT_CACHE) > _GIT_CACHE_MAX:
+                    _GIT_CACHE.pop(next(iter(_GIT_CACHE)))
+        return result
 
+    async def _git_write(self, repo_url: str, coro, background: bool = False):
+        """Espera una operación Git que modifica el repositorio e invalida sus lecturas cacheadas"""
+        try:
+            async with _git_slot(background):
+                return await coro
+        finally:
+            _invalidate_git_cache(repo_url)
+
+    async def _git_list_refs(self, repo_url: str, kind: str) -> Dict[str, Any]:
+        """
+        Resultado de un listado de ramas, etiquetas o remotos
+        
+        Los tres salen de una misma lectura cacheada (un único `git for-each-ref`),
+        así que listar ramas, etiquetas y remotos seguidos lanza un solo proceso.
+        
+        Args:
+            repo_url: URL del repositorio
+            kind: "branches", "tags" o "remotes"
+        """
+        refs = await self._cached_git_read(
+            (repo_url, "refs"), _GIT_REFS_TTL,
+            lambda: self.git_handler.list_all_refs(repo_url)
+        )
+        items = refs[kind]
+        result = {
+            "success": True,
+            "message": _REF_LIST_MESSAGES[kind].format(count=len(items)),
+            "action": "list",
+            kind: items
+        }
+        if kind == "tags":
+            result["count"] = len(items)
+        return result
+
+    @tool_error_response("❌ Error ejecutando git status", log_errors=True, handled=_GIT_TOOL_ERRORS)
+    async def _git_status(self, repository_path: str) -> List['TextContent']:
+        """Obtiene el estado del repositorio Git usando el handler"""
+        result, stash_result = await asyncio.gather(
+            self._cached_git_read(
+                (repository_path, "status"), _GIT_STATUS_TTL,
+                lambda: self.git_handler.status(repository_path)
+            ),
+            self._cached_git_read(
+                (repository_path, "stash"), _GIT_REFS_TTL,
+                lambda: self.git_handler.stash(repository_path, "list")
+            ),
+            return_exceptions=True
+        )
+        if isinstance(result, BaseException):
+            raise result
+        
+        parts = ["✅ Repositorio limpio" if result.get("clean") else "❌ Cambios pendientes"]
+        if result.get("branch"):
+            parts.append(f"Rama: {result['branch']}")
+        if not result.get("clean") and result.get("summary"):
+            parts.append(f"Resumen: {result['summary']}")
+        if result.get("ahead") or result.get("behind"):
+            parts.append(f"Respecto al remoto: {result.get('ahead', 0)} por delante, {result.get('behind', 0)} por detrás")
+        # Los stashes son información adicional: si fallan se omiten
+        if isinstance(stash_result, dict) and stash_result.get("stashes"):
+            parts.append(f"Stashes: {len(stash_result['stashes'])}")
+        if result.get("last_commit"):
+            parts.append(f"Último commit: {result['last_commit']}")
+        return [_TEXT(text="\n".join(parts))]
+
+    @tool_error_response("❌ Error inicializando repositorio", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_init(self, repo_path: str, bare: bool = False, initial_branch: str = None) -> List['TextContent']:
         """Inicializa un nuevo repositorio Git"""
-        try:
+        async with _git_slot():
             result = await self.git_handler.init(repo_path, bare, initial_branch)
-            if result.get("success"):
-                response_text = "✅ Repositorio inicializado"
-            else:
-                response_text = "❌ No se pudo inicializar"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error inicializando repositorio: {str(e)}")]
+        if result.get("success"):
+            response_text = "✅ Repositorio inicializado"
+        else:
+            response_text = "❌ No se pudo inicializar"
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error agregando archivos", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_add(self, repo_url: str, files: List[str] = None, all_files: bool = False, update: bool = False) -> List['TextContent']:
         """Agrega archivos al staging area"""
-        try:
-            result = await self.git_handler.add(repo_url, files, all_files, update)
-            if result.get("success"):
-                response_text = "✅ Archivos agregados"
-            else:
-                response_text = "❌ No se pudo agregar"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error agregando archivos: {str(e)}")]
+        result = await self._git_write(repo_url, self.git_handler.add(repo_url, files, all_files, update))
+        if result.get("success"):
+            response_text = "✅ Archivos agregados"
+        else:
+            response_text = "❌ No se pudo agregar"
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando commit", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_commit(self, repo_url: str, message: str, files: list = None, add_all: bool = False) -> List['TextContent']:
         """Realiza un commit en el repositorio especificado usando el handler."""
-        try:
-            result = await self.git_handler.commit(repo_url, message, files, add_all)
-            if result.get("success"):
-                response_text = "✅ Commit realizado"
-            else:
-                response_text = "❌ No se pudo commitear"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando commit: {str(e)}")]
+        if add_all and not files:
+            commit = self.git_handler.commit_all(repo_url, message)
+        else:
+            commit = self.git_handler.commit(repo_url, message, files, add_all)
+        result = await self._git_write(repo_url, commit)
+        if result.get("success"):
+            response_text = "✅ Commit realizado"
+        else:
+            response_text = "❌ No se pudo commitear"
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando diff", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_diff(self, repo_url: str, file_path: str = None, staged: bool = False) -> List['TextContent']:
         """Muestra el diff del repositorio o de un archivo usando el handler."""
-        try:
+        async with _git_slot():
             result = await self.git_handler.diff(repo_url, file_path, staged)
-            if result.get("success"):
-                response_text = "✅ Diff generado"
-            else:
-                response_text = "❌ No se pudo generar diff"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando diff: {str(e)}")]
+        if result.get("success"):
+            response_text = "✅ Diff generado"
+        else:
+            response_text = "❌ No se pudo generar diff"
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando log", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_log(self, repo_url: str, limit: int = 10, branch: str = None, file_path: str = None) -> List['TextContent']:
         """Muestra el log de commits del repositorio usando el handler."""
-        try:
-            result = await self.git_handler.log(repo_url, limit, branch, file_path)
-            if result.get("success"):
-                response_text = "✅ Log generado"
-            else:
-                response_text = "❌ No se pudo obtener log"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando log: {str(e)}")]
+        result = await self._cached_git_read(
+            (repo_url, "log", limit, branch, file_path), _GIT_REFS_TTL,
+            lambda: self.git_handler.log(repo_url, limit, branch, file_path)
+        )
+        if result.get("success"):
+            parts = ["✅ Log generado"]
+            parts.extend(_format_commit_line(commit) for commit in result.get("commits", []))
+            response_text = "\n".join(parts)
+        else:
+            response_text = "❌ No se pudo obtener log"
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando git push", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_push(self, repo_url: str, branch: str = None, force: bool = False) -> List[TextContent]:
         """Sube cambios al repositorio remoto"""
-        try:
-            result = await self.git_handler.push(repo_url, branch, force)
-            
-            if result.get("success"):
-                response_text = f"✅ {result['message']}\n"
-                
-                if result.get("pushed_branch"):
-                    response_text += f"🌿 **Rama:** {result['pushed_branch']}\n"
-                
-                if result.get("commits_pushed"):
-                    response_text += f"📤 **Commits subidos:** {result['commits_pushed']}\n"
-                
-                if result.get("remote_url"):
-                    response_text += f"🔗 **Remoto:** {result['remote_url']}\n"
-                
-                if force:
-                    response_text += "⚠️ **Push forzado realizado**\n"
-                
-            else:
-                response_text = f"❌ {result['message']}"
+        result = await self._git_write(repo_url, self.git_handler.push(repo_url, branch, force), background=True)
+        
+        if result.get("success"):
+            parts = [f"✅ {result['message']}\n"]
             
-            return [TextContent(type="text", text=response_text)]
+            if result.get("pushed_branch"):
+                parts.append(f"🌿 **Rama:** {result['pushed_branch']}\n")
             
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando git push: {str(e)}")]
+            if result.get("commits_pushed"):
+                parts.append(f"📤 **Commits subidos:** {result['commits_pushed']}\n")
+            
+            if result.get("remote_url"):
+                parts.append(f"🔗 **Remoto:** {result['remote_url']}\n")
+            
+            if force:
+                parts.append("⚠️ **Push forzado realizado**\n")
+            response_text = "".join(parts)
+            
+        else:
+            response_text = f"❌ {result['message']}"
+        
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando git pull", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_pull(self, repo_url: str, branch: str = None, rebase: bool = False) -> List[TextContent]:
         """Descarga cambios del repositorio remoto"""
-        try:
-            result = await self.git_handler.pull(repo_url, branch, rebase)
-            
-            if result.get("success"):
-                response_text = f"✅ {result['message']}\n"
-                
-                if result.get("updated_branch"):
-                    response_text += f"🌿 **Rama actualizada:** {result['updated_branch']}\n"
-                
-                if result.get("commits_received"):
-                    response_text += f"📥 **Commits recibidos:** {result['commits_received']}\n"
-                
-                if result.get("files_changed"):
-                    response_text += f"📝 **Archivos modificados:** {len(result['files_changed'])}\n"
-                    for file_change in result["files_changed"][:5]:  # Mostrar primeros 5
-                        response_text += f"  • {file_change}\n"
-                    if len(result["files_changed"]) > 5:
-                        response_text += f"  ... y {len(result['files_changed']) - 5} archivos más\n"
-                
-                if rebase:
-                    response_text += "🔄 **Rebase aplicado**\n"
-                
-            else:
-                response_text = f"❌ {result['message']}"
-            
-            return [TextContent(type="text", text=response_text)]
+        result = await self._git_write(repo_url, self.git_handler.pull(repo_url, branch, rebase), background=True)
+        
+        if result.get("success"):
+            parts = [f"✅ {result['message']}\n"]
             
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando git pull: {str(e)}")]
+            if result.get("updated_branch"):
+                parts.append(f"🌿 **Rama actualizada:** {result['updated_branch']}\n")
+            
+            if result.get("commits_received"):
+                parts.append(f"📥 **Commits recibidos:** {result['commits_received']}\n")
+            
+            if result.get("files_changed"):
+                parts.extend(_format_file_list(result["files_changed"], "Archivos modificados"))
+            
+            if rebase:
+                parts.append("🔄 **Rebase aplicado**\n")
+            response_text = "".join(parts)
+            
+        else:
+            response_text = f"❌ {result['message']}"
+        
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando git branch", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_branch(self, repo_url: str, action: str, branch_name: str = None, from_branch: str = None) -> List[TextContent]:
         """Gestiona ramas del repositorio"""
-        try:
-            result = await self.git_handler.branch(repo_url, action, branch_name, from_branch)
-            
-            if result.get("success"):
-                response_text = f"✅ {result['message']}\n"
-                
-                if action == "list":
-                    if result.get("branches"):
-                        response_text += "🌿 **Ramas disponibles:**\n"
-                        for branch_info in result["branches"]:
-                            prefix = "➤ " if branch_info.get("current") else "  "
-                            remote_info = " (remota)" if branch_info.get("remote") else ""
-                            response_text += f"{prefix}{branch_info['name']}{remote_info}\n"
-                
-                elif action == "create":
-                    response_text += f"🌱 **Nueva rama creada:** {branch_name}\n"
-                    if from_branch:
-                        response_text += f"📍 **Basada en:** {from_branch}\n"
-                
-                elif action == "delete":
-                    response_text += f"🗑️ **Rama eliminada:** {branch_name}\n"
-                
-                elif action == "switch":
-                    response_text += f"🔄 **Rama cambiada a:** {branch_name}\n"
-                    if result.get("files_changed"):
-                        response_text += f"📝 **Archivos afectados:** {len(result['files_changed'])}\n"
-                
-                elif action == "rename":
-                    response_text += f"🏷️ **Rama renombrada:** {from_branch} → {branch_name}\n"
-                
-            else:
-                response_text = f"❌ {result['message']}"
-            
-            return [TextContent(type="text", text=response_text)]
+        if action == "list":
+            result = await self._git_list_refs(repo_url, "branches")
+        else:
+            result = await self._git_write(repo_url, self.git_handler.branch(repo_url, action, branch_name, from_branch))
+        
+        if result.get("success"):
+            parts = [f"✅ {result['message']}\n"]
             
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando git branch: {str(e)}")]
+            if action == "list":
+                if result.get("branches"):
+                    parts.append("🌿 **Ramas disponibles:**\n")
+                    for branch_info in result["branches"]:
+                        prefix = "➤ " if branch_info.get("current") else "  "
+                        remote_info = " (remota)" if branch_info.get("remote") else ""
+                        parts.append(f"{prefix}{branch_info['name']}{remote_info}\n")
+            
+            elif action in _BRANCH_ACTION_TEMPLATES:
+                parts.append(_BRANCH_ACTION_TEMPLATES[action].format(branch_name=branch_name, from_branch=from_branch))
+                if action == "create" and from_branch:
+                    parts.append(f"📍 **Basada en:** {from_branch}\n")
+                elif action == "switch" and result.get("files_changed"):
+                    parts.append(f"📝 **Archivos afectados:** {len(result['files_changed'])}\n")
+            response_text = "".join(parts)
+            
+        else:
+            response_text = f"❌ {result['message']}"
+        
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando git merge", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_merge(self, repo_url: str, source_branch: str, target_branch: str = None, no_ff: bool = False) -> List[TextContent]:
         """Fusiona ramas del repositorio"""
-        try:
-            result = await self.git_handler.merge(repo_url, source_branch, target_branch, no_ff)
-            
-            if result.get("success"):
-                response_text = f"✅ {result['message']}\n"
-                
-                if result.get("merge_type"):
-                    response_text += f"🔀 **Tipo de merge:** {result['merge_type']}\n"
-                
-                if result.get("source_branch"):
-                    response_text += f"📤 **Rama origen:** {result['source_branch']}\n"
-                
-                if result.get("target_branch"):
-                    response_text += f"📥 **Rama destino:** {result['target_branch']}\n"
-                
-                if result.get("files_merged"):
-                    response_text += f"📝 **Archivos fusionados:** {len(result['files_merged'])}\n"
-                    for file in result["files_merged"][:5]:
-                        response_text += f"  • {file}\n"
-                    if len(result["files_merged"]) > 5:
-                        response_text += f"  ... y {len(result['files_merged']) - 5} archivos más\n"
-                
-                if result.get("conflicts"):
-                    response_text += f"⚠️ **Conflictos detectados:** {len(result['conflicts'])}\n"
-                    for conflict in result["conflicts"]:
-                        response_text += f"  ❌ {conflict}\n"
-                    response_text += "\n🔧 **Resuelve los conflictos y realiza commit**\n"
-                
-                if no_ff:
-                    response_text += "🔗 **Merge commit creado (--no-ff)**\n"
-                
-            else:
-                response_text = f"❌ {result['message']}"
-            
-            return [TextContent(type="text", text=response_text)]
+        result = await self._git_write(repo_url, self.git_handler.merge(repo_url, source_branch, target_branch, no_ff))
+        
+        if result.get("success"):
+            parts = [f"✅ {result['message']}\n"]
             
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando git merge: {str(e)}")]
+            if result.get("merge_type"):
+                parts.append(f"🔀 **Tipo de merge:** {result['merge_type']}\n")
+            
+            if result.get("source_branch"):
+                parts.append(f"📤 **Rama origen:** {result['source_branch']}\n")
+            
+            if result.get("target_branch"):
+                parts.append(f"📥 **Rama destino:** {result['target_branch']}\n")
+            
+            if result.get("files_merged"):
+                parts.extend(_format_file_list(result["files_merged"], "Archivos fusionados"))
+            
+            if result.get("conflicts"):
+                parts.append(f"⚠️ **Conflictos detectados:** {len(result['conflicts'])}\n")
+                for conflict in result["conflicts"]:
+                    parts.append(f"  ❌ {conflict}\n")
+                parts.append("\n🔧 **Resuelve los conflictos y realiza commit**\n")
+            
+            if no_ff:
+                parts.append("🔗 **Merge commit creado (--no-ff)**\n")
+            response_text = "".join(parts)
+            
+        else:
+            response_text = f"❌ {result['message']}"
+        
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando git stash", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_stash(self, repo_url: str, action: str, message: str = None, stash_index: int = None) -> List[TextContent]:
         """Gestiona el stash del repositorio"""
-        try:
-            result = await self.git_handler.stash(repo_url, action, message, stash_index)
-            
-            if result.get("success"):
-                response_text = f"✅ {result['message']}\n"
-                
-                if action == "save":
-                    response_text += f"💾 **Stash guardado:** {message or 'WIP'}\n"
-                    if result.get("stash_count"):
-                        response_text += f"📦 **Total stashes:** {result['stash_count']}\n"
-                
-                elif action == "list":
-                    if result.get("stashes"):
-                        response_text += "📦 **Stashes disponibles:**\n"
-                        for i, stash in enumerate(result["stashes"]):
-                            response_text += f"  {i}: {stash['message']} ({stash['date']})\n"
-                    else:
-                        response_text += "📦 **No hay stashes guardados**\n"
-                
-                elif action in ["pop", "apply"]:
-                    response_text += f"📤 **Stash {'aplicado y eliminado' if action == 'pop' else 'aplicado'}**\n"
-                    if result.get("files_restored"):
-                        response_text += f"📝 **Archivos restaurados:** {len(result['files_restored'])}\n"
-                        for file in result["files_restored"][:5]:
-                            response_text += f"  • {file}\n"
-                        if len(result["files_restored"]) > 5:
-                            response_text += f"  ... y {len(result['files_restored']) - 5} archivos más\n"
-                
-                elif action == "drop":
-                    response_text += f"🗑️ **Stash eliminado:** stash@{{{stash_index or 0}}}\n"
-                
-            else:
-                response_text = f"❌ {result['message']}"
-            
-            return [TextContent(type="text", text=response_text)]
+        result = await self._git_write(repo_url, self.git_handler.stash(repo_url, action, message, stash_index))
+        
+        if result.get("success"):
+            parts = [f"✅ {result['message']}\n"]
             
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando git stash: {str(e)}")]
+            if action == "save":
+                parts.append(f"💾 **Stash guardado:** {message or 'WIP'}\n")
+                if result.get("stash_count"):
+                    parts.append(f"📦 **Total stashes:** {result['stash_count']}\n")
+            
+            elif action == "list":
+                if result.get("stashes"):
+                    parts.append("📦 **Stashes disponibles:**\n")
+                    for i, stash in enumerate(result["stashes"]):
+                        parts.append(f"  {i}: {stash['message']} ({stash['date']})\n")
+                else:
+                    parts.append("📦 **No hay stashes guardados**\n")
+            
+            elif action in ["pop", "apply"]:
+                parts.append(f"📤 **Stash {'aplicado y eliminado' if action == 'pop' else 'aplicado'}**\n")
+                if result.get("files_restored"):
+                    parts.extend(_format_file_list(result["files_restored"], "Archivos restaurados"))
+            
+            elif action == "drop":
+                parts.append(f"🗑️ **Stash eliminado:** stash@{{{stash_index or 0}}}\n")
+            response_text = "".join(parts)
+            
+        else:
+            response_text = f"❌ {result['message']}"
+        
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando git reset", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_reset(self, repo_url: str, commit_hash: str = None, mode: str = "mixed") -> List[TextContent]:
         """Resetea el repositorio a un estado anterior"""
-        try:
-            result = await self.git_handler.reset(repo_url, commit_hash, mode)
-            
-            if result.get("success"):
-                response_text = f"✅ {result['message']}\n"
-                
-                response_text += f"🔄 **Modo de reset:** {mode}\n"
-                
-                if result.get("reset_to"):
-                    response_text += f"📍 **Reset a:** {result['reset_to']}\n"
-                
-                if result.get("files_affected"):
-                    response_text += f"📝 **Archivos afectados:** {len(result['files_affected'])}\n"
-                    for file in result["files_affected"][:5]:
-                        response_text += f"  • {file}\n"
-                    if len(result["files_affected"]) > 5:
-                        response_text += f"  ... y {len(result['files_affected']) - 5} archivos más\n"
-                
-                # Explicar qué hace cada modo
-                if mode == "soft":
-                    response_text += "\n💡 **Soft reset:** Los cambios se mantienen en staging\n"
-                elif mode == "mixed":
-                    response_text += "\n💡 **Mixed reset:** Los cambios se mantienen pero no en staging\n"
-                elif mode == "hard":
-                    response_text += "\n⚠️ **Hard reset:** Todos los cambios han sido descartados\n"
-                
-            else:
-                response_text = f"❌ {result['message']}"
-            
-            return [TextContent(type="text", text=response_text)]
+        result = await self._git_write(repo_url, self.git_handler.reset(repo_url, commit_hash, mode))
+        
+        if result.get("success"):
+            parts = [f"✅ {result['message']}\n"]
             
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando git reset: {str(e)}")]
+            parts.append(f"🔄 **Modo de reset:** {mode}\n")
+            
+            if result.get("reset_to"):
+                parts.append(f"📍 **Reset a:** {result['reset_to']}\n")
+            
+            if result.get("files_affected"):
+                parts.extend(_format_file_list(result["files_affected"], "Archivos afectados"))
+            
+            # Explicar qué hace cada modo
+            if mode == "soft":
+                parts.append("\n💡 **Soft reset:** Los cambios se mantienen en staging\n")
+            elif mode == "mixed":
+                parts.append("\n💡 **Mixed reset:** Los cambios se mantienen pero no en staging\n")
+            elif mode == "hard":
+                parts.append("\n⚠️ **Hard reset:** Todos los cambios han sido descartados\n")
+            response_text = "".join(parts)
+            
+        else:
+            response_text = f"❌ {result['message']}"
+        
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando git tag", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_tag(self, repo_url: str, action: str, tag_name: str = None, message: str = None, commit_hash: str = None) -> List[TextContent]:
         """Gestiona etiquetas del repositorio"""
-        try:
-            result = await self.git_handler.tag(repo_url, action, tag_name, message, commit_hash)
-            
-            if result.get("success"):
-                response_text = f"✅ {result['message']}\n"
-                
-                if action == "create":
-                    response_text += f"🏷️ **Etiqueta creada:** {tag_name}\n"
-                    if result.get("tag_commit"):
-                        response_text += f"📍 **En commit:** {result['tag_commit']}\n"
-                    if message:
-                        response_text += f"📝 **Mensaje:** {message}\n"
-                
-                elif action == "list":
-                    if result.get("tags"):
-                        response_text += "🏷️ **Etiquetas disponibles:**\n"
-                        for tag in result["tags"]:
-                            if isinstance(tag, dict):
-                                response_text += f"  • {tag['name']} ({tag['date']}) - {tag['commit'][:8]}\n"
-                                if tag.get("message"):
-                                    response_text += f"    📝 {tag['message']}\n"
-                            else:
-                                response_text += f"  • {tag}\n"
-                    else:
-                        response_text += "🏷️ **No hay etiquetas creadas**\n"
-                
-                elif action == "delete":
-                    response_text += f"🗑️ **Etiqueta eliminada:** {tag_name}\n"
-                
-                elif action == "push":
-                    response_text += f"📤 **Etiqueta subida al remoto:** {tag_name}\n"
-                    if result.get("remote_url"):
-                        response_text += f"🔗 **Remoto:** {result['remote_url']}\n"
-                
-            else:
-                response_text = f"❌ {result['message']}"
-            
-            return [TextContent(type="text", text=response_text)]
+        if action == "list":
+            result = await self._git_list_refs(repo_url, "tags")
+        else:
+            result = await self._git_write(repo_url, self.git_handler.tag(repo_url, action, tag_name, message, commit_hash))
+        
+        if result.get("success"):
+            parts = [f"✅ {result['message']}\n"]
             
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando git tag: {str(e)}")]
+            if action == "create":
+                parts.append(f"🏷️ **Etiqueta creada:** {tag_name}\n")
+                if result.get("tag_commit"):
+                    parts.append(f"📍 **En commit:** {result['tag_commit']}\n")
+                if message:
+                    parts.append(f"📝 **Mensaje:** {message}\n")
+            
+            elif action == "list":
+                if result.get("tags"):
+                    parts.append("🏷️ **Etiquetas disponibles:**\n")
+                    for tag in result["tags"]:
+                        if isinstance(tag, dict):
+                            parts.append(f"  • {tag['name']} ({tag['date']}) - {tag['commit'][:8]}\n")
+                            if tag.get("message"):
+                                parts.append(f"    📝 {tag['message']}\n")
+                        else:
+                            parts.append(f"  • {tag}\n")
+                else:
+                    parts.append("🏷️ **No hay etiquetas creadas**\n")
+            
+            elif action == "delete":
+                parts.append(f"🗑️ **Etiqueta eliminada:** {tag_name}\n")
+            
+            elif action == "push":
+                parts.append(f"📤 **Etiqueta subida al remoto:** {tag_name}\n")
+                if result.get("remote_url"):
+                    parts.append(f"🔗 **Remoto:** {result['remote_url']}\n")
+            response_text = "".join(parts)
+            
+        else:
+            response_text = f"❌ {result['message']}"
+        
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error ejecutando git remote", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_remote(self, repo_url: str, action: str, remote_name: str = None, remote_url: str = None) -> List[TextContent]:
         """Gestiona repositorios remotos"""
-        try:
-            result = await self.git_handler.remote(repo_url, action, remote_name, remote_url)
-            
-            if result.get("success"):
-                response_text = f"✅ {result['message']}\n"
-                
-                if action == "list":
-                    if result.get("remotes"):
-                        response_text += "🔗 **Remotos configurados:**\n"
-                        for remote in result["remotes"]:
-                            if isinstance(remote, dict):
-                                response_text += f"  • {remote['name']}: {remote['url']}\n"
-                                if remote.get("fetch_url") and remote["fetch_url"] != remote["url"]:
-                                    response_text += f"    📥 Fetch: {remote['fetch_url']}\n"
-                            else:
-                                response_text += f"  • {remote}\n"
-                    else:
-                        response_text += "🔗 **No hay remotos configurados**\n"
-                
-                elif action == "add":
-                    response_text += f"➕ **Remoto agregado:** {remote_name}\n"
-                    response_text += f"🔗 **URL:** {remote_url}\n"
-                
-                elif action == "remove":
-                    response_text += f"🗑️ **Remoto eliminado:** {remote_name}\n"
-                
-                elif action == "set-url":
-                    response_text += f"🔄 **URL actualizada para:** {remote_name}\n"
-                    response_text += f"🔗 **Nueva URL:** {remote_url}\n"
-                
-            else:
-                response_text = f"❌ {result['message']}"
-            
-            return [TextContent(type="text", text=response_text)]
+        if action == "list":
+            result = await self._git_list_refs(repo_url, "remotes")
+        else:
+            result = await self._git_write(repo_url, self.git_handler.remote(repo_url, action, remote_name, remote_url))
+        
+        if result.get("success"):
+            parts = [f"✅ {result['message']}\n"]
             
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando git remote: {str(e)}")]
+            if action == "list":
+                if result.get("remotes"):
+                    parts.append("🔗 **Remotos configurados:**\n")
+                    for remote in result["remotes"]:
+                        if isinstance(remote, dict):
+                            parts.append(f"  • {remote['name']}: {remote['url']}\n")
+                            if remote.get("fetch_url") and remote["fetch_url"] != remote["url"]:
+                                parts.append(f"    📥 Fetch: {remote['fetch_url']}\n")
+                        else:
+                            parts.append(f"  • {remote}\n")
+                else:
+                    parts.append("🔗 **No hay remotos configurados**\n")
+            
+            elif action in _REMOTE_ACTION_TEMPLATES:
+                parts.append(_REMOTE_ACTION_TEMPLATES[action].format(remote_name=remote_name, remote_url=remote_url))
+            response_text = "".join(parts)
+            
+        else:
+            response_text = f"❌ {result['message']}"
+        
+        return [_TEXT(text=response_text)]
 
+    @tool_error_response("❌ Error clonando repositorio", log_errors=True, handled=_GIT_TOOL_ERRORS)
     async def _git_clone(self, repo_url: str, dest_path: str = None, force: bool = False) -> list:
         """Clona un repositorio Git en una carpeta destino"""
-        try:
+        async with _git_slot(background=True):
             result = await self.git_handler.clone(repo_url, dest_path, force)
-            if result.get("success"):
-                return [TextContent(type="text", text=f"✅ Repositorio clonado en: {result['path']}")]
-            else:
-                return [TextContent(type="text", text=f"❌ Error clonando repositorio: {result.get('error')}")]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error clonando repositorio: {str(e)}")]
+        if result.get("success"):
+            return [_TEXT(text=f"✅ Repositorio clonado en: {result['path']}")]
+        else:
+            return [_TEXT(text=f"❌ Error clonando repositorio: {result.get('error')}")]
@@ -1,161 +1,250 @@
-import sys
-from typing import List
+import asyncio
+from typing import Any, Dict, List
 from mcp.types import TextContent
 
+from utils.tool_errors import tool_error_response
+
+# Plantillas de respuestas que solo vuelcan campos del resultado del handler
+_TPL_VENV_CREATED = "✅ Entorno virtual Python creado:\n\n📁 **Nombre:** {venv_name}\n📂 **Ubicación:** {venv_path}\n🐍 **Python:** {python_executable}\n\n📋 **Comandos de activación:**\n{activation_commands}"
+_TPL_REQUIREMENTS_INSTALLED = "✅ Requirements instalados:\n\n📄 **Archivo:** {requirements_file}\n📦 **Paquetes:** {packages_installed}\n🐍 **Entorno:** {venv_display}\n\n📋 **Output:**\n{output}"
+_TPL_REQUIREMENTS_FROZEN = "✅ Requirements.txt generado:\n\n📄 **Archivo:** {requirements_file}\n📦 **Paquetes:** {package_count}\n🐍 **Entorno:** {venv_display}\n\n📋 **Contenido:**\n{content}"
+
+# Respuestas de python_get_test_patterns y python_get_tools_info (información estática, se formatea una sola vez)
+_TEST_PATTERNS_RESPONSE = None
+_TOOLS_INFO_RESPONSE = None
+
+# Tools que admite python_batch: nombre de la tool -> método del adaptador
+_BATCH_OPERATIONS = {
+    "python_check_environment": "_python_check_environment",
+    "python_install_packages": "_python_install_packages",
+    "python_install_requirements": "_python_install_requirements",
+    "python_freeze": "_python_freeze",
+    "python_run_pytest": "_python_run_pytest",
+    "python_run_unittest": "_python_run_unittest",
+    "python_lint": "_python_lint",
+    "python_format": "_python_format",
+    "python_detect_project": "_python_detect_project",
+}
+
+# Operaciones de un mismo python_batch que se ejecutan a la vez (pytest, pip y linters lanzan procesos)
+_BATCH_CONCURRENCY = 4
+
+
+def _pytest_summary_parts(result):
+    """Líneas de resumen de una ejecución de pytest correcta, sin la salida"""
+    parts = [
+        "✅ Tests pytest ejecutados:\n\n",
+        f"📁 **Path:** {result['test_path']}\n",
+        f"🔍 **Patrón:** {result['pattern'] or 'Todos'}\n",
+        f"📊 **Resumen:** {result['test_summary']}\n",
+        f"📈 **Tasa de éxito:** {result['success_rate']}%\n"
+    ]
+    if result['failed_tests']:
+        parts.append(f"❌ **Tests fallidos:** {len(result['failed_tests'])}\n")
+    return parts
+
+
 class PythonAdapterMixin:
+    @tool_error_response("❌ Error verificando entorno Python")
     async def _python_check_environment(self, repo_url: str = None) -> List[TextContent]:
         """Conecta python_check_environment con el handler Python"""
-        try:
-            result = await self.python_handler.check_python_environment(repo_url)
-            response_text = f"✅ Entorno Python verificado:\n\n"
-            response_text += f"🐍 **Python:** {result['environment'].get('python_version', 'N/A')}\n"
-            response_text += f"📦 **Pip:** {result['environment'].get('pip_version', 'N/A')}\n"
-            if result['project']:
-                response_text += f"📁 **Archivos Python:** {result['project']['file_summary']['source_files']}\n"
-                response_text += f"🧪 **Framework de testing:** {result['project']['testing_framework']}\n"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error verificando entorno Python: {str(e)}")]
+        result = await self.python_handler.check_python_environment(repo_url)
+        environment = result['environment']
+        project = result['project']
+        parts = [
+            "✅ Entorno Python verificado:\n\n",
+            f"🐍 **Python:** {environment.get('python_version', 'N/A')}\n",
+            f"📦 **Pip:** {environment.get('pip_version', 'N/A')}\n"
+        ]
+        if project:
+            parts.append(f"📁 **Archivos Python:** {project['file_summary']['source_files']}\n")
+            parts.append(f"🧪 **Framework de testing:** {project['testing_framework']}\n")
+        return [TextContent(type="text", text="".join(parts))]
     
+    @tool_error_response("❌ Error creando entorno virtual")
     async def _python_create_venv(self, repo_url: str, venv_name: str = "venv", base_path: str = "") -> List[TextContent]:
         """Conecta python_create_venv con el handler Python"""
-        try:
-            result = await self.python_handler.create_virtual_environment(repo_url, venv_name, base_path)
-            return [TextContent(type="text", text=f"✅ Entorno virtual Python creado:\n\n📁 **Nombre:** {result['venv_name']}\n📂 **Ubicación:** {result['venv_path']}\n🐍 **Python:** {result['python_executable']}\n\n📋 **Comandos de activación:**\n{result['activation_commands']}")]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error creando entorno virtual: {str(e)}")]
+        result = await self.python_handler.create_virtual_environment(repo_url, venv_name, base_path)
+        return [TextContent(type="text", text=_TPL_VENV_CREATED.format_map(result))]
     
+    @tool_error_response("❌ Error instalando paquetes")
     async def _python_install_packages(self, repo_url: str, packages: List[str], venv_name: str = None, base_path: str = "") -> List[TextContent]:
         """Conecta python_install_packages con el handler Python"""
-        try:
-            result = await self.python_handler.install_packages(repo_url, packages, venv_name, base_path)
-            return [TextContent(type="text", text=f"✅ Paquetes Python instalados:\n\n📦 **Paquetes:** {', '.join(result['packages'])}\n🐍 **Entorno:** {result['venv_name'] or 'Sistema'}\n\n📋 **Output:**\n{result['output']}")]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error instalando paquetes: {str(e)}")]
+        result = await self.python_handler.install_packages(repo_url, packages, venv_name, base_path)
+        return [TextContent(type="text", text=f"✅ Paquetes Python instalados:\n\n📦 **Paquetes:** {', '.join(result['packages'])}\n🐍 **Entorno:** {result['venv_display']}\n\n📋 **Output:**\n{result['output']}")]
     
+    @tool_error_response("❌ Error instalando requirements")
     async def _python_install_requirements(self, repo_url: str, requirements_file: str = "requirements.txt", venv_name: str = None, base_path: str = "") -> List[TextContent]:
         """Conecta python_install_requirements con el handler Python"""
-        try:
-            result = await self.python_handler.install_requirements(repo_url, requirements_file, venv_name, base_path)
-            return [TextContent(type="text", text=f"✅ Requirements instalados:\n\n📄 **Archivo:** {result['requirements_file']}\n📦 **Paquetes:** {result['packages_installed']}\n🐍 **Entorno:** {result['venv_name'] or 'Sistema'}\n\n📋 **Output:**\n{result['output']}")]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error instalando requirements: {str(e)}")]
+        result = await self.python_handler.install_requirements(repo_url, requirements_file, venv_name, base_path)
+        return [TextContent(type="text", text=_TPL_REQUIREMENTS_INSTALLED.format_map(result))]
     
+    @tool_error_response("❌ Error generando requirements")
     async def _python_freeze(self, repo_url: str, venv_name: str = None, base_path: str = "") -> List[TextContent]:
         """Conecta python_freeze con el handler Python"""
-        try:
-            result = await self.python_handler.generate_requirements(repo_url, venv_name, base_path)
-            return [TextContent(type="text", text=f"✅ Requirements.txt generado:\n\n📄 **Archivo:** {result['requirements_file']}\n📦 **Paquetes:** {result['package_count']}\n🐍 **Entorno:** {result['venv_name'] or 'Sistema'}\n\n📋 **Contenido:**\n{result['content']}")]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error generando requirements: {str(e)}")]
+        result = await self.python_handler.generate_requirements(repo_url, venv_name, base_path)
+        return [TextContent(type="text", text=_TPL_REQUIREMENTS_FROZEN.format_map(result))]
     
+    @tool_error_response("❌ Error ejecutando pytest")
     async def _python_run_pytest(self, repo_url: str, test_path: str = ".", venv_name: str = None, test_pattern: str = None, collect_coverage: bool = False, verbose: bool = False) -> List[TextContent]:
         """Conecta python_run_pytest con el handler Python"""
-        try:
-            result = await self.python_handler.run_tests_pytest(repo_url, test_path, venv_name, test_pattern, collect_coverage, verbose)
-            if result['success']:
-                response_text = f"✅ Tests pytest ejecutados:\n\n"
-                response_text += f"📁 **Path:** {result['test_path']}\n"
-                response_text += f"🔍 **Patrón:** {result['pattern'] or 'Todos'}\n"
-                response_text += f"📊 **Resumen:** {result['test_summary']}\n"
-                response_text += f"📈 **Tasa de éxito:** {result['success_rate']}%\n"
-                if result['failed_tests']:
-                    response_text += f"❌ **Tests fallidos:** {len(result['failed_tests'])}\n"
-                response_text += f"\n📋 **Salida:**\n{result['output']}"
-            else:
-                response_text = f"❌ Error ejecutando pytest:\n\n{result['output']}"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando pytest: {str(e)}")]
+        result = await self.python_handler.run_tests_pytest(repo_url, test_path, venv_name, test_pattern, collect_coverage, verbose)
+        if result['success']:
+            parts = _pytest_summary_parts(result)
+            parts.append(f"\n📋 **Salida:**\n{result['output']}")
+            response_text = "".join(parts)
+        else:
+            response_text = f"❌ Error ejecutando pytest:\n\n{result['output']}"
+        return [TextContent(type="text", text=response_text)]
     
+    @tool_error_response("❌ Error ejecutando unittest")
     async def _python_run_unittest(self, repo_url: str, test_path: str = ".", venv_name: str = None, test_pattern: str = None, verbose: bool = False) -> List[TextContent]:
         """Conecta python_run_unittest con el handler Python"""
-        try:
-            result = await self.python_handler.run_tests_unittest(repo_url, test_path, venv_name, test_pattern, verbose)
-            if result['success']:
-                response_text = f"✅ Tests unittest ejecutados:\n\n"
-                response_text += f"📁 **Path:** {result['test_path']}\n"
-                response_text += f"🔍 **Patrón:** {result['pattern'] or 'Todos'}\n"
-                response_text += f"📊 **Resumen:** {result['test_summary']}\n"
-                response_text += f"📈 **Tasa de éxito:** {result['success_rate']}%\n"
-                response_text += f"\n📋 **Salida:**\n{result['output']}"
-            else:
-                response_text = f"❌ Error ejecutando unittest:\n\n{result['output']}"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando unittest: {str(e)}")]
+        result = await self.python_handler.run_tests_unittest(repo_url, test_path, venv_name, test_pattern, verbose)
+        if result['success']:
+            response_text = "".join([
+                "✅ Tests unittest ejecutados:\n\n",
+                f"📁 **Path:** {result['test_path']}\n",
+                f"🔍 **Patrón:** {result['pattern'] or 'Todos'}\n",
+                f"📊 **Resumen:** {result['test_summary']}\n",
+                f"📈 **Tasa de éxito:** {result['success_rate']}%\n",
+                f"\n📋 **Salida:**\n{result['output']}"
+            ])
+        else:
+            response_text = f"❌ Error ejecutando unittest:\n\n{result['output']}"
+        return [TextContent(type="text", text=response_text)]
     
+    @tool_error_response("❌ Error ejecutando linting")
     async def _python_lint(self, repo_url: str, linter: str = "flake8", venv_name: str = None, base_path: str = "") -> List[TextContent]:
         """Conecta python_lint con el handler Python"""
-        try:
-            result = await self.python_handler.run_linting(repo_url, linter, venv_name, base_path)
-            if result['success']:
-                response_text = f"✅ Linting ejecutado ({result['linter']}):\n\n"
-                response_text += f"📁 **Path:** {result['project_path']}\n"
-                response_text += f"🐍 **Entorno:** {result['venv_name'] or 'Sistema'}\n"
-                response_text += f"🔍 **Issues:** {result['total_issues']}\n"
-                response_text += f"\n📋 **Salida:**\n{result['output']}"
-            else:
-                response_text = f"❌ Error ejecutando linting:\n\n{result['output']}"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error ejecutando linting: {str(e)}")]
+        result = await self.python_handler.run_linting(repo_url, linter, venv_name, base_path)
+        if result['success']:
+            response_text = "".join([
+                f"✅ Linting ejecutado ({result['linter']}):\n\n",
+                f"📁 **Path:** {result['project_path']}\n",
+                f"🐍 **Entorno:** {result['venv_display']}\n",
+                f"🔍 **Issues:** {result['total_issues']}\n",
+                f"\n📋 **Salida:**\n{result['output']}"
+            ])
+        else:
+            response_text = f"❌ Error ejecutando linting:\n\n{result['output']}"
+        return [TextContent(type="text", text=response_text)]
     
+    @tool_error_response("❌ Error formateando código")
     async def _python_format(self, repo_url: str, formatter: str = "black", venv_name: str = None, base_path: str = "") -> List[TextContent]:
         """Conecta python_format con el handler Python"""
-        try:
-            result = await self.python_handler.format_code(repo_url, formatter, venv_name, base_path)
-            if result['success']:
-                response_text = f"✅ Código formateado ({result['formatter']}):\n\n"
-                response_text += f"📁 **Path:** {result['project_path']}\n"
-                response_text += f"🐍 **Entorno:** {result['venv_name'] or 'Sistema'}\n"
-                response_text += f"\n📋 **Output:**\n{result['output']}"
-            else:
-                response_text = f"❌ Error formateando código:\n\n{result['output']}"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error formateando código: {str(e)}")]
+        result = await self.python_handler.format_code(repo_url, formatter, venv_name, base_path)
+        if result['success']:
+            response_text = "".join([
+                f"✅ Código formateado ({result['formatter']}):\n\n",
+                f"📁 **Path:** {result['project_path']}\n",
+                f"🐍 **Entorno:** {result['venv_display']}\n",
+                f"\n📋 **Output:**\n{result['output']}"
+            ])
+        else:
+            response_text = f"❌ Error formateando código:\n\n{result['output']}"
+        return [TextContent(type="text", text=response_text)]
     
+    @tool_error_response("❌ Error analizando estructura")
     async def _python_detect_project(self, repo_url: str) -> List[TextContent]:
         """Conecta python_detect_project con el handler Python"""
-        try:
-            result = await self.python_handler.detect_project_structure(repo_url)
-            response_text = f"📋 **Estructura del proyecto Python:**\n\n"
-            response_text += f"📁 **Archivos fuente:** {result['file_summary']['source_files']}\n"
-            response_text += f"🧪 **Archivos de test:** {result['file_summary']['test_files']}\n"
-            response_text += f"⚙️ **Archivos de config:** {result['file_summary']['config_files']}\n"
-            response_text += f"🔧 **Framework de testing:** {result['testing_framework']}\n"
-            response_text += f"📦 **Requirements:** {result['requirements']['total_packages']} paquetes\n"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error analizando estructura: {str(e)}")]
+        result = await self.python_handler.detect_project_structure(repo_url, summary_only=True)
+        file_summary = result['file_summary']
+        response_text = "".join([
+            "📋 **Estructura del proyecto Python:**\n\n",
+            f"📁 **Archivos fuente:** {file_summary['source_files']}\n",
+            f"🧪 **Archivos de test:** {file_summary['test_files']}\n",
+            f"⚙️ **Archivos de config:** {file_summary['config_files']}\n",
+            f"🔧 **Framework de testing:** {result['testing_framework']}\n",
+            f"📦 **Requirements:** {result['requirements']['total_packages']} paquetes\n"
+        ])
+        return [TextContent(type="text", text=response_text)]
     
+    @tool_error_response("❌ Error obteniendo patrones")
     async def _python_get_test_patterns(self) -> List[TextContent]:
         """Conecta python_get_test_patterns con el handler Python"""
-        try:
-            result = await self.python_handler.get_test_patterns()
-            response_text = f"📋 **Patrones de test Python ({result['total']} disponibles):**\n\n"
-            for pattern in result['patterns']:
-                response_text += f"🔍 **{pattern['name']}**: {pattern['description']}\n"
-                response_text += f"   📝 Patrón: `{pattern['pattern'] or 'Todos'}`\n\n"
-            response_text += f"\n💡 **Ejemplos de uso:**\n"
-            for example in result['usage_examples']:
-                response_text += f"   • {example}\n"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error obteniendo patrones: {str(e)}")]
+        global _TEST_PATTERNS_RESPONSE
+        if _TEST_PATTERNS_RESPONSE is not None:
+            return _TEST_PATTERNS_RESPONSE
+        result = await self.python_handler.get_test_patterns()
+        parts = [f"📋 **Patrones de test Python ({result['total']} disponibles):**\n\n"]
+        for pattern in result['patterns']:
+            parts.append(f"🔍 **{pattern['name']}**: {pattern['description']}\n")
+            parts.append(f"   📝 Patrón: `{pattern['pattern'] or 'Todos'}`\n\n")
+        parts.append("\n💡 **Ejemplos de uso:**\n")
+        for example in result['usage_examples']:
+            parts.append(f"   • {example}\n")
+        _TEST_PATTERNS_RESPONSE = [TextContent(type="text", text="".join(parts))]
+        return _TEST_PATTERNS_RESPONSE
     
+    @tool_error_response("❌ Error obteniendo información de herramientas")
     async def _python_get_tools_info(self) -> List[TextContent]:
         """Conecta python_get_tools_info con el handler Python"""
-        try:
-            result = await self.python_handler.get_quality_tools_info()
-            response_text = f"🔧 **Herramientas de calidad Python:**\n\n"
-            response_text += f"📋 **Linting:** {', '.join([tool['name'] for tool in result['quality_tools']['linting']])}\n"
-            response_text += f"✨ **Formateo:** {', '.join([tool['name'] for tool in result['quality_tools']['formatting']])}\n"
-            response_text += f"🧪 **Testing:** {', '.join([fw['name'] for fw in result['testing_frameworks']])}\n\n"
-            response_text += f"💡 **Workflow recomendado:**\n"
-            for step in result['recommended_workflow']:
-                response_text += f"   {step}\n"
-            return [TextContent(type="text", text=response_text)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"❌ Error obteniendo información de herramientas: {str(e)}")]
+        global _TOOLS_INFO_RESPONSE
+        if _TOOLS_INFO_RESPONSE is not None:
+            return _TOOLS_INFO_RESPONSE
+        result = await self.python_handler.get_quality_tools_info()
+        parts = [
+            "🔧 **Herramientas de calidad Python:**\n\n",
+            f"📋 **Linting:** {result['linting_names']}\n",
+            f"✨ **Formateo:** {result['formatting_names']}\n",
+            f"🧪 **Testing:** {result['testing_names']}\n\n",
+            "💡 **Workflow recomendado:**\n"
+        ]
+        for step in result['recommended_workflow']:
+            parts.append(f"   {step}\n")
+        _TOOLS_INFO_RESPONSE = [TextContent(type="text", text="".join(parts))]
+        return _TOOLS_INFO_RESPONSE
+    
+    async def _python_batch(self, operations: List[Dict[str, Any]]) -> List[TextContent]:
+        """
+        Ejecuta varias tools python_* a la vez y devuelve sus respuestas en el orden pedido
+        
+        Cada operación es {"tool": nombre, "arguments": {...}} con los mismos
+        argumentos que la tool individual. Las operaciones se lanzan en paralelo,
+        así que no deben depender unas de otras (p. ej. formatear y revisar el
+        mismo código). Como mucho se ejecutan _BATCH_CONCURRENCY a la vez.
+        """
+        if not isinstance(operations, list):
+            return [TextContent(type="text", text="❌ python_batch espera una lista de operaciones")]
+        
+        # Validar todas las entradas antes de lanzar nada: (etiqueta, método, argumentos o error)
+        planned = []
+        for index, operation in enumerate(operations, 1):
+            if not isinstance(operation, dict):
+                planned.append((f"#{index}", None, f"❌ Operación #{index} inválida: se esperaba un objeto con 'tool'"))
+                continue
+            tool = operation.get("tool")
+            arguments = operation.get("arguments") or {}
+            method = _BATCH_OPERATIONS.get(tool) if isinstance(tool, str) else None
+            if method is None:
+                planned.append((str(tool), None, f"❌ Operación no admitida en python_batch: {tool}"))
+            elif not isinstance(arguments, dict):
+                planned.append((tool, None, f"❌ Argumentos inválidos para {tool}: se esperaba un objeto"))
+            else:
+                planned.append((tool, method, arguments))
+        
+        semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
+        
+        async def run_operation(method: str, arguments: Dict[str, Any]) -> List[TextContent]:
+            async with semaphore:
+                return await getattr(self, method)(**arguments)
+        
+        results = await asyncio.gather(
+            *(run_operation(method, arguments) for _, method, arguments in planned if method is not None),
+            return_exceptions=True
+        )
+        
+        response = []
+        pending = iter(results)
+        for label, method, detail in planned:
+            response.append(TextContent(type="text", text=f"▶️ **{label}**"))
+            if method is None:
+                response.append(TextContent(type="text", text=detail))
+                continue
+            result = next(pending)
+            if isinstance(result, BaseException):
+                response.append(TextContent(type="text", text=f"❌ Error en {label}: {str(result)}"))
+            else:
+                response.extend(result)
+        return response
@@ -6,1298 +6,1382 @@ from mcp.types import Tool
 from mcp.types import TextContent
 
 from handlers.code_handler import CodeHandler
+from utils.serialization import dumps_json
+from utils.tool_errors import tool_error_response
 
-class SetupToolsAdapterMixin:
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.code_handler = CodeHandler()
-
-    def _setup_tools(self):
-        """Método legacy - las tools ahora se registran automáticamente via decoradores"""
-        # Las tools ahora se registran automáticamente con los decoradores @server.list_tools() y @server.call_tool()
-        # No necesitamos llamar manualmente a add_tool
-        self._setup_tools_decorators()
-
-    # Métodos que delegan en CodeHandler para las tools de análisis C#
-    async def _find_class(self, repo_url, class_name, search_type="direct"):
-        try:
-            result = await self.code_handler.find_class(repo_url, class_name, search_type)
-            from mcp.types import TextContent
-            import json
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-        except Exception as e:
-            from mcp.types import TextContent
-            return [TextContent(type="text", text=f"❌ Error en find_class: {str(e)}")]
-
-    async def _find_elements(self, repo_url, element_type, element_name):
-        try:
-            result = await self.code_handler.find_elements(repo_url, element_type, element_name)
-            from mcp.types import TextContent
-            import json
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-        except Exception as e:
-            from mcp.types import TextContent
-            return [TextContent(type="text", text=f"❌ Error en find_elements: {str(e)}")]
-
-    async def _get_solution_structure(self, repo_url):
-        try:
-            result = await self.code_handler.get_solution_structure(repo_url)
-            from mcp.types import TextContent
-            import json
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-        except Exception as e:
-            from mcp.types import TextContent
-            return [TextContent(type="text", text=f"❌ Error en get_solution_structure: {str(e)}")]
-
-    async def _get_cs_file_content(self, repo_url, file_path):
-        try:
-            result = await self.code_handler.get_file_content(repo_url, file_path)
-            from mcp.types import TextContent
-            import json
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
-        except Exception as e:
-            from mcp.types import TextContent
-            return [TextContent(type="text", text=f"❌ Error en get_cs_file_content: {str(e)}")]
-
-    def _setup_tools_decorators(self):
-        """Configura las herramientas del servidor usando decoradores"""
-        
-        @self.server.list_tools()
-        async def list_tools() -> List[Tool]:
-            """Lista todas las herramientas disponibles"""
-            return [
-                Tool(
-                    name="list_repository_files",
-                    description="Lista todos los archivos del repositorio con filtros avanzados (usa FileHandler)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {"type": "string", "description": "URL del repositorio"},
-                            "file_pattern": {"type": "string", "description": "Patrón de archivos (opcional)"},
-                            "include_directories": {"type": "boolean", "description": "Incluir directorios", "default": False},
-                            "exclude_patterns": {"type": "array", "items": {"type": "string"}, "description": "Patrones a excluir (opcional)"},
-                            "max_depth": {"type": "integer", "description": "Profundidad máxima", "default": 10}
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="check_repository_permissions",
-                    description="Verifica permisos de lectura/escritura en el repositorio o ruta específica (usa FileHandler)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {"type": "string", "description": "URL del repositorio"},
-                            "target_path": {"type": "string", "description": "Ruta relativa a verificar (opcional)"}
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="ping",
-                    description="Test de conectividad - responde con pong",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="git_clone",
-                    description="Clona un repositorio Git en una carpeta destino",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {"type": "string", "description": "URL del repositorio Git"},
-                            "dest_path": {"type": "string", "description": "Carpeta destino (opcional)"},
-                            "force": {"type": "boolean", "description": "Forzar si ya existe", "default": False}
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="echo",
-                    description="Repite el mensaje enviado",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "message": {
-                                "type": "string",
-                                "description": "Mensaje a repetir"
-                            }
-                        },
-                        "required": ["message"]
-                    }
-                ),
-                Tool(
-                    name="get_file_content",
-                    description="Obtiene el contenido de un archivo (soporta rutas absolutas y relativas)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "Ruta del archivo (absoluta o relativa)"
-                            }
-                        },
-                        "required": ["file_path"]
-                    }
-                ),
-                Tool(
-                    name="list_directory",
-                    description="Lista el contenido de un directorio",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "directory_path": {
-                                "type": "string",
-                                "description": "Ruta del directorio a listar",
-                                "default": "."
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="git_status",
-                    description="Obtiene el estado del repositorio Git",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repository_path": {
-                                "type": "string",
-                                "description": "Ruta del repositorio Git",
-                                "default": "."
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="git_init",
-                    description="Inicializa un nuevo repositorio Git",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_path": {
-                                "type": "string",
-                                "description": "Ruta donde inicializar el repositorio"
-                            },
-                            "bare": {
-                                "type": "boolean",
-                                "description": "Si crear un repositorio bare",
-                                "default": False
-                            },
-                            "initial_branch": {
-                                "type": "string",
-                                "description": "Nombre de la rama inicial (opcional)"
-                            }
-                        },
-                        "required": ["repo_path"]
-                    }
-                ),
-                Tool(
-                    name="git_add",
-                    description="Agrega archivos al staging area",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "files": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Lista de archivos específicos (opcional)"
-                            },
-                            "all_files": {
-                                "type": "boolean",
-                                "description": "Si agregar todos los archivos (git add .)",
-                                "default": False
-                            },
-                            "update": {
-                                "type": "boolean",
-                                "description": "Si solo actualizar archivos tracked (git add -u)",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="git_diff",
-                    description="Muestra diferencias entre versiones",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "file_path": {
-                                "type": "string",
-                                "description": "Archivo específico (opcional)"
-                            },
-                            "staged": {
-                                "type": "boolean",
-                                "description": "Si mostrar diferencias staged",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="git_commit",
-                    description="Realiza un commit",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "message": {
-                                "type": "string",
-                                "description": "Mensaje del commit"
-                            },
-                            "files": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Archivos específicos (opcional)"
-                            },
-                            "add_all": {
-                                "type": "boolean",
-                                "description": "Si añadir todos los archivos modificados",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url", "message"]
-                    }
-                ),
-                Tool(
-                    name="git_push",
-                    description="Sube cambios al repositorio remoto",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "branch": {
-                                "type": "string",
-                                "description": "Rama específica (opcional)"
-                            },
-                            "force": {
-                                "type": "boolean",
-                                "description": "Si realizar push forzado",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="git_pull",
-                    description="Descarga cambios del repositorio remoto",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "branch": {
-                                "type": "string",
-                                "description": "Rama específica (opcional)"
-                            },
-                            "rebase": {
-                                "type": "boolean",
-                                "description": "Si usar rebase en lugar de merge",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="git_branch",
-                    description="Gestiona ramas del repositorio",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "action": {
-                                "type": "string",
-                                "description": "Acción a realizar",
-                                "enum": ["create", "delete", "switch", "list", "rename"]
-                            },
-                            "branch_name": {
-                                "type": "string",
-                                "description": "Nombre de la rama"
-                            },
-                            "from_branch": {
-                                "type": "string",
-                                "description": "Rama base (para crear)"
-                            }
-                        },
-                        "required": ["repo_url", "action"]
-                    }
-                ),
-                Tool(
-                    name="git_merge",
-                    description="Fusiona ramas",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "source_branch": {
-                                "type": "string",
-                                "description": "Rama origen"
-                            },
-                            "target_branch": {
-                                "type": "string",
-                                "description": "Rama destino (opcional, por defecto actual)"
-                            },
-                            "no_ff": {
-                                "type": "boolean",
-                                "description": "Si no usar fast-forward",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url", "source_branch"]
-                    }
-                ),
-                Tool(
-                    name="git_stash",
-                    description="Gestiona el stash",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "action": {
-                                "type": "string",
-                                "description": "Acción del stash",
-                                "enum": ["save", "pop", "list", "apply", "drop"]
-                            },
-                            "message": {
-                                "type": "string",
-                                "description": "Mensaje del stash (para save)"
-                            },
-                            "stash_index": {
-                                "type": "integer",
-                                "description": "Índice del stash (para pop/apply/drop)"
-                            }
-                        },
-                        "required": ["repo_url", "action"]
-                    }
-                ),
-                Tool(
-                    name="git_log",
-                    description="Muestra el historial de commits",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Número de commits a mostrar",
-                                "default": 10
-                            },
-                            "branch": {
-                                "type": "string",
-                                "description": "Rama específica (opcional)"
-                            },
-                            "file_path": {
-                                "type": "string",
-                                "description": "Archivo específico (opcional)"
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="git_reset",
-                    description="Resetea el repositorio a un estado anterior",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "commit_hash": {
-                                "type": "string",
-                                "description": "Hash del commit (opcional, HEAD por defecto)"
-                            },
-                            "mode": {
-                                "type": "string",
-                                "description": "Modo de reset",
-                                "enum": ["soft", "mixed", "hard"],
-                                "default": "mixed"
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="git_tag",
-                    description="Gestiona tags del repositorio",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "action": {
-                                "type": "string",
-                                "description": "Acción a realizar",
-                                "enum": ["create", "delete", "list", "push"]
-                            },
-                            "tag_name": {
-                                "type": "string",
-                                "description": "Nombre del tag"
-                            },
-                            "message": {
-                                "type": "string",
-                                "description": "Mensaje del tag (para create)"
-                            },
-                            "commit_hash": {
-                                "type": "string",
-                                "description": "Hash del commit (opcional)"
-                            }
-                        },
-                        "required": ["repo_url", "action"]
-                    }
-                ),
-                Tool(
-                    name="git_remote",
-                    description="Gestiona remotos del repositorio",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "action": {
-                                "type": "string",
-                                "description": "Acción a realizar",
-                                "enum": ["add", "remove", "list", "set-url"]
-                            },
-                            "remote_name": {
-                                "type": "string",
-                                "description": "Nombre del remoto"
-                            },
-                            "remote_url": {
-                                "type": "string",
-                                "description": "URL del remoto"
-                            }
-                        },
-                        "required": ["repo_url", "action"]
-                    }
-                ),
-                Tool(
-                    name="create_directory",
-                    description="Crea una nueva carpeta/directorio (soporta rutas absolutas y relativas)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "directory_path": {
-                                "type": "string",
-                                "description": "Ruta de la carpeta a crear (absoluta o relativa)"
-                            }
-                        },
-                        "required": ["directory_path"]
-                    }
-                ),
-                Tool(
-                    name="rename_directory",
-                    description="Renombra una carpeta/directorio existente (soporta rutas absolutas y relativas)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "old_path": {
-                                "type": "string",
-                                "description": "Ruta actual de la carpeta (absoluta o relativa)"
-                            },
-                            "new_path": {
-                                "type": "string",
-                                "description": "Nueva ruta/nombre de la carpeta (absoluta o relativa)"
-                            }
-                        },
-                        "required": ["old_path", "new_path"]
-                    }
-                ),
-                Tool(
-                    name="delete_directory",
-                    description="Elimina una carpeta/directorio enviándola a la papelera (soporta rutas absolutas y relativas)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "directory_path": {
-                                "type": "string",
-                                "description": "Ruta de la carpeta a eliminar (absoluta o relativa)"
-                            }
-                        },
-                        "required": ["directory_path"]
-                    }
-                ),
-                Tool(
-                    name="set_file_content",
-                    description="Crea un archivo nuevo o modifica el contenido de un archivo existente (soporta rutas absolutas y relativas)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "Ruta del archivo a crear o modificar (absoluta o relativa)"
-                            },
-                            "content": {
-                                "type": "string",
-                                "description": "Contenido a escribir en el archivo"
-                            },
-                            "create_backup": {
-                                "type": "boolean",
-                                "description": "Si crear backup del archivo existente antes de modificar",
-                                "default": True
-                            }
-                        },
-                        "required": ["file_path", "content"]
-                    }
-                ),
-                Tool(
-                    name="rename_file",
-                    description="Renombra o mueve un archivo a otra ubicación",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "source_path": {
-                                "type": "string",
-                                "description": "Ruta actual del archivo"
-                            },
-                            "dest_path": {
-                                "type": "string",
-                                "description": "Nueva ruta/nombre del archivo"
-                            }
-                        },
-                        "required": ["source_path", "dest_path"]
-                    }
-                ),
-                Tool(
-                    name="delete_file",
-                    description="Elimina un archivo enviándolo a la papelera de reciclaje",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "Ruta completa del archivo a eliminar"
-                            }
-                        },
-                        "required": ["file_path"]
-                    }
-                ),
-                Tool(
-                    name="copy_file",
-                    description="Copia un archivo a otra ubicación",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "source_path": {
-                                "type": "string",
-                                "description": "Ruta del archivo origen"
-                            },
-                            "dest_path": {
-                                "type": "string",
-                                "description": "Ruta donde copiar el archivo"
-                            }
-                        },
-                        "required": ["source_path", "dest_path"]
-                    }
-                ),
-                Tool(
-                    name="check_permissions",
-                    description="Verifica permisos CRUD sobre una carpeta o archivo específico",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "target_path": {
-                                "type": "string",
-                                "description": "Ruta a verificar (archivo o directorio)",
-                                "default": "."
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="list_files",
-                    description="Lista archivos del directorio con filtros y metadatos detallados",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "directory_path": {
-                                "type": "string",
-                                "description": "Ruta del directorio a listar",
-                                "default": "."
-                            },
-                            "file_pattern": {
-                                "type": "string",
-                                "description": "Patrón de archivos (ej: *.py, *.txt)"
-                            },
-                            "include_directories": {
-                                "type": "boolean",
-                                "description": "Incluir directorios en la lista",
-                                "default": False
-                            },
-                            "max_depth": {
-                                "type": "integer",
-                                "description": "Profundidad máxima de búsqueda (-1 = ilimitada)",
-                                "default": 1
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                # Herramientas de análisis de código C#
-                Tool(
-                    name="find_class",
-                    description="Localiza clases específicas en repositorios C# con búsqueda directa o profunda",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio C#"
-                            },
-                            "class_name": {
-                                "type": "string",
-                                "description": "Nombre de la clase a buscar"
-                            },
-                            "search_type": {
-                                "type": "string",
-                                "enum": ["direct", "deep"],
-                                "description": "Tipo de búsqueda (direct: por nombre de archivo, deep: contenido completo)",
-                                "default": "direct"
-                            }
-                        },
-                        "required": ["repo_url", "class_name"]
-                    }
-                ),
-                Tool(
-                    name="get_cs_file_content",
-                    description="Obtiene contenido de archivos C# con análisis automático de código",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio C#"
-                            },
-                            "file_path": {
-                                "type": "string",
-                                "description": "Ruta relativa del archivo C#"
-                            }
-                        },
-                        "required": ["repo_url", "file_path"]
-                    }
-                ),
-                Tool(
-                    name="find_elements",
-                    description="Busca elementos específicos como DTOs, Services, Controllers, Interfaces, Enums en código C#",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio C#"
-                            },
-                            "element_type": {
-                                "type": "string",
-                                "enum": ["dto", "service", "controller", "interface", "enum", "class"],
-                                "description": "Tipo de elemento a buscar"
-                            },
-                            "element_name": {
-                                "type": "string",
-                                "description": "Nombre del elemento (búsqueda parcial)"
-                            }
-                        },
-                        "required": ["repo_url", "element_type", "element_name"]
-                    }
-                ),
-                Tool(
-                    name="get_solution_structure",
-                    description="Obtiene la estructura completa de una solución C# con análisis detallado",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio C#"
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                # === Herramientas de C# Testing y Gestión ===
-                Tool(
-                    name="dotnet_check_environment",
-                    description="Verifica el entorno dotnet y proyectos existentes",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio (opcional)"
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="dotnet_create_solution",
-                    description="Crea una nueva solución C#",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "solution_name": {
-                                "type": "string",
-                                "description": "Nombre de la solución"
-                            },
-                            "base_path": {
-                                "type": "string",
-                                "description": "Subdirectorio donde crear la solución",
-                                "default": ""
-                            }
-                        },
-                        "required": ["repo_url", "solution_name"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_create_project",
-                    description="Crea un nuevo proyecto C#",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "project_name": {
-                                "type": "string",
-                                "description": "Nombre del proyecto"
-                            },
-                            "template": {
-                                "type": "string",
-                                "description": "Tipo de proyecto",
-                                "enum": ["console", "classlib", "web", "webapi", "mvc", "razor", "blazorserver", "blazorwasm", "wpf", "winforms", "worker", "mstest", "nunit", "xunit"],
-                                "default": "console"
-                            },
-                            "base_path": {
-                                "type": "string",
-                                "description": "Subdirectorio donde crear el proyecto",
-                                "default": ""
-                            },
-                            "framework": {
-                                "type": "string",
-                                "description": "Target framework (ej: net8.0, net6.0)"
-                            }
-                        },
-                        "required": ["repo_url", "project_name"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_add_project_to_solution",
-                    description="Agrega un proyecto a una solución existente",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "solution_file": {
-                                "type": "string",
-                                "description": "Ruta relativa al archivo .sln"
-                            },
-                            "project_file": {
-                                "type": "string",
-                                "description": "Ruta relativa al archivo .csproj"
-                            }
-                        },
-                        "required": ["repo_url", "solution_file", "project_file"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_list_solution_projects",
-                    description="Lista los proyectos en una solución",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "solution_file": {
-                                "type": "string",
-                                "description": "Ruta relativa al archivo .sln"
-                            }
-                        },
-                        "required": ["repo_url", "solution_file"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_add_package",
-                    description="Agrega un paquete NuGet a un proyecto",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "project_file": {
-                                "type": "string",
-                                "description": "Ruta relativa al archivo .csproj"
-                            },
-                            "package_name": {
-                                "type": "string",
-                                "description": "Nombre del paquete NuGet"
-                            },
-                            "version": {
-                                "type": "string",
-                                "description": "Versión específica del paquete (opcional)"
-                            }
-                        },
-                        "required": ["repo_url", "project_file", "package_name"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_build_solution",
-                    description="Compila una solución C# completa",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "solution_file": {
-                                "type": "string",
-                                "description": "Archivo .sln específico (opcional, usa todo el directorio si no se especifica)"
-                            },
-                            "configuration": {
-                                "type": "string",
-                                "description": "Configuración de compilación",
-                                "enum": ["Debug", "Release"],
-                                "default": "Debug"
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_build_project",
-                    description="Compila un proyecto C# específico",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "project_file": {
-                                "type": "string",
-                                "description": "Ruta relativa al archivo .csproj"
-                            },
-                            "configuration": {
-                                "type": "string",
-                                "description": "Configuración de compilación",
-                                "enum": ["Debug", "Release"],
-                                "default": "Debug"
-                            }
-                        },
-                        "required": ["repo_url", "project_file"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_restore_packages",
-                    description="Restaura paquetes NuGet de un proyecto o solución",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "project_path": {
-                                "type": "string",
-                                "description": "Subdirectorio específico (opcional)",
-                                "default": ""
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_test_all",
-                    description="Ejecuta todos los tests en una solución o proyecto",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "test_path": {
-                                "type": "string",
-                                "description": "Subdirectorio específico con tests (opcional)",
-                                "default": ""
-                            },
-                            "collect_coverage": {
-                                "type": "boolean",
-                                "description": "Si recopilar coverage de código",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_test_filter",
-                    description="Ejecuta tests con filtro específico",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "filter_expression": {
-                                "type": "string",
-                                "description": "Expresión de filtro para tests (ej: TestCategory=Unit, Name~Calculator)"
-                            },
-                            "test_path": {
-                                "type": "string",
-                                "description": "Subdirectorio específico con tests (opcional)",
-                                "default": ""
-                            },
-                            "collect_coverage": {
-                                "type": "boolean",
-                                "description": "Si recopilar coverage de código",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url", "filter_expression"]
-                    }
-                ),
-                Tool(
-                    name="dotnet_get_test_filters",
-                    description="Obtiene filtros de test comunes con ejemplos",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                # === Herramientas de Python Testing y Gestión ===
-                Tool(
-                    name="python_check_environment",
-                    description="Verifica el entorno Python y estructura del proyecto",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio (opcional)"
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="python_create_venv",
-                    description="Crea un entorno virtual Python",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "venv_name": {
-                                "type": "string",
-                                "description": "Nombre del entorno virtual",
-                                "default": "venv"
-                            },
-                            "base_path": {
-                                "type": "string",
-                                "description": "Subdirectorio donde crear el entorno",
-                                "default": ""
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="python_install_packages",
-                    description="Instala paquetes Python usando pip",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "packages": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Lista de paquetes a instalar"
-                            },
-                            "venv_name": {
-                                "type": "string",
-                                "description": "Nombre del entorno virtual (opcional)"
-                            },
-                            "base_path": {
-                                "type": "string",
-                                "description": "Subdirectorio del proyecto",
-                                "default": ""
-                            }
-                        },
-                        "required": ["repo_url", "packages"]
-                    }
-                ),
-                Tool(
-                    name="python_install_requirements",
-                    description="Instala dependencias desde requirements.txt",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "requirements_file": {
-                                "type": "string",
-                                "description": "Nombre del archivo requirements",
-                                "default": "requirements.txt"
-                            },
-                            "venv_name": {
-                                "type": "string",
-                                "description": "Nombre del entorno virtual (opcional)"
-                            },
-                            "base_path": {
-                                "type": "string",
-                                "description": "Subdirectorio del proyecto",
-                                "default": ""
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="python_freeze",
-                    description="Genera archivo requirements.txt",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "venv_name": {
-                                "type": "string",
-                                "description": "Nombre del entorno virtual (opcional)"
-                            },
-                            "base_path": {
-                                "type": "string",
-                                "description": "Subdirectorio del proyecto",
-                                "default": ""
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="python_run_pytest",
-                    description="Ejecuta tests usando pytest",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "test_path": {
-                                "type": "string",
-                                "description": "Directorio o archivo de tests",
-                                "default": "."
-                            },
-                            "venv_name": {
-                                "type": "string",
-                                "description": "Nombre del entorno virtual (opcional)"
-                            },
-                            "test_pattern": {
-                                "type": "string",
-                                "description": "Patrón de tests específicos (opcional)"
-                            },
-                            "collect_coverage": {
-                                "type": "boolean",
-                                "description": "Si recopilar coverage",
-                                "default": False
-                            },
-                            "verbose": {
-                                "type": "boolean",
-                                "description": "Salida verbose",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="python_run_unittest",
-                    description="Ejecuta tests usando unittest",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "test_path": {
-                                "type": "string",
-                                "description": "Directorio o módulo de tests",
-                                "default": "."
-                            },
-                            "venv_name": {
-                                "type": "string",
-                                "description": "Nombre del entorno virtual (opcional)"
-                            },
-                            "test_pattern": {
-                                "type": "string",
-                                "description": "Patrón de tests específicos (opcional)"
-                            },
-                            "verbose": {
-                                "type": "boolean",
-                                "description": "Salida verbose",
-                                "default": False
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="python_lint",
-                    description="Ejecuta linting de código Python",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "linter": {
-                                "type": "string",
-                                "description": "Herramienta de linting",
-                                "enum": ["flake8", "pylint"],
-                                "default": "flake8"
-                            },
-                            "venv_name": {
-                                "type": "string",
-                                "description": "Nombre del entorno virtual (opcional)"
-                            },
-                            "base_path": {
-                                "type": "string",
-                                "description": "Subdirectorio del proyecto",
-                                "default": ""
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="python_format",
-                    description="Formatea código Python",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
-                            },
-                            "formatter": {
-                                "type": "string",
-                                "description": "Herramienta de formateo",
-                                "enum": ["black", "autopep8"],
-                                "default": "black"
-                            },
-                            "venv_name": {
-                                "type": "string",
-                                "description": "Nombre del entorno virtual (opcional)"
-                            },
-                            "base_path": {
-                                "type": "string",
-                                "description": "Subdirectorio del proyecto",
-                                "default": ""
-                            }
-                        },
-                        "required": ["repo_url"]
-                    }
-                ),
-                Tool(
-                    name="python_detect_project",
-                    description="Analiza la estructura del proyecto Python",
-                    inputSchema={
+
+def _json_text(result) -> List[TextContent]:
+    """Respuesta de texto con el resultado del handler serializado a JSON"""
+    return [TextContent(type="text", text=dumps_json(result))]
+
+
+# Tools del servidor: la lista es estática, se construye una sola vez al importar el módulo
+_TOOLS: List[Tool] = [
+    Tool(
+        name="list_repository_files",
+        description="Lista todos los archivos del repositorio con filtros avanzados (usa FileHandler)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio"},
+                "file_pattern": {"type": "string", "description": "Patrón de archivos (opcional)"},
+                "include_directories": {"type": "boolean", "description": "Incluir directorios", "default": False},
+                "exclude_patterns": {"type": "array", "items": {"type": "string"}, "description": "Patrones a excluir (opcional)"},
+                "max_depth": {"type": "integer", "description": "Profundidad máxima", "default": 10}
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="check_repository_permissions",
+        description="Verifica permisos de lectura/escritura en el repositorio o ruta específica (usa FileHandler)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio"},
+                "target_path": {"type": "string", "description": "Ruta relativa a verificar (opcional)"}
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="ping",
+        description="Test de conectividad - responde con pong",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="git_clone",
+        description="Clona un repositorio Git en una carpeta destino",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {"type": "string", "description": "URL del repositorio Git"},
+                "dest_path": {"type": "string", "description": "Carpeta destino (opcional)"},
+                "force": {"type": "boolean", "description": "Forzar si ya existe", "default": False}
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="echo",
+        description="Repite el mensaje enviado",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "Mensaje a repetir"
+                }
+            },
+            "required": ["message"]
+        }
+    ),
+    Tool(
+        name="get_file_content",
+        description="Obtiene el contenido de un archivo (soporta rutas absolutas y relativas)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Ruta del archivo (absoluta o relativa)"
+                }
+            },
+            "required": ["file_path"]
+        }
+    ),
+    Tool(
+        name="list_directory",
+        description="Lista el contenido de un directorio",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "directory_path": {
+                    "type": "string",
+                    "description": "Ruta del directorio a listar",
+                    "default": "."
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="git_status",
+        description="Obtiene el estado del repositorio Git",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repository_path": {
+                    "type": "string",
+                    "description": "Ruta del repositorio Git",
+                    "default": "."
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="git_init",
+        description="Inicializa un nuevo repositorio Git",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_path": {
+                    "type": "string",
+                    "description": "Ruta donde inicializar el repositorio"
+                },
+                "bare": {
+                    "type": "boolean",
+                    "description": "Si crear un repositorio bare",
+                    "default": False
+                },
+                "initial_branch": {
+                    "type": "string",
+                    "description": "Nombre de la rama inicial (opcional)"
+                }
+            },
+            "required": ["repo_path"]
+        }
+    ),
+    Tool(
+        name="git_add",
+        description="Agrega archivos al staging area",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "files": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Lista de archivos específicos (opcional)"
+                },
+                "all_files": {
+                    "type": "boolean",
+                    "description": "Si agregar todos los archivos (git add .)",
+                    "default": False
+                },
+                "update": {
+                    "type": "boolean",
+                    "description": "Si solo actualizar archivos tracked (git add -u)",
+                    "default": False
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="git_diff",
+        description="Muestra diferencias entre versiones",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "file_path": {
+                    "type": "string",
+                    "description": "Archivo específico (opcional)"
+                },
+                "staged": {
+                    "type": "boolean",
+                    "description": "Si mostrar diferencias staged",
+                    "default": False
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="git_commit",
+        description="Realiza un commit",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "message": {
+                    "type": "string",
+                    "description": "Mensaje del commit"
+                },
+                "files": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Archivos específicos (opcional)"
+                },
+                "add_all": {
+                    "type": "boolean",
+                    "description": "Si añadir todos los archivos modificados",
+                    "default": False
+                }
+            },
+            "required": ["repo_url", "message"]
+        }
+    ),
+    Tool(
+        name="git_push",
+        description="Sube cambios al repositorio remoto",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "branch": {
+                    "type": "string",
+                    "description": "Rama específica (opcional)"
+                },
+                "force": {
+                    "type": "boolean",
+                    "description": "Si realizar push forzado",
+                    "default": False
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="git_pull",
+        description="Descarga cambios del repositorio remoto",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "branch": {
+                    "type": "string",
+                    "description": "Rama específica (opcional)"
+                },
+                "rebase": {
+                    "type": "boolean",
+                    "description": "Si usar rebase en lugar de merge",
+                    "default": False
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="git_branch",
+        description="Gestiona ramas del repositorio",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "action": {
+                    "type": "string",
+                    "description": "Acción a realizar",
+                    "enum": ["create", "delete", "switch", "list", "rename"]
+                },
+                "branch_name": {
+                    "type": "string",
+                    "description": "Nombre de la rama"
+                },
+                "from_branch": {
+                    "type": "string",
+                    "description": "Rama base (para crear)"
+                }
+            },
+            "required": ["repo_url", "action"]
+        }
+    ),
+    Tool(
+        name="git_merge",
+        description="Fusiona ramas",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "source_branch": {
+                    "type": "string",
+                    "description": "Rama origen"
+                },
+                "target_branch": {
+                    "type": "string",
+                    "description": "Rama destino (opcional, por defecto actual)"
+                },
+                "no_ff": {
+                    "type": "boolean",
+                    "description": "Si no usar fast-forward",
+                    "default": False
+                }
+            },
+            "required": ["repo_url", "source_branch"]
+        }
+    ),
+    Tool(
+        name="git_stash",
+        description="Gestiona el stash",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "action": {
+                    "type": "string",
+                    "description": "Acción del stash",
+                    "enum": ["save", "pop", "list", "apply", "drop"]
+                },
+                "message": {
+                    "type": "string",
+                    "description": "Mensaje del stash (para save)"
+                },
+                "stash_index": {
+                    "type": "integer",
+                    "description": "Índice del stash (para pop/apply/drop)"
+                }
+            },
+            "required": ["repo_url", "action"]
+        }
+    ),
+    Tool(
+        name="git_log",
+        description="Muestra el historial de commits",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Número de commits a mostrar",
+                    "default": 10
+                },
+                "branch": {
+                    "type": "string",
+                    "description": "Rama específica (opcional)"
+                },
+                "file_path": {
+                    "type": "string",
+                    "description": "Archivo específico (opcional)"
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="git_reset",
+        description="Resetea el repositorio a un estado anterior",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "commit_hash": {
+                    "type": "string",
+                    "description": "Hash del commit (opcional, HEAD por defecto)"
+                },
+                "mode": {
+                    "type": "string",
+                    "description": "Modo de reset",
+                    "enum": ["soft", "mixed", "hard"],
+                    "default": "mixed"
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="git_tag",
+        description="Gestiona tags del repositorio",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "action": {
+                    "type": "string",
+                    "description": "Acción a realizar",
+                    "enum": ["create", "delete", "list", "push"]
+                },
+                "tag_name": {
+                    "type": "string",
+                    "description": "Nombre del tag"
+                },
+                "message": {
+                    "type": "string",
+                    "description": "Mensaje del tag (para create)"
+                },
+                "commit_hash": {
+                    "type": "string",
+                    "description": "Hash del commit (opcional)"
+                }
+            },
+            "required": ["repo_url", "action"]
+        }
+    ),
+    Tool(
+        name="git_remote",
+        description="Gestiona remotos del repositorio",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "action": {
+                    "type": "string",
+                    "description": "Acción a realizar",
+                    "enum": ["add", "remove", "list", "set-url"]
+                },
+                "remote_name": {
+                    "type": "string",
+                    "description": "Nombre del remoto"
+                },
+                "remote_url": {
+                    "type": "string",
+                    "description": "URL del remoto"
+                }
+            },
+            "required": ["repo_url", "action"]
+        }
+    ),
+    Tool(
+        name="create_directory",
+        description="Crea una nueva carpeta/directorio (soporta rutas absolutas y relativas)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "directory_path": {
+                    "type": "string",
+                    "description": "Ruta de la carpeta a crear (absoluta o relativa)"
+                }
+            },
+            "required": ["directory_path"]
+        }
+    ),
+    Tool(
+        name="rename_directory",
+        description="Renombra una carpeta/directorio existente (soporta rutas absolutas y relativas)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "old_path": {
+                    "type": "string",
+                    "description": "Ruta actual de la carpeta (absoluta o relativa)"
+                },
+                "new_path": {
+                    "type": "string",
+                    "description": "Nueva ruta/nombre de la carpeta (absoluta o relativa)"
+                }
+            },
+            "required": ["old_path", "new_path"]
+        }
+    ),
+    Tool(
+        name="delete_directory",
+        description="Elimina una carpeta/directorio enviándola a la papelera (soporta rutas absolutas y relativas)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "directory_path": {
+                    "type": "string",
+                    "description": "Ruta de la carpeta a eliminar (absoluta o relativa)"
+                }
+            },
+            "required": ["directory_path"]
+        }
+    ),
+    Tool(
+        name="set_file_content",
+        description="Crea un archivo nuevo o modifica el contenido de un archivo existente (soporta rutas absolutas y relativas)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Ruta del archivo a crear o modificar (absoluta o relativa)"
+                },
+                "content": {
+                    "type": "string",
+                    "description": "Contenido a escribir en el archivo"
+                },
+                "create_backup": {
+                    "type": "boolean",
+                    "description": "Si crear backup del archivo existente antes de modificar",
+                    "default": True
+                }
+            },
+            "required": ["file_path", "content"]
+        }
+    ),
+    Tool(
+        name="rename_file",
+        description="Renombra o mueve un archivo a otra ubicación",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "source_path": {
+                    "type": "string",
+                    "description": "Ruta actual del archivo"
+                },
+                "dest_path": {
+                    "type": "string",
+                    "description": "Nueva ruta/nombre del archivo"
+                }
+            },
+            "required": ["source_path", "dest_path"]
+        }
+    ),
+    Tool(
+        name="delete_file",
+        description="Elimina un archivo enviándolo a la papelera de reciclaje",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Ruta completa del archivo a eliminar"
+                }
+            },
+            "required": ["file_path"]
+        }
+    ),
+    Tool(
+        name="copy_file",
+        description="Copia un archivo a otra ubicación",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "source_path": {
+                    "type": "string",
+                    "description": "Ruta del archivo origen"
+                },
+                "dest_path": {
+                    "type": "string",
+                    "description": "Ruta donde copiar el archivo"
+                }
+            },
+            "required": ["source_path", "dest_path"]
+        }
+    ),
+    Tool(
+        name="check_permissions",
+        description="Verifica permisos CRUD sobre una carpeta o archivo específico",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "target_path": {
+                    "type": "string",
+                    "description": "Ruta a verificar (archivo o directorio)",
+                    "default": "."
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="list_files",
+        description="Lista archivos del directorio con filtros y metadatos detallados",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "directory_path": {
+                    "type": "string",
+                    "description": "Ruta del directorio a listar",
+                    "default": "."
+                },
+                "file_pattern": {
+                    "type": "string",
+                    "description": "Patrón de archivos (ej: *.py, *.txt)"
+                },
+                "include_directories": {
+                    "type": "boolean",
+                    "description": "Incluir directorios en la lista",
+                    "default": False
+                },
+                "max_depth": {
+                    "type": "integer",
+                    "description": "Profundidad máxima de búsqueda (-1 = ilimitada)",
+                    "default": 1
+                }
+            },
+            "required": []
+        }
+    ),
+    # Herramientas de análisis de código C#
+    Tool(
+        name="find_class",
+        description="Localiza clases específicas en repositorios C# con búsqueda directa o profunda",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio C#"
+                },
+                "class_name": {
+                    "type": "string",
+                    "description": "Nombre de la clase a buscar"
+                },
+                "search_type": {
+                    "type": "string",
+                    "enum": ["direct", "deep"],
+                    "description": "Tipo de búsqueda (direct: por nombre de archivo, deep: contenido completo)",
+                    "default": "direct"
+                }
+            },
+            "required": ["repo_url", "class_name"]
+        }
+    ),
+    Tool(
+        name="get_cs_file_content",
+        description="Obtiene contenido de archivos C# con análisis automático de código",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio C#"
+                },
+                "file_path": {
+                    "type": "string",
+                    "description": "Ruta relativa del archivo C#"
+                }
+            },
+            "required": ["repo_url", "file_path"]
+        }
+    ),
+    Tool(
+        name="find_elements",
+        description="Busca elementos específicos como DTOs, Services, Controllers, Interfaces, Enums en código C#",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio C#"
+                },
+                "element_type": {
+                    "type": "string",
+                    "enum": ["dto", "service", "controller", "interface", "enum", "class"],
+                    "description": "Tipo de elemento a buscar"
+                },
+                "element_name": {
+                    "type": "string",
+                    "description": "Nombre del elemento (búsqueda parcial)"
+                }
+            },
+            "required": ["repo_url", "element_type", "element_name"]
+        }
+    ),
+    Tool(
+        name="find_classes",
+        description="Localiza varias clases C# en una sola llamada, leyendo la solución una única vez",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio C#"
+                },
+                "class_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Nombres de las clases a buscar"
+                },
+                "search_type": {
+                    "type": "string",
+                    "enum": ["direct", "deep"],
+                    "description": "Tipo de búsqueda (direct: por nombre de archivo, deep: contenido completo)",
+                    "default": "direct"
+                }
+            },
+            "required": ["repo_url", "class_names"]
+        }
+    ),
+    Tool(
+        name="find_elements_batch",
+        description="Busca varios elementos C# del mismo tipo en una sola llamada, analizando la solución una única vez",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio C#"
+                },
+                "element_type": {
+                    "type": "string",
+                    "enum": ["dto", "service", "controller", "interface", "enum", "class"],
+                    "description": "Tipo de elemento a buscar"
+                },
+                "element_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Nombres de los elementos (búsqueda parcial)"
+                }
+            },
+            "required": ["repo_url", "element_type", "element_names"]
+        }
+    ),
+    Tool(
+        name="get_solution_structure",
+        description="Obtiene la estructura completa de una solución C# con análisis detallado",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio C#"
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    # === Herramientas de C# Testing y Gestión ===
+    Tool(
+        name="dotnet_check_environment",
+        description="Verifica el entorno dotnet y proyectos existentes",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio (opcional)"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="dotnet_create_solution",
+        description="Crea una nueva solución C#",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "solution_name": {
+                    "type": "string",
+                    "description": "Nombre de la solución"
+                },
+                "base_path": {
+                    "type": "string",
+                    "description": "Subdirectorio donde crear la solución",
+                    "default": ""
+                }
+            },
+            "required": ["repo_url", "solution_name"]
+        }
+    ),
+    Tool(
+        name="dotnet_create_project",
+        description="Crea un nuevo proyecto C#",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "project_name": {
+                    "type": "string",
+                    "description": "Nombre del proyecto"
+                },
+                "template": {
+                    "type": "string",
+                    "description": "Tipo de proyecto",
+                    "enum": ["console", "classlib", "web", "webapi", "mvc", "razor", "blazorserver", "blazorwasm", "wpf", "winforms", "worker", "mstest", "nunit", "xunit"],
+                    "default": "console"
+                },
+                "base_path": {
+                    "type": "string",
+                    "description": "Subdirectorio donde crear el proyecto",
+                    "default": ""
+                },
+                "framework": {
+                    "type": "string",
+                    "description": "Target framework (ej: net8.0, net6.0)"
+                }
+            },
+            "required": ["repo_url", "project_name"]
+        }
+    ),
+    Tool(
+        name="dotnet_add_project_to_solution",
+        description="Agrega un proyecto a una solución existente",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "solution_file": {
+                    "type": "string",
+                    "description": "Ruta relativa al archivo .sln"
+                },
+                "project_file": {
+                    "type": "string",
+                    "description": "Ruta relativa al archivo .csproj"
+                }
+            },
+            "required": ["repo_url", "solution_file", "project_file"]
+        }
+    ),
+    Tool(
+        name="dotnet_list_solution_projects",
+        description="Lista los proyectos en una solución",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "solution_file": {
+                    "type": "string",
+                    "description": "Ruta relativa al archivo .sln"
+                }
+            },
+            "required": ["repo_url", "solution_file"]
+        }
+    ),
+    Tool(
+        name="dotnet_add_package",
+        description="Agrega un paquete NuGet a un proyecto",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "project_file": {
+                    "type": "string",
+                    "description": "Ruta relativa al archivo .csproj"
+                },
+                "package_name": {
+                    "type": "string",
+                    "description": "Nombre del paquete NuGet"
+                },
+                "version": {
+                    "type": "string",
+                    "description": "Versión específica del paquete (opcional)"
+                }
+            },
+            "required": ["repo_url", "project_file", "package_name"]
+        }
+    ),
+    Tool(
+        name="dotnet_build_solution",
+        description="Compila una solución C# completa",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "solution_file": {
+                    "type": "string",
+                    "description": "Archivo .sln específico (opcional, usa todo el directorio si no se especifica)"
+                },
+                "configuration": {
+                    "type": "string",
+                    "description": "Configuración de compilación",
+                    "enum": ["Debug", "Release"],
+                    "default": "Debug"
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="dotnet_build_project",
+        description="Compila un proyecto C# específico",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "project_file": {
+                    "type": "string",
+                    "description": "Ruta relativa al archivo .csproj"
+                },
+                "configuration": {
+                    "type": "string",
+                    "description": "Configuración de compilación",
+                    "enum": ["Debug", "Release"],
+                    "default": "Debug"
+                }
+            },
+            "required": ["repo_url", "project_file"]
+        }
+    ),
+    Tool(
+        name="dotnet_restore_packages",
+        description="Restaura paquetes NuGet de un proyecto o solución",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "project_path": {
+                    "type": "string",
+                    "description": "Subdirectorio específico (opcional)",
+                    "default": ""
+                },
+                "project_paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Varios subdirectorios a restaurar en paralelo (opcional, sustituye a project_path)"
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="dotnet_test_all",
+        description="Ejecuta todos los tests en una solución o proyecto",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "test_path": {
+                    "type": "string",
+                    "description": "Subdirectorio específico con tests (opcional)",
+                    "default": ""
+                },
+                "collect_coverage": {
+                    "type": "boolean",
+                    "description": "Si recopilar coverage de código",
+                    "default": False
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="dotnet_test_filter",
+        description="Ejecuta tests con filtro específico",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "filter_expression": {
+                    "type": "string",
+                    "description": "Expresión de filtro para tests (ej: TestCategory=Unit, Name~Calculator)"
+                },
+                "test_path": {
+                    "type": "string",
+                    "description": "Subdirectorio específico con tests (opcional)",
+                    "default": ""
+                },
+                "collect_coverage": {
+                    "type": "boolean",
+                    "description": "Si recopilar coverage de código",
+                    "default": False
+                }
+            },
+            "required": ["repo_url", "filter_expression"]
+        }
+    ),
+    Tool(
+        name="dotnet_get_test_filters",
+        description="Obtiene filtros de test comunes con ejemplos",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    # === Herramientas de Python Testing y Gestión ===
+    Tool(
+        name="python_check_environment",
+        description="Verifica el entorno Python y estructura del proyecto",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio (opcional)"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="python_create_venv",
+        description="Crea un entorno virtual Python",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "venv_name": {
+                    "type": "string",
+                    "description": "Nombre del entorno virtual",
+                    "default": "venv"
+                },
+                "base_path": {
+                    "type": "string",
+                    "description": "Subdirectorio donde crear el entorno",
+                    "default": ""
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="python_install_packages",
+        description="Instala paquetes Python usando pip",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "packages": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Lista de paquetes a instalar"
+                },
+                "venv_name": {
+                    "type": "string",
+                    "description": "Nombre del entorno virtual (opcional)"
+                },
+                "base_path": {
+                    "type": "string",
+                    "description": "Subdirectorio del proyecto",
+                    "default": ""
+                }
+            },
+            "required": ["repo_url", "packages"]
+        }
+    ),
+    Tool(
+        name="python_install_requirements",
+        description="Instala dependencias desde requirements.txt",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "requirements_file": {
+                    "type": "string",
+                    "description": "Nombre del archivo requirements",
+                    "default": "requirements.txt"
+                },
+                "venv_name": {
+                    "type": "string",
+                    "description": "Nombre del entorno virtual (opcional)"
+                },
+                "base_path": {
+                    "type": "string",
+                    "description": "Subdirectorio del proyecto",
+                    "default": ""
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="python_freeze",
+        description="Genera archivo requirements.txt",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "venv_name": {
+                    "type": "string",
+                    "description": "Nombre del entorno virtual (opcional)"
+                },
+                "base_path": {
+                    "type": "string",
+                    "description": "Subdirectorio del proyecto",
+                    "default": ""
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="python_run_pytest",
+        description="Ejecuta tests usando pytest",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "test_path": {
+                    "type": "string",
+                    "description": "Directorio o archivo de tests",
+                    "default": "."
+                },
+                "venv_name": {
+                    "type": "string",
+                    "description": "Nombre del entorno virtual (opcional)"
+                },
+                "test_pattern": {
+                    "type": "string",
+                    "description": "Patrón de tests específicos (opcional)"
+                },
+                "collect_coverage": {
+                    "type": "boolean",
+                    "description": "Si recopilar coverage",
+                    "default": False
+                },
+                "verbose": {
+                    "type": "boolean",
+                    "description": "Salida verbose",
+                    "default": False
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="python_run_unittest",
+        description="Ejecuta tests usando unittest",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "test_path": {
+                    "type": "string",
+                    "description": "Directorio o módulo de tests",
+                    "default": "."
+                },
+                "venv_name": {
+                    "type": "string",
+                    "description": "Nombre del entorno virtual (opcional)"
+                },
+                "test_pattern": {
+                    "type": "string",
+                    "description": "Patrón de tests específicos (opcional)"
+                },
+                "verbose": {
+                    "type": "boolean",
+                    "description": "Salida verbose",
+                    "default": False
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="python_lint",
+        description="Ejecuta linting de código Python",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "linter": {
+                    "type": "string",
+                    "description": "Herramienta de linting",
+                    "enum": ["flake8", "pylint"],
+                    "default": "flake8"
+                },
+                "venv_name": {
+                    "type": "string",
+                    "description": "Nombre del entorno virtual (opcional)"
+                },
+                "base_path": {
+                    "type": "string",
+                    "description": "Subdirectorio del proyecto",
+                    "default": ""
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="python_format",
+        description="Formatea código Python",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                },
+                "formatter": {
+                    "type": "string",
+                    "description": "Herramienta de formateo",
+                    "enum": ["black", "autopep8"],
+                    "default": "black"
+                },
+                "venv_name": {
+                    "type": "string",
+                    "description": "Nombre del entorno virtual (opcional)"
+                },
+                "base_path": {
+                    "type": "string",
+                    "description": "Subdirectorio del proyecto",
+                    "default": ""
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="python_detect_project",
+        description="Analiza la estructura del proyecto Python",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL del repositorio"
+                }
+            },
+            "required": ["repo_url"]
+        }
+    ),
+    Tool(
+        name="python_get_test_patterns",
+        description="Obtiene patrones de test comunes con ejemplos",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="python_get_tools_info",
+        description="Obtiene información sobre herramientas de calidad disponibles",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="python_batch",
+        description="Ejecuta en paralelo varias herramientas python_* independientes y devuelve sus resultados en orden",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "operations": {
+                    "type": "array",
+                    "description": "Operaciones a ejecutar; no deben depender unas de otras",
+                    "items": {
                         "type": "object",
                         "properties": {
-                            "repo_url": {
-                                "type": "string",
-                                "description": "URL del repositorio"
+                            "tool": {
+                                "type": "string",
+                                "description": "Herramienta a ejecutar",
+                                "enum": [
+                                    "python_check_environment", "python_install_packages",
+                                    "python_install_requirements", "python_freeze",
+                                    "python_run_pytest", "python_run_unittest", "python_lint",
+                                    "python_format", "python_detect_project"
+                                ]
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Argumentos de la herramienta"
                             }
                         },
-                        "required": ["repo_url"]
+                        "required": ["tool"]
                     }
-                ),
-                Tool(
-                    name="python_get_test_patterns",
-                    description="Obtiene patrones de test comunes con ejemplos",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="python_get_tools_info",
-                    description="Obtiene información sobre herramientas de calidad disponibles",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                )
-            ]
+                }
+            },
+            "required": ["operations"]
+        }
+    )
+]
+
+
+class SetupToolsAdapterMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.code_handler = CodeHandler()
+
+    def _setup_tools(self):
+        """Método legacy - las tools ahora se registran automáticamente via decoradores"""
+        # Las tools ahora se registran automáticamente con los decoradores @server.list_tools() y @server.call_tool()
+        # No necesitamos llamar manualmente a add_tool
+        self._setup_tools_decorators()
+
+    # Métodos que delegan en CodeHandler para las tools de análisis C#
+    @tool_error_response("❌ Error en find_class")
+    async def _find_class(self, repo_url, class_name, search_type="direct"):
+        return _json_text(await self.code_handler.find_class(repo_url, class_name, search_type))
+
+    @tool_error_response("❌ Error en find_elements")
+    async def _find_elements(self, repo_url, element_type, element_name):
+        return _json_text(await self.code_handler.find_elements(repo_url, element_type, element_name))
+
+    @tool_error_response("❌ Error en find_classes")
+    async def _find_classes(self, repo_url, class_names, search_type="direct"):
+        return _json_text(await self.code_handler.find_classes(repo_url, class_names, search_type))
+
+    @tool_error_response("❌ Error en find_elements_batch")
+    async def _find_elements_batch(self, repo_url, element_type, element_names):
+        return _json_text(await self.code_handler.find_elements_batch(repo_url, element_type, element_names))
+
+    @tool_error_response("❌ Error en get_solution_structure")
+    async def _get_solution_structure(self, repo_url):
+        return _json_text(await self.code_handler.get_solution_structure(repo_url))
+
+    @tool_error_response("❌ Error en get_cs_file_content")
+    async def _get_cs_file_content(self, repo_url, file_path):
+        return _json_text(await self.code_handler.get_file_content(repo_url, file_path))
+
+    def _setup_tools_decorators(self):
+        """Configura las herramientas del servidor usando decoradores"""
+        
+        @self.server.list_tools()
+        async def list_tools() -> List[Tool]:
+            """Lista todas las herramientas disponibles"""
+            return _TOOLS
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
@@ -1847,6 +1931,40 @@ class SetupToolsAdapterMixin:
                     
                     return result
                 
+                elif name == "find_classes":
+                    repo_url = arguments.get("repo_url", "")
+                    class_names = arguments.get("class_names", [])
+                    search_type = arguments.get("search_type", "direct")
+                    result = await self._find_classes(repo_url, class_names, search_type)
+                    execution_time = time.time() - start_time
+                    
+                    self.logger.log_tool_execution(
+                        tool_name=name,
+                        arguments=arguments,
+                        success=True,
+                        result=result,
+                        execution_time=execution_time
+                    )
+                    
+                    return result
+                
+                elif name == "find_elements_batch":
+                    repo_url = arguments.get("repo_url", "")
+                    element_type = arguments.get("element_type", "")
+                    element_names = arguments.get("element_names", [])
+                    result = await self._find_elements_batch(repo_url, element_type, element_names)
+                    execution_time = time.time() - start_time
+                    
+                    self.logger.log_tool_execution(
+                        tool_name=name,
+                        arguments=arguments,
+                        success=True,
+                        result=result,
+                        execution_time=execution_time
+                    )
+                    
+                    return result
+                
                 elif name == "get_solution_structure":
                     repo_url = arguments.get("repo_url", "")
                     result = await self._get_solution_structure(repo_url)
@@ -2088,7 +2206,11 @@ class SetupToolsAdapterMixin:
                     try:
                         repo_url = arguments.get("repo_url", "")
                         project_path = arguments.get("project_path", "")
-                        result = await self._dotnet_restore_packages(repo_url, project_path)
+                        project_paths = arguments.get("project_paths") or []
+                        if project_paths:
+                            result = await self._dotnet_restore_many(repo_url, project_paths)
+                        else:
+                            result = await self._dotnet_restore_packages(repo_url, project_path)
                         execution_time = time.time() - start_time
                         
                         self.logger.log_tool_execution(
@@ -2578,6 +2700,35 @@ class SetupToolsAdapterMixin:
                         
                         return result
                 
+                elif name == "python_batch":
+                    try:
+                        operations = arguments.get("operations", [])
+                        result = await self._python_batch(operations)
+                        execution_time = time.time() - start_time
+                        
+                        self.logger.log_tool_execution(
+                            tool_name=name,
+                            arguments=arguments,
+                            success=True,
+                            result=result,
+                            execution_time=execution_time
+                        )
+                        
+                        return result
+                    except Exception as e:
+                        execution_time = time.time() - start_time
+                        result = [TextContent(type="text", text=f"❌ Error en python_batch: {str(e)}")]
+                        
+                        self.logger.log_tool_execution(
+                            tool_name=name,
+                            arguments=arguments,
+                            success=False,
+                            error=str(e),
+                            execution_time=execution_time
+                        )
+                        
+                        return result
+                
                 elif name == "get_logs_stats":
                     try:
                         hours = arguments.get("hours", 24)
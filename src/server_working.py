@@ -5,17 +5,10 @@ Servidor MCP completamente funcional para Claude Desktop
 """
 
 import asyncio
+import os
 import sys
 from pathlib import Path
 
-# Importación para papelera de reciclaje en Windows
-if sys.platform == "win32":
-    try:
-        import winshell
-    except ImportError:
-        winshell = None
-        print("[WARNING] winshell no disponible - eliminación a papelera deshabilitada", file=sys.stderr)
-
 # Configuración de encoding para Windows
 if sys.platform == "win32":
     import locale
@@ -143,6 +136,20 @@ if __name__ == "__main__":
         # Configurar event loop para Windows
         if sys.platform == "win32":
             asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        else:
+            # uvloop (opcional) reduce el coste de cada subproceso git/dotnet/python
+            try:
+                import uvloop
+                uvloop.install()
+            except ImportError:
+                # Sin uvloop, Python < 3.12 vigila cada subproceso con un hilo propio;
+                # con pidfd (Linux 5.3+) la espera pasa al propio bucle de eventos
+                if sys.version_info < (3, 12) and hasattr(os, "pidfd_open"):
+                    try:
+                        os.close(os.pidfd_open(os.getpid()))
+                        asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+                    except OSError:
+                        pass
         
         # Ejecutar servidor
         asyncio.run(main())
@@ -3,11 +3,58 @@ Servicio para análisis de código C#
 """
 import re
 import os
+import atexit
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 from utils.exceptions import CodeAnalysisError
 
+# Por debajo de este número de archivos no compensa repartir el análisis entre procesos
+_PROCESS_POOL_MIN_FILES = 8
+
+# Pool de procesos para el análisis por lotes: el análisis con regex es CPU y con el
+# GIL bloquearía el bucle de eventos. Se crea al primer uso ("spawn" evita heredar
+# hilos y locks del servidor) y se cierra al salir
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+# Analizador de cada proceso trabajador
+_worker_analyzer = None
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Devuelve el pool de procesos compartido, creándolo si hace falta"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        atexit.register(_process_pool.shutdown, wait=False, cancel_futures=True)
+    return _process_pool
+
+def _analyze_files_worker(file_paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Punto de entrada en los procesos trabajadores
+    
+    Args:
+        file_paths: Rutas de los archivos a analizar
+        
+    Returns:
+        Análisis de cada archivo, o None si ese archivo no se pudo analizar
+    """
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = CodeAnalyzer()
+    results = []
+    for file_path in file_paths:
+        try:
+            results.append(_worker_analyzer.analyze_file_sync(file_path))
+        except CodeAnalysisError:
+            results.append(None)
+    return results
+
 class CodeAnalyzer:
     """Analizador de código C# para extraer información estructural"""
     
@@ -30,6 +77,41 @@ class CodeAnalyzer:
         """
         Analiza un archivo C# y extrae información estructural
         
+        Args:
+            file_path: Ruta del archivo a analizar
+            
+        Returns:
+            Información del análisis
+        """
+        return self.analyze_file_sync(file_path)
+    
+    async def analyze_files(self, file_paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analiza varios archivos C#, repartiéndolos entre procesos si son muchos
+        
+        Args:
+            file_paths: Rutas de los archivos a analizar
+            
+        Returns:
+            Análisis de cada archivo en el mismo orden, o None si ese archivo falló
+        """
+        if len(file_paths) < _PROCESS_POOL_MIN_FILES:
+            return _analyze_files_worker(file_paths)
+        
+        # Lotes de varios archivos para no pagar la comunicación entre procesos por archivo
+        chunksize = max(1, len(file_paths) // ((os.cpu_count() or 1) * 4))
+        loop = asyncio.get_running_loop()
+        pool = _get_process_pool()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, _analyze_files_worker, file_paths[start:start + chunksize])
+            for start in range(0, len(file_paths), chunksize)
+        ))
+        return [analysis for chunk in chunks for analysis in chunk]
+    
+    def analyze_file_sync(self, file_path: str) -> Dict[str, Any]:
+        """
+        Variante síncrona de analyze_file, usable desde otros procesos
+        
         Args:
             file_path: Ruta del archivo a analizar
             
@@ -90,17 +172,14 @@ class CodeAnalyzer:
                 }
             }
             
-            for file_path in cs_files:
-                try:
-                    file_analysis = await self.analyze_file(file_path)
-                    solution_analysis['files'].append(file_analysis)
-                    
-                    # Actualizar resumen
-                    self._update_solution_summary(solution_analysis['summary'], file_analysis)
-                    
-                except Exception:
-                    # Continuar con otros archivos si uno falla
+            for file_analysis in await self.analyze_files(cs_files):
+                # Continuar con otros archivos si uno falla
+                if file_analysis is None:
                     continue
+                solution_analysis['files'].append(file_analysis)
+                
+                # Actualizar resumen
+                self._update_solution_summary(solution_analysis['summary'], file_analysis)
             
             # Convertir set a lista para serialización
             solution_analysis['summary']['namespaces'] = list(solution_analysis['summary']['namespaces'])
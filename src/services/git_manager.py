@@ -1,23 +1,121 @@
 """
 Servicio para gestión de operaciones Git - VERSIÓN CORREGIDA
 """
+import asyncio
 import os
 import hashlib
-import os
-import hashlib
+import re
 import shutil
 import tempfile
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from git import Repo, GitCommandError, InvalidGitRepositoryError
 
 try:
     from ..utils.exceptions import GitError, RepositoryError
+    from ..utils.validators import ValidatedBranchName, ValidatedCommitMessage
     from .file_manager import FileManager
 except ImportError:
     # Fallback para cuando se ejecuta como script standalone
     from utils.exceptions import GitError, RepositoryError
+    from utils.validators import ValidatedBranchName, ValidatedCommitMessage
     from services.file_manager import FileManager
 
+# Resumen de `git commit`: " 3 files changed, 10 insertions(+)" (Git.execute fija LC_ALL=C)
+_FILES_CHANGED_RE = re.compile(r"(\d+) files? changed")
+
+# Campos de `git for-each-ref` (separados por NUL, cada ref termina en 0x1e):
+# nombre, objeto, objeto apuntado, tipo, HEAD actual, fechas del commit y mensaje
+_REF_FORMAT = (
+    "%(refname)%00%(objectname)%00%(*objectname)%00%(objecttype)%00%(HEAD)%00"
+    "%(committerdate:format:%Y-%m-%d %H:%M:%S)%00%(*committerdate:format:%Y-%m-%d %H:%M:%S)%00"
+    "%(contents)%1e"
+)
+
+# Hilos para las operaciones de red de Git (clone, fetch): esperan al proceso git
+# sin bloquear el bucle de eventos y terminan aunque el cliente cancele la llamada
+_GIT_NETWORK_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="git-net")
+
+# Los fetch de git status tienen su propio pool para que los clones lentos no
+# retengan las lecturas interactivas, y un límite de espera: si se supera, el
+# estado se devuelve sin ahead/behind y el fetch termina en segundo plano
+_GIT_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="git-fetch")
+_STATUS_FETCH_TIMEOUT = 15.0
+
+def _clone_blocking(repo_url: str, local_path: str, force: bool) -> None:
+    """Clona (o vuelve a clonar si force) un repositorio con llamadas bloqueantes"""
+    if os.path.exists(local_path) and force:
+        _close_repo(local_path)
+        shutil.rmtree(local_path)
+    if not os.path.exists(local_path):
+        parent_dir = os.path.dirname(local_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        Repo.clone_from(repo_url, local_path)
+
+def _fetch_origin_blocking(repo_path: str) -> None:
+    """
+    Hace fetch de origin con un Repo propio del hilo
+    
+    Los Repo de _REPO_CACHE (y sus procesos cat-file) no son seguros entre
+    hilos, y el bucle de eventos los sigue usando mientras dura el fetch.
+    """
+    with Repo(repo_path) as repo:
+        repo.remotes.origin.fetch()
+
+def run_git_network(func, *args, executor: ThreadPoolExecutor = _GIT_NETWORK_EXECUTOR) -> asyncio.Future:
+    """Lanza una operación Git de red bloqueante en un pool de red (arranca sin esperar al await)"""
+    return asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+# Objetos Repo reutilizados por ruta: GitPython mantiene en cada uno sus procesos
+# persistentes `git cat-file --batch`/`--batch-check`, que así sobreviven entre llamadas
+_REPO_CACHE: Dict[str, Tuple[Repo, float]] = {}
+_REPO_CACHE_MAX = 16
+_REPO_IDLE_TIMEOUT = 300.0
+
+def _open_repo(repo_path: str) -> Repo:
+    """
+    Devuelve el Repo de una ruta reutilizando el de llamadas anteriores
+    
+    Los Repo sin uso durante _REPO_IDLE_TIMEOUT segundos se cierran (terminando
+    sus procesos cat-file) y se descartan.
+    
+    Args:
+        repo_path: Ruta local del repositorio
+        
+    Returns:
+        Objeto Repo de GitPython
+    """
+    now = time.monotonic()
+    for path, (repo, last_used) in list(_REPO_CACHE.items()):
+        if now - last_used > _REPO_IDLE_TIMEOUT:
+            _close_repo(path)
+    
+    key = os.path.abspath(repo_path)
+    cached = _REPO_CACHE.get(key)
+    if cached is not None and os.path.isdir(cached[0].git_dir):
+        repo = cached[0]
+    else:
+        if cached is not None:
+            _close_repo(key)
+        repo = Repo(key)
+        if len(_REPO_CACHE) >= _REPO_CACHE_MAX:
+            _close_repo(next(iter(_REPO_CACHE)))
+    # Reinsertar para mantener el orden de uso (el primero es el menos reciente)
+    _REPO_CACHE.pop(key, None)
+    _REPO_CACHE[key] = (repo, now)
+    return repo
+
+def _close_repo(repo_path: str) -> None:
+    """Cierra y descarta el Repo cacheado de una ruta, si lo hay"""
+    cached = _REPO_CACHE.pop(os.path.abspath(repo_path), None)
+    if cached is not None:
+        try:
+            cached[0].close()
+        except Exception:
+            pass
+
 class GitManager:
     """Gestor de operaciones Git"""
     
@@ -42,14 +140,8 @@ class GitManager:
             repo_name = self._extract_repo_name(repo_url)
             local_path = os.path.join(self.cache_dir, f"{repo_name}_{repo_hash}")
             
-            # Si ya existe y force=True, eliminar
-            if os.path.exists(local_path) and force:
-                shutil.rmtree(local_path)
-            
-            # Si no existe, clonar
-            if not os.path.exists(local_path):
-                os.makedirs(self.cache_dir, exist_ok=True)
-                Repo.clone_from(repo_url, local_path)
+            # Eliminar si force=True y clonar si no existe, fuera del bucle de eventos
+            await run_git_network(_clone_blocking, repo_url, local_path, force)
             
             return local_path
             
@@ -70,21 +162,18 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             # Información básica
             current_branch = repo.active_branch.name
             
-            # Verificar estado con remoto (opcional, no obligatorio)
-            ahead, behind = 0, 0
+            # El fetch (red) se lanza en un hilo, con su propio Repo, y avanza mientras
+            # se leen índice y árbol local con el Repo compartido
+            fetch = None
             try:
                 if repo.remotes:
-                    origin = repo.remotes.origin
-                    try:
-                        origin.fetch()
-                        ahead, behind = self._calculate_ahead_behind(repo)
-                    except Exception:
-                        pass  # Continuar aunque no se pueda hacer fetch
+                    fetch = run_git_network(_fetch_origin_blocking, repo.working_tree_dir,
+                                            executor=_GIT_FETCH_EXECUTOR)
             except Exception:
                 pass  # No hay remotos configurados
             
@@ -140,6 +229,15 @@ class GitManager:
                 # No hay commits aún
                 pass
             
+            # Verificar estado con remoto (opcional, no obligatorio)
+            ahead, behind = 0, 0
+            if fetch is not None:
+                try:
+                    await asyncio.wait_for(fetch, timeout=_STATUS_FETCH_TIMEOUT)
+                    ahead, behind = self._calculate_ahead_behind(repo)
+                except Exception:
+                    pass  # Continuar aunque no se pueda hacer fetch (o tarde demasiado)
+            
             # Determinar si el repositorio está "limpio"
             is_clean = (
                 len(staged_files) == 0 and 
@@ -201,7 +299,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             # Determinar qué comparar
             if staged:
@@ -265,7 +363,7 @@ class GitManager:
     async def commit_changes(
         self, 
         repo_url: str, 
-        message: str,
+        message: ValidatedCommitMessage,
         files: Optional[List[str]] = None,
         add_all: bool = False
     ) -> Dict[str, Any]:
@@ -283,7 +381,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             # Asegurar configuración de usuario Git
             await self._ensure_git_config(repo)
@@ -337,6 +435,61 @@ class GitManager:
         except Exception as e:
             raise GitError(f"Error realizando commit: {str(e)}")
     
+    async def commit_all(self, repo_url: str, message: ValidatedCommitMessage) -> Dict[str, Any]:
+        """
+        Añade todos los cambios y realiza el commit con el propio git
+        
+        Equivale a commit_changes con add_all=True, pero deja que `git commit`
+        detecte que no hay nada que commitear y cuente los archivos, en lugar
+        de lanzar diffs aparte para cada comprobación (dos procesos git: add
+        y commit). Como repo.index.commit en commit_changes, ejecuta los hooks
+        pre-commit y commit-msg del repositorio y no firma el commit.
+        
+        Args:
+            repo_url: URL del repositorio
+            message: Mensaje del commit
+            
+        Returns:
+            Información del commit
+        """
+        try:
+            repo_path = await self._ensure_repo_exists(repo_url)
+            repo = _open_repo(repo_path)
+            
+            await self._ensure_git_config(repo)
+            
+            repo.git.add(A=True)
+            try:
+                output = repo.git.commit("--no-gpg-sign", "-m", message)
+            except GitCommandError as e:
+                if "nothing to commit" in f"{e.stdout}{e.stderr}":
+                    raise GitError("No hay cambios staged para commitear")
+                raise
+            
+            commit = repo.head.commit
+            match = _FILES_CHANGED_RE.search(output)
+            
+            return {
+                "success": True,
+                "status": "committed",
+                "commit_hash": commit.hexsha,
+                "short_hash": commit.hexsha[:8],
+                "message": message,
+                "author": commit.author.name,
+                "email": commit.author.email,
+                "date": commit.committed_datetime.isoformat(),
+                "files_changed": int(match.group(1)) if match else 0,
+                "branch": repo.active_branch.name,
+                "committed_files": ["All staged files"]
+            }
+            
+        except GitError:
+            raise
+        except GitCommandError as e:
+            raise GitError(f"Error en commit: {str(e)}")
+        except Exception as e:
+            raise GitError(f"Error realizando commit: {str(e)}")
+    
     async def push_changes(
         self, 
         repo_url: str, 
@@ -356,7 +509,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             # Determinar rama
             if not branch:
@@ -415,7 +568,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             # Determinar rama
             if not branch:
@@ -460,7 +613,7 @@ class GitManager:
         self, 
         repo_url: str, 
         action: str,
-        branch_name: Optional[str] = None,
+        branch_name: Optional[ValidatedBranchName] = None,
         from_branch: Optional[str] = None
     ) -> Dict[str, Any]:
         """
@@ -477,7 +630,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             if action == "list":
                 # Listar todas las ramas
@@ -582,8 +735,8 @@ class GitManager:
     async def merge_branches(
         self, 
         repo_url: str, 
-        source_branch: str,
-        target_branch: Optional[str] = None,
+        source_branch: ValidatedBranchName,
+        target_branch: Optional[ValidatedBranchName] = None,
         no_ff: bool = False
     ) -> Dict[str, Any]:
         """
@@ -600,7 +753,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             # Determinar rama destino
             if target_branch:
@@ -690,7 +843,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             if action == "save":
                 # Guardar en stash
@@ -779,7 +932,7 @@ class GitManager:
         self, 
         repo_url: str, 
         limit: int = 10,
-        branch: Optional[str] = None,
+        branch: Optional[ValidatedBranchName] = None,
         file_path: Optional[str] = None
     ) -> Dict[str, Any]:
         """
@@ -796,7 +949,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             # Determinar rama robustamente
             branch_to_use = branch
@@ -808,9 +961,10 @@ class GitManager:
             if not branch_to_use:
                 branch_to_use = repo.active_branch.name
             
-            # Verificar que hay commits
+            # Los commits se leen de forma perezosa, sin construir antes la lista completa
+            commits = repo.iter_commits(branch_to_use, max_count=limit, paths=file_path)
             try:
-                commits = list(repo.iter_commits(branch_to_use, max_count=limit, paths=file_path))
+                first = next(commits, None)
             except Exception:
                 # No hay commits aún
                 return {
@@ -823,39 +977,10 @@ class GitManager:
                     "commits": []
                 }
             
-            # Procesar commits
             commit_list = []
-            for commit in commits:
-                try:
-                    commit_info = {
-                        "hash": commit.hexsha[:8],
-                        "message": commit.message.strip(),
-                        "author": commit.author.name,
-                        "email": commit.author.email,
-                        "date": commit.committed_datetime.strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    
-                    # Agregar estadísticas si están disponibles
-                    try:
-                        commit_info["stats"] = {
-                            "files": len(commit.stats.files),
-                            "insertions": commit.stats.total['insertions'],
-                            "deletions": commit.stats.total['deletions']
-                        }
-                    except Exception:
-                        commit_info["stats"] = {"files": 0, "insertions": 0, "deletions": 0}
-                    
-                    commit_list.append(commit_info)
-                except Exception as e:
-                    # Si falla procesando un commit, agregarlo con información básica
-                    commit_list.append({
-                        "hash": str(commit)[:8],
-                        "message": "Error procesando commit",
-                        "author": "Unknown",
-                        "email": "",
-                        "date": "Unknown",
-                        "stats": {"files": 0, "insertions": 0, "deletions": 0}
-                    })
+            if first is not None:
+                commit_list.append(self._commit_info(first))
+                commit_list.extend(self._commit_info(commit) for commit in commits)
             
             return {
                 "success": True,
@@ -872,6 +997,40 @@ class GitManager:
         except Exception as e:
             raise GitError(f"Error en historial de commits: {str(e)}")
     
+    @staticmethod
+    def _commit_info(commit) -> Dict[str, Any]:
+        """Convierte un commit de GitPython en el diccionario que devuelve el historial"""
+        try:
+            commit_info = {
+                "hash": commit.hexsha[:8],
+                "message": commit.message.strip(),
+                "author": commit.author.name,
+                "email": commit.author.email,
+                "date": commit.committed_datetime.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+            # Agregar estadísticas si están disponibles
+            try:
+                commit_info["stats"] = {
+                    "files": len(commit.stats.files),
+                    "insertions": commit.stats.total['insertions'],
+                    "deletions": commit.stats.total['deletions']
+                }
+            except Exception:
+                commit_info["stats"] = {"files": 0, "insertions": 0, "deletions": 0}
+            
+            return commit_info
+        except Exception:
+            # Si falla procesando un commit, agregarlo con información básica
+            return {
+                "hash": str(commit)[:8],
+                "message": "Error procesando commit",
+                "author": "Unknown",
+                "email": "",
+                "date": "Unknown",
+                "stats": {"files": 0, "insertions": 0, "deletions": 0}
+            }
+    
     async def reset_repository(
         self, 
         repo_url: str, 
@@ -891,7 +1050,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             # Determinar commit objetivo
             target = commit_hash or "HEAD"
@@ -957,7 +1116,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             if action == "list":
                 tags_info = []
@@ -1073,7 +1232,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             if action == "list":
                 remotes_info = []
@@ -1148,6 +1307,83 @@ class GitManager:
         except Exception as e:
             raise GitError(f"Error gestionando remoto: {str(e)}")
     
+    async def list_all_refs(self, repo_url: str) -> Dict[str, Any]:
+        """
+        Lista ramas, etiquetas y remotos con una sola llamada a `git for-each-ref`
+        
+        Produce las mismas entradas que las acciones "list" de manage_branch,
+        manage_tag y manage_remote; los remotos se leen de la configuración
+        sin lanzar procesos.
+        
+        Args:
+            repo_url: URL del repositorio
+            
+        Returns:
+            Diccionario con las listas "branches", "tags" y "remotes"
+        """
+        try:
+            repo_path = await self._ensure_repo_exists(repo_url)
+            repo = _open_repo(repo_path)
+            
+            output = repo.git.for_each_ref(
+                "refs/heads", "refs/tags", "refs/remotes/origin", format=_REF_FORMAT
+            )
+            
+            local_branches = []
+            remote_branches = []
+            tags = []
+            for record in output.split("\x1e"):
+                record = record.lstrip("\n")
+                if not record:
+                    continue
+                refname, obj, peeled, obj_type, head, date, peeled_date, contents = record.split("\x00", 7)
+                
+                if refname.startswith("refs/heads/"):
+                    local_branches.append({
+                        "name": refname[len("refs/heads/"):],
+                        "current": head == "*",
+                        "remote": False
+                    })
+                elif refname.startswith("refs/remotes/"):
+                    if not refname.endswith("/HEAD"):
+                        remote_branches.append({
+                            "name": refname[len("refs/remotes/"):],
+                            "current": False,
+                            "remote": True
+                        })
+                else:
+                    tag_info = {
+                        "name": refname[len("refs/tags/"):],
+                        "commit": (peeled or obj)[:8],
+                        "date": peeled_date or date
+                    }
+                    # Solo las etiquetas anotadas tienen mensaje propio
+                    if obj_type == "tag" and contents.strip():
+                        tag_info["message"] = contents.strip()
+                    tags.append(tag_info)
+            
+            remotes = []
+            config = repo.config_reader()
+            for section in config.sections():
+                if not (section.startswith('remote "') and section.endswith('"')):
+                    continue
+                urls = config.get_values(section, "url") if config.has_option(section, "url") else []
+                remote_info = {"name": section[len('remote "'):-1], "url": urls[0] if urls else "unknown"}
+                if len(urls) > 1:
+                    remote_info["fetch_url"] = urls[0]
+                    remote_info["push_url"] = urls[1]
+                remotes.append(remote_info)
+            
+            return {
+                "success": True,
+                "branches": local_branches + remote_branches,
+                "tags": tags,
+                "remotes": remotes
+            }
+            
+        except Exception as e:
+            raise GitError(f"Error listando referencias: {str(e)}")
+    
     async def _ensure_repo_exists(self, repo_url: str) -> str:
         """
         MÉTODO CORREGIDO - Asegura que el repositorio existe localmente
@@ -1181,8 +1417,7 @@ class GitManager:
                 
             # CAMBIO PRINCIPAL: Usar GitPython en lugar de subprocess
             try:
-                from git import Repo, InvalidGitRepositoryError
-                repo = Repo(path)
+                repo = _open_repo(path)
                 
                 # Verificación básica sin operaciones pesadas
                 if repo.bare:
@@ -1315,7 +1550,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             added_files = []
             
@@ -1379,7 +1614,7 @@ class GitManager:
         """
         try:
             repo_path = await self._ensure_repo_exists(repo_url)
-            repo = Repo(repo_path)
+            repo = _open_repo(repo_path)
             
             user_config = {}
             
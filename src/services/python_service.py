@@ -12,6 +12,216 @@ import asyncio
 import platform
 
 from utils.exceptions import CodeAnalysisError
+from utils.python_utils import PythonUtils
+
+# Límite de línea para la lectura incremental de subprocesos (por defecto asyncio usa 64 KiB)
+_STREAM_LINE_LIMIT = 16 * 1024 * 1024
+
+# Entornos virtuales detectados: (proyecto, candidatos) -> (firma del directorio, resultado)
+_VENV_SCAN_CACHE: Dict[Tuple[str, Optional[Tuple[str, ...]]], Tuple[tuple, Dict[str, Any]]] = {}
+_VENV_SCAN_CACHE_MAX = 512
+
+class OutputStreamParser:
+    """
+    Procesa la salida de un subproceso línea a línea mientras se ejecuta
+    
+    Formatea las líneas de stdout al vuelo (salvo con include_formatted=False)
+    y conserva la salida cruda salvo que se pida keep_raw=False. Las subclases
+    acumulan el análisis.
+    """
+    
+    def __init__(self, keep_raw: bool = True, include_formatted: bool = True):
+        self.keep_raw = keep_raw
+        self.include_formatted = include_formatted
+        self._raw_lines: List[str] = []
+        self._formatted_lines: List[str] = []
+        self._has_stdout = False
+    
+    def feed(self, line: str, is_stderr: bool = False) -> None:
+        """
+        Procesa una línea de salida
+        
+        Args:
+            line: Línea sin el salto final
+            is_stderr: Si la línea viene de stderr
+        """
+        if not is_stderr:
+            self._has_stdout = True
+            if self.keep_raw:
+                self._raw_lines.append(line)
+            if self.include_formatted:
+                formatted = self._format_line(line)
+                if formatted is not None:
+                    self._formatted_lines.append(formatted)
+        self._analyze_line(line)
+    
+    @property
+    def raw_output(self) -> str:
+        """Salida cruda de stdout (vacía si no se conservó)"""
+        return '\n'.join(self._raw_lines)
+    
+    @property
+    def formatted_output(self) -> str:
+        """Salida de stdout formateada"""
+        return '\n'.join(self._formatted_lines)
+    
+    def analysis(self) -> Dict[str, Any]:
+        """Análisis acumulado de la salida"""
+        raise NotImplementedError
+    
+    def _format_line(self, line: str) -> Optional[str]:
+        return None
+    
+    def _analyze_line(self, line: str) -> None:
+        pass
+
+class PytestStreamParser(OutputStreamParser):
+    """Análisis incremental de la salida de pytest"""
+    
+    def __init__(self, keep_raw: bool = True, include_formatted: bool = True):
+        super().__init__(keep_raw, include_formatted)
+        self._result_line: Optional[str] = None
+        self._failed_tests: List[str] = []
+    
+    def _format_line(self, line: str) -> Optional[str]:
+        return PythonUtils.format_test_line(line, "pytest")
+    
+    def _analyze_line(self, line: str) -> None:
+        # Patrón para resultado final de pytest: se conserva la última coincidencia
+        matches = re.findall(r'=+ (.+) =+', line)
+        if matches:
+            self._result_line = matches[-1]
+        
+        if "FAILED" in line:
+            self._failed_tests.extend(re.findall(r'FAILED (.+?) -', line))
+    
+    def analysis(self) -> Dict[str, Any]:
+        # Extraer números de la línea de resumen
+        result_line = self._result_line or ""
+        
+        def count(label: str) -> int:
+            match = re.search(rf'(\d+) {label}', result_line) if label in result_line else None
+            return int(match.group(1)) if match else 0
+        
+        passed, failed, skipped, errors = count("passed"), count("failed"), count("skipped"), count("error")
+        summary = {
+            "total": passed + failed + skipped + errors,
+            "passed": passed,
+            "failed": failed,
+            "skipped": skipped,
+            "errors": errors
+        }
+        
+        return {
+            "summary": summary,
+            "failed_tests": list(self._failed_tests),
+            "success_rate": (summary["passed"] / max(summary["total"], 1)) * 100,
+            "has_failures": summary["failed"] > 0 or summary["errors"] > 0
+        }
+
+class UnittestStreamParser(OutputStreamParser):
+    """Análisis incremental de la salida de unittest"""
+    
+    def __init__(self, keep_raw: bool = True, include_formatted: bool = True):
+        super().__init__(keep_raw, include_formatted)
+        self._total_tests: Optional[int] = None
+        self._failed_tests: List[str] = []
+        self._error_tests: List[str] = []
+        self._failures = 0
+        self._errors = 0
+    
+    def _format_line(self, line: str) -> Optional[str]:
+        return PythonUtils.format_test_line(line, "unittest")
+    
+    def _analyze_line(self, line: str) -> None:
+        # Buscar línea de resultado (la primera que aparezca)
+        if self._total_tests is None:
+            result_match = re.search(r'Ran (\d+) tests? in', line)
+            if result_match:
+                self._total_tests = int(result_match.group(1))
+        
+        # Buscar fallos y errores
+        if "FAIL:" in line:
+            self._failures += line.count("FAIL:")
+            self._failed_tests.extend(re.findall(r'FAIL: (.+)', line))
+        if "ERROR:" in line:
+            self._errors += line.count("ERROR:")
+            self._error_tests.extend(re.findall(r'ERROR: (.+)', line))
+    
+    def analysis(self) -> Dict[str, Any]:
+        total_tests = self._total_tests or 0
+        failures = self._failures
+        errors = self._errors
+        
+        summary = {
+            "total": total_tests,
+            "passed": total_tests - failures - errors,
+            "failed": failures,
+            "errors": errors,
+            "skipped": 0  # unittest no separa skipped fácilmente
+        }
+        
+        return {
+            "summary": summary,
+            "failed_tests": self._failed_tests + self._error_tests,
+            "success_rate": (summary["passed"] / max(summary["total"], 1)) * 100,
+            "has_failures": failures > 0 or errors > 0
+        }
+
+class LintStreamParser(OutputStreamParser):
+    """Análisis incremental de la salida de linting"""
+    
+    def __init__(self, linter: str, keep_raw: bool = True, include_formatted: bool = True):
+        super().__init__(keep_raw, include_formatted)
+        self.linter = linter
+        self._total_issues = 0
+        self._issue_types: Dict[str, int] = {}
+        self._issues: List[Dict[str, Any]] = []
+        # Para linters sin análisis estructurado se devuelve la salida completa
+        self._all_lines: Optional[List[str]] = [] if linter != "flake8" else None
+    
+    @property
+    def formatted_output(self) -> str:
+        if self.include_formatted and not self._has_stdout:
+            return "✅ No se encontraron problemas de linting"
+        return super().formatted_output
+    
+    def _format_line(self, line: str) -> Optional[str]:
+        return PythonUtils.format_lint_line(line, self.linter)
+    
+    def _analyze_line(self, line: str) -> None:
+        if self._all_lines is not None:
+            self._all_lines.append(line)
+            return
+        
+        # flake8 format: filename:line:col: error_code message
+        for file, line_no, col, code, message in re.findall(r'([^:]+):(\d+):(\d+): (\w+) (.+)', line):
+            issue_type = code[0]  # E=error, W=warning, etc.
+            self._issue_types[issue_type] = self._issue_types.get(issue_type, 0) + 1
+            self._total_issues += 1
+            if len(self._issues) < 20:  # Limitar a 20
+                self._issues.append({
+                    "file": file,
+                    "line": int(line_no),
+                    "column": int(col),
+                    "code": code,
+                    "message": message
+                })
+    
+    def analysis(self) -> Dict[str, Any]:
+        if self._all_lines is not None:
+            return {
+                "total_issues": 0,
+                "issue_types": {},
+                "issues": [],
+                "raw_output": '\n'.join(self._all_lines)
+            }
+        
+        return {
+            "total_issues": self._total_issues,
+            "issue_types": dict(self._issue_types),
+            "issues": list(self._issues)
+        }
 
 class PythonService:
     """Servicio para gestión de proyectos Python y testing"""
@@ -19,6 +229,10 @@ class PythonService:
     def __init__(self):
         self.python_timeout = 300  # 5 minutos timeout para operaciones
         self.is_windows = platform.system() == "Windows"
+        # Lote de instalación aún abierto por entorno virtual: venv_path -> (paquetes, tarea)
+        self._install_batches: Dict[str, Tuple[Dict[str, str], asyncio.Task]] = {}
+        # Lote que está ejecutando pip por entorno virtual
+        self._install_running: Dict[str, asyncio.Task] = {}
         
     async def check_python_environment(self, project_path: str = None) -> Dict[str, Any]:
         """
@@ -109,14 +323,114 @@ class PythonService:
         Returns:
             Resultado de la instalación
         """
+        # Eliminar duplicados (sin distinguir mayúsculas) conservando el orden y la primera grafía
+        unique_packages = {}
+        for package in packages or []:
+            package = package.strip()
+            if package and package.lower() not in unique_packages:
+                unique_packages[package.lower()] = package
+        packages = list(unique_packages.values())
+        
+        if not packages and not requirements_file:
+            return {
+                "success": True,
+                "message": "No hay paquetes que instalar",
+                "packages": [],
+                "venv_path": venv_path,
+                "output": ""
+            }
+        
+        if venv_path and not requirements_file:
+            return await self._install_batched(packages, venv_path)
+        
+        return await self._pip_install(packages, venv_path, requirements_file)
+    
+    async def _install_batched(self, packages: List[str], venv_path: str) -> Dict[str, Any]:
+        """
+        Agrupa las instalaciones concurrentes al mismo entorno virtual
+        
+        Si no hay ningún pip en marcha para el entorno, la instalación empieza
+        enseguida; las peticiones que llegan mientras pip trabaja se juntan en
+        un único lote que se ejecuta al terminar el anterior. El lote corre en
+        su propia tarea, así que cancelar una petición no afecta a las demás.
+        Si falla un lote con paquetes de otras peticiones, cada petición
+        reintenta solo con los suyos para no heredar errores ajenos.
+        
+        Args:
+            packages: Paquetes ya deduplicados
+            venv_path: Ruta del entorno virtual
+            
+        Returns:
+            Resultado de la instalación, con los paquetes de esta petición
+        """
+        batch = self._install_batches.get(venv_path)
+        if batch is None:
+            batch_packages: Dict[str, str] = {}
+            task = asyncio.ensure_future(
+                self._run_install_batch(venv_path, batch_packages, self._install_running.get(venv_path))
+            )
+            # Recuperar el error aunque todas las peticiones del lote se hayan cancelado
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            batch = (batch_packages, task)
+            self._install_batches[venv_path] = batch
+        
+        batch_packages, task = batch
+        for package in packages:
+            batch_packages.setdefault(package.lower(), package)
+        
+        try:
+            result = await asyncio.shield(task)
+        except Exception:
+            if batch_packages.keys() == {package.lower() for package in packages}:
+                raise
+            return await self._pip_install(packages, venv_path)
+        
+        return {
+            **result,
+            "message": f"Paquetes instalados exitosamente: packages: {', '.join(packages)}",
+            "packages": packages
+        }
+    
+    async def _run_install_batch(self, venv_path: str, batch_packages: Dict[str, str],
+                                 previous: Optional[asyncio.Task]) -> Dict[str, Any]:
+        """
+        Ejecuta un lote de instalación cuando termina el anterior del mismo entorno
+        
+        Args:
+            venv_path: Ruta del entorno virtual
+            batch_packages: Paquetes del lote (clave en minúsculas)
+            previous: Lote que estaba ejecutando pip al abrir este (opcional)
+            
+        Returns:
+            Resultado de pip install con todos los paquetes del lote
+        """
+        if previous is not None:
+            await asyncio.wait([previous])
+        
+        # A partir de aquí el lote queda cerrado: las nuevas peticiones abren el siguiente
+        if self._install_batches.get(venv_path, (None, None))[0] is batch_packages:
+            del self._install_batches[venv_path]
+        current = asyncio.current_task()
+        self._install_running[venv_path] = current
         try:
-            if requirements_file and os.path.exists(requirements_file):
-                # Instalar desde requirements.txt
-                cmd = ["-m", "pip", "install", "-r", requirements_file]
+            return await self._pip_install(list(batch_packages.values()), venv_path)
+        finally:
+            if self._install_running.get(venv_path) is current:
+                del self._install_running[venv_path]
+    
+    async def _pip_install(self, packages: List[str], venv_path: str = None,
+                           requirements_file: str = None) -> Dict[str, Any]:
+        """Ejecuta pip install con los paquetes o el archivo requirements indicados"""
+        try:
+            # Sin la consulta a PyPI por versiones nuevas de pip en cada instalación
+            pip_install = ["-m", "pip", "install", "--disable-pip-version-check"]
+            if requirements_file:
+                # Instalar desde requirements.txt (pip informa si el archivo no existe)
+                cmd = pip_install + ["-r", requirements_file]
                 operation = f"requirements from {requirements_file}"
             elif packages:
                 # Instalar paquetes específicos
-                cmd = ["-m", "pip", "install"] + packages
+                cmd = pip_install + packages
                 operation = f"packages: {', '.join(packages)}"
             else:
                 raise CodeAnalysisError("No se especificaron paquetes ni archivo requirements")
@@ -145,7 +459,8 @@ class PythonService:
     
     async def run_tests_pytest(self, test_path: str, venv_path: str = None, 
                              test_pattern: str = None, collect_coverage: bool = False,
-                             verbose: bool = False) -> Dict[str, Any]:
+                             verbose: bool = False, include_formatted: bool = True,
+                             trim_output: bool = False) -> Dict[str, Any]:
         """
         Ejecuta tests usando pytest
         
@@ -155,13 +470,16 @@ class PythonService:
             test_pattern: Patrón de tests específicos
             collect_coverage: Si recopilar coverage
             verbose: Salida verbose
+            include_formatted: Si formatear la salida (si no, formatted_output queda vacío)
+            trim_output: Si descartar la salida cruda ("output" vacío) para ahorrar memoria
             
         Returns:
             Resultados de los tests
         """
         try:
-            # Construir comando pytest
-            cmd = ["-m", "pytest"]
+            # Construir comando pytest (sin leer ni reescribir .pytest_cache del proyecto:
+            # la herramienta no usa --lf/--ff y esa escritura crece con el número de tests)
+            cmd = ["-m", "pytest", "-p", "no:cacheprovider"]
             
             if verbose:
                 cmd.append("-v")
@@ -181,14 +499,14 @@ class PythonService:
             # Usar entorno virtual si se especifica
             python_cmd = self._get_python_executable(venv_path)
             
-            result = await self._run_command(
+            # La salida se analiza y formatea mientras se ejecuta
+            parser = PytestStreamParser(keep_raw=not trim_output, include_formatted=include_formatted)
+            result = await self._run_command_streaming(
                 [python_cmd] + cmd,
+                parser,
                 cwd=os.path.dirname(test_path) if os.path.isfile(test_path) else test_path
             )
             
-            # Analizar resultados
-            test_analysis = self._analyze_pytest_output(result.get("output", ""), result.get("error", ""))
-            
             return {
                 "success": result["success"],
                 "message": "Tests ejecutados con pytest",
@@ -198,15 +516,17 @@ class PythonService:
                 "verbose": verbose,
                 "venv_path": venv_path,
                 "output": result["output"],
+                "formatted_output": parser.formatted_output,
                 "error": result.get("error", ""),
-                "analysis": test_analysis
+                "analysis": parser.analysis()
             }
                 
         except Exception as e:
             raise CodeAnalysisError(f"Error ejecutando tests pytest: {str(e)}")
     
     async def run_tests_unittest(self, test_path: str, venv_path: str = None, 
-                               test_pattern: str = None, verbose: bool = False) -> Dict[str, Any]:
+                               test_pattern: str = None, verbose: bool = False,
+                               include_formatted: bool = True, trim_output: bool = False) -> Dict[str, Any]:
         """
         Ejecuta tests usando unittest
         
@@ -215,6 +535,8 @@ class PythonService:
             venv_path: Ruta del entorno virtual (opcional)
             test_pattern: Patrón de tests específicos
             verbose: Salida verbose
+            include_formatted: Si formatear la salida (si no, formatted_output queda vacío)
+            trim_output: Si descartar la salida cruda ("output" vacío) para ahorrar memoria
             
         Returns:
             Resultados de los tests
@@ -238,14 +560,14 @@ class PythonService:
             # Usar entorno virtual si se especifica
             python_cmd = self._get_python_executable(venv_path)
             
-            result = await self._run_command(
+            # La salida se analiza y formatea mientras se ejecuta
+            parser = UnittestStreamParser(keep_raw=not trim_output, include_formatted=include_formatted)
+            result = await self._run_command_streaming(
                 [python_cmd] + cmd,
+                parser,
                 cwd=os.path.dirname(test_path) if os.path.isfile(test_path) else test_path
             )
             
-            # Analizar resultados
-            test_analysis = self._analyze_unittest_output(result.get("output", ""), result.get("error", ""))
-            
             return {
                 "success": result["success"],
                 "message": "Tests ejecutados con unittest",
@@ -254,15 +576,17 @@ class PythonService:
                 "verbose": verbose,
                 "venv_path": venv_path,
                 "output": result["output"],
+                "formatted_output": parser.formatted_output,
                 "error": result.get("error", ""),
-                "analysis": test_analysis
+                "analysis": parser.analysis()
             }
                 
         except Exception as e:
             raise CodeAnalysisError(f"Error ejecutando tests unittest: {str(e)}")
     
     async def run_linting(self, project_path: str, venv_path: str = None, 
-                        linter: str = "flake8") -> Dict[str, Any]:
+                        linter: str = "flake8", include_formatted: bool = True,
+                        trim_output: bool = False) -> Dict[str, Any]:
         """
         Ejecuta linting de código Python
         
@@ -270,6 +594,8 @@ class PythonService:
             project_path: Directorio del proyecto
             venv_path: Ruta del entorno virtual (opcional)
             linter: Herramienta de linting (flake8, pylint, etc.)
+            include_formatted: Si formatear la salida (si no, formatted_output queda vacío)
+            trim_output: Si descartar la salida cruda ("output" vacío) para ahorrar memoria
             
         Returns:
             Resultados del linting
@@ -286,14 +612,13 @@ class PythonService:
             # Usar entorno virtual si se especifica
             python_cmd = self._get_python_executable(venv_path)
             
-            result = await self._run_command(
+            parser = LintStreamParser(linter, keep_raw=not trim_output, include_formatted=include_formatted)
+            result = await self._run_command_streaming(
                 [python_cmd] + cmd,
+                parser,
                 cwd=project_path
             )
             
-            # Analizar resultados de linting
-            lint_analysis = self._analyze_lint_output(result.get("output", ""), result.get("error", ""), linter)
-            
             return {
                 "success": result["return_code"] == 0,  # flake8/pylint usan códigos de salida específicos
                 "message": f"Linting completado con {linter}",
@@ -301,8 +626,9 @@ class PythonService:
                 "project_path": project_path,
                 "venv_path": venv_path,
                 "output": result["output"],
+                "formatted_output": parser.formatted_output,
                 "error": result.get("error", ""),
-                "analysis": lint_analysis
+                "analysis": parser.analysis()
             }
                 
         except Exception as e:
@@ -439,6 +765,67 @@ class PythonService:
         except Exception as e:
             raise CodeAnalysisError(f"Error ejecutando comando: {str(e)}")
     
+    async def _run_command_streaming(self, cmd: List[str], parser: OutputStreamParser,
+                                     cwd: str = None) -> Dict[str, Any]:
+        """
+        Ejecuta un comando entregando su salida al parser línea a línea
+        
+        stdout se procesa mientras el proceso se ejecuta; stderr (normalmente
+        corto) se lee en paralelo y se entrega al terminar.
+        
+        Args:
+            cmd: Comando a ejecutar
+            parser: Parser que recibe cada línea
+            cwd: Directorio de trabajo
+            
+        Returns:
+            Resultado del comando; "output" queda vacío si el parser no conserva la salida cruda
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                limit=_STREAM_LINE_LIMIT
+            )
+        except FileNotFoundError:
+            raise CodeAnalysisError(f"Comando no encontrado: {cmd[0]}")
+        except Exception as e:
+            raise CodeAnalysisError(f"Error ejecutando comando: {str(e)}")
+        
+        async def consume() -> str:
+            stderr_task = asyncio.ensure_future(process.stderr.read())
+            try:
+                async for raw_line in process.stdout:
+                    parser.feed(raw_line.decode('utf-8', errors='replace').rstrip('\r\n'))
+                error = (await stderr_task).decode('utf-8', errors='replace')
+            finally:
+                stderr_task.cancel()
+            for line in error.split('\n'):
+                parser.feed(line, is_stderr=True)
+            await process.wait()
+            return error
+        
+        try:
+            error = await asyncio.wait_for(consume(), timeout=self.python_timeout)
+        except asyncio.TimeoutError:
+            raise CodeAnalysisError(f"Timeout ejecutando comando: {' '.join(cmd)}")
+        except Exception as e:
+            raise CodeAnalysisError(f"Error ejecutando comando: {str(e)}")
+        finally:
+            # También si se cancela la llamada antes de terminar
+            if process.returncode is None:
+                process.kill()
+        
+        return {
+            "success": process.returncode == 0,
+            "output": parser.raw_output,
+            "error": error,
+            "return_code": process.returncode,
+            "command": " ".join(cmd)
+        }
+    
     async def _get_python_info(self) -> Dict[str, Any]:
         """Obtiene información de Python"""
         try:
@@ -515,14 +902,44 @@ class PythonService:
         
         return tools
     
-    async def _check_virtual_environments(self, project_path: str) -> Dict[str, Any]:
-        """Busca entornos virtuales en el proyecto"""
+    async def _check_virtual_environments(self, project_path: str,
+                                          candidates: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Busca entornos virtuales en el proyecto
+        
+        El resultado se reutiliza mientras no cambie la firma del directorio
+        del proyecto (crear un entorno modifica el mtime de su directorio).
+        
+        Args:
+            project_path: Directorio del proyecto
+            candidates: Nombres ya vistos en el directorio (omite las comprobaciones de existencia)
+        """
+        signature = PythonUtils.directory_signature(project_path)
+        key = (os.path.abspath(project_path), tuple(candidates) if candidates is not None else None)
+        cached = _VENV_SCAN_CACHE.get(key)
+        if signature is None or cached is None or cached[0] != signature:
+            cached = (signature, self._scan_virtual_environments(project_path, candidates))
+            if signature is not None:
+                _VENV_SCAN_CACHE.pop(key, None)
+                _VENV_SCAN_CACHE[key] = cached
+                if len(_VENV_SCAN_CACHE) > _VENV_SCAN_CACHE_MAX:
+                    _VENV_SCAN_CACHE.pop(next(iter(_VENV_SCAN_CACHE)))
+        
+        venvs = cached[1]["found_environments"]
+        return {
+            "found_environments": [dict(venv) for venv in venvs],
+            "total_environments": len(venvs)
+        }
+    
+    def _scan_virtual_environments(self, project_path: str,
+                                   candidates: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Comprueba los entornos virtuales candidatos del proyecto"""
         venvs = []
         common_venv_names = ["venv", "env", ".venv", ".env", "virtualenv"]
         
-        for venv_name in common_venv_names:
+        for venv_name in common_venv_names if candidates is None else candidates:
             venv_path = os.path.join(project_path, venv_name)
-            if os.path.exists(venv_path):
+            if candidates is not None or os.path.exists(venv_path):
                 venv_info = self._get_venv_info(venv_path)
                 if venv_info["is_valid"]:
                     venvs.append(venv_info)
@@ -566,121 +983,20 @@ class PythonService:
     
     def _analyze_pytest_output(self, output: str, error: str) -> Dict[str, Any]:
         """Analiza la salida de pytest"""
-        full_output = output + "\n" + error
-        
-        # Buscar resumen de tests
-        summary = {
-            "total": 0,
-            "passed": 0,
-            "failed": 0,
-            "skipped": 0,
-            "errors": 0
-        }
-        
-        # Patrón para resultado final de pytest
-        result_pattern = r'=+ (.+) =+'
-        matches = re.findall(result_pattern, full_output)
-        
-        if matches:
-            result_line = matches[-1]  # Última línea de resultado
-            
-            # Extraer números
-            if "passed" in result_line:
-                passed_match = re.search(r'(\d+) passed', result_line)
-                if passed_match:
-                    summary["passed"] = int(passed_match.group(1))
-            
-            if "failed" in result_line:
-                failed_match = re.search(r'(\d+) failed', result_line)
-                if failed_match:
-                    summary["failed"] = int(failed_match.group(1))
-            
-            if "skipped" in result_line:
-                skipped_match = re.search(r'(\d+) skipped', result_line)
-                if skipped_match:
-                    summary["skipped"] = int(skipped_match.group(1))
-            
-            if "error" in result_line:
-                error_match = re.search(r'(\d+) error', result_line)
-                if error_match:
-                    summary["errors"] = int(error_match.group(1))
-        
-        summary["total"] = summary["passed"] + summary["failed"] + summary["skipped"] + summary["errors"]
-        
-        # Buscar tests fallidos
-        failed_tests = re.findall(r'FAILED (.+?) -', full_output)
-        
-        return {
-            "summary": summary,
-            "failed_tests": failed_tests,
-            "success_rate": (summary["passed"] / max(summary["total"], 1)) * 100,
-            "has_failures": summary["failed"] > 0 or summary["errors"] > 0
-        }
+        return self._analyze_output(PytestStreamParser(include_formatted=False), output, error)
     
     def _analyze_unittest_output(self, output: str, error: str) -> Dict[str, Any]:
         """Analiza la salida de unittest"""
-        full_output = output + "\n" + error
-        
-        # Buscar línea de resultado
-        result_match = re.search(r'Ran (\d+) tests? in', full_output)
-        total_tests = int(result_match.group(1)) if result_match else 0
-        
-        # Buscar fallos y errores
-        failures = len(re.findall(r'FAIL:', full_output))
-        errors = len(re.findall(r'ERROR:', full_output))
-        
-        summary = {
-            "total": total_tests,
-            "passed": total_tests - failures - errors,
-            "failed": failures,
-            "errors": errors,
-            "skipped": 0  # unittest no separa skipped fácilmente
-        }
-        
-        # Buscar tests fallidos específicos
-        failed_tests = re.findall(r'FAIL: (.+)', full_output)
-        error_tests = re.findall(r'ERROR: (.+)', full_output)
-        
-        return {
-            "summary": summary,
-            "failed_tests": failed_tests + error_tests,
-            "success_rate": (summary["passed"] / max(summary["total"], 1)) * 100,
-            "has_failures": failures > 0 or errors > 0
-        }
+        return self._analyze_output(UnittestStreamParser(include_formatted=False), output, error)
     
     def _analyze_lint_output(self, output: str, error: str, linter: str) -> Dict[str, Any]:
         """Analiza la salida de linting"""
-        full_output = output + "\n" + error
-        
-        if linter == "flake8":
-            # flake8 format: filename:line:col: error_code message
-            issues = re.findall(r'([^:]+):(\d+):(\d+): (\w+) (.+)', full_output)
-            
-            issue_types = {}
-            for file, line, col, code, message in issues:
-                issue_type = code[0]  # E=error, W=warning, etc.
-                if issue_type not in issue_types:
-                    issue_types[issue_type] = 0
-                issue_types[issue_type] += 1
-            
-            return {
-                "total_issues": len(issues),
-                "issue_types": issue_types,
-                "issues": [
-                    {
-                        "file": file,
-                        "line": int(line),
-                        "column": int(col),
-                        "code": code,
-                        "message": message
-                    }
-                    for file, line, col, code, message in issues[:20]  # Limitar a 20
-                ]
-            }
-        
-        return {
-            "total_issues": 0,
-            "issue_types": {},
-            "issues": [],
-            "raw_output": full_output
-        }
+        return self._analyze_output(LintStreamParser(linter, include_formatted=False), output, error)
+    
+    def _analyze_output(self, parser: OutputStreamParser, output: str, error: str) -> Dict[str, Any]:
+        """Analiza una salida ya capturada con el parser incremental correspondiente"""
+        for line in output.split('\n'):
+            parser.feed(line)
+        for line in error.split('\n'):
+            parser.feed(line, is_stderr=True)
+        return parser.analysis()
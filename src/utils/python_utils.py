@@ -1,12 +1,46 @@
 """
 Utilidades para operaciones con Python y testing
 """
+import hashlib
 import os
 import re
 import platform
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 
+# Pool para recorrer directorios en paralelo (oculta la latencia de scandir en discos de red);
+# se crea en el primer recorrido para no lanzar hilos en cada proceso que importa el módulo
+_WALK_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_WALK_EXECUTOR_LOCK = threading.Lock()
+
+def _walk_executor() -> ThreadPoolExecutor:
+    """Devuelve el pool de recorrido, creándolo la primera vez"""
+    global _WALK_EXECUTOR
+    if _WALK_EXECUTOR is None:
+        with _WALK_EXECUTOR_LOCK:
+            if _WALK_EXECUTOR is None:
+                _WALK_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="python_utils_walk")
+    return _WALK_EXECUTOR
+
+# requirements ya parseados: ruta absoluta -> ((st_mtime_ns, st_size), resultado)
+_REQUIREMENTS_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+# Frameworks detectados: (ruta absoluta, firma del directorio) -> resultado
+_FRAMEWORK_CACHE: Dict[Tuple[str, tuple], Dict[str, Any]] = {}
+_FRAMEWORK_CACHE_MAX = 512
+
+@dataclass
+class ProjectScan:
+    """Resultado de un único recorrido del proyecto Python"""
+    python_files: Dict[str, List[str]]
+    testing_framework: Dict[str, Any]
+    requirements: Dict[str, Any]
+    venv_dirs: List[str]
+    file_summary: Dict[str, int]
+
 class PythonUtils:
     """Utilidades para trabajar con proyectos Python"""
     
@@ -66,6 +100,9 @@ class PythonUtils:
         }
     }
     
+    # Categorías en que se clasifican los archivos del proyecto
+    FILE_KINDS = ("source_files", "test_files", "config_files", "other_files")
+    
     # Patrones de archivos Python
     PYTHON_PATTERNS = {
         "test_files": [
@@ -91,6 +128,13 @@ class PythonUtils:
         ]
     }
     
+    # Formas precalculadas de PYTHON_PATTERNS para clasificar archivos en el recorrido
+    _SRC_SUFFIXES = ('.py',)
+    _CONFIG_NAMES = frozenset(PYTHON_PATTERNS["config_files"])
+    _TEST_PREFIXES = ('test_',)        # test_*.py
+    _TEST_SUFFIXES = ('_test.py',)     # *_test.py
+    _TEST_NAMES = frozenset({'tests.py'})
+    
     @staticmethod
     def validate_project_name(name: str) -> str:
         """
@@ -186,10 +230,48 @@ class PythonUtils:
             }
     
     @staticmethod
-    def parse_requirements_file(requirements_path: str) -> Dict[str, Any]:
+    def parse_requirements_file(requirements_path: str, missing_ok: bool = True) -> Dict[str, Any]:
         """
         Parsea un archivo requirements.txt
         
+        El resultado se cachea por ruta y se reutiliza mientras el archivo
+        conserve el mismo mtime y tamaño.
+        
+        Args:
+            requirements_path: Ruta al archivo requirements.txt
+            missing_ok: Si devolver información vacía cuando el archivo no existe
+            
+        Returns:
+            Información parseada del archivo
+            
+        Raises:
+            FileNotFoundError: Si el archivo no existe y missing_ok es False
+        """
+        try:
+            stat = os.stat(requirements_path)
+        except FileNotFoundError:
+            if not missing_ok:
+                raise
+            return PythonUtils._parse_requirements_uncached(requirements_path)
+        except OSError:
+            return PythonUtils._parse_requirements_uncached(requirements_path)
+        
+        cache_key = os.path.abspath(requirements_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = _REQUIREMENTS_CACHE.get(cache_key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, PythonUtils._parse_requirements_uncached(requirements_path))
+            _REQUIREMENTS_CACHE[cache_key] = cached
+        
+        # Copia para que los llamadores no alteren la entrada cacheada
+        requirements_info = cached[1]
+        return {**requirements_info, "packages": [dict(package) for package in requirements_info["packages"]]}
+    
+    @staticmethod
+    def _parse_requirements_uncached(requirements_path: str) -> Dict[str, Any]:
+        """
+        Parsea un archivo requirements.txt sin consultar la cache
+        
         Args:
             requirements_path: Ruta al archivo requirements.txt
             
@@ -261,52 +343,305 @@ class PythonUtils:
         Returns:
             Archivos Python organizados por tipo
         """
-        python_files = {
-            "source_files": [],
-            "test_files": [],
-            "config_files": [],
-            "other_files": []
-        }
+        python_files = {kind: [] for kind in PythonUtils.FILE_KINDS}
         
         try:
             for root, dirs, files in os.walk(directory):
                 # Excluir directorios comunes que no queremos
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['__pycache__', 'venv', 'env']]
+                dirs[:] = [d for d in dirs if not PythonUtils._is_excluded_dir(d)]
                 
                 for file in files:
-                    if not file.endswith('.py'):
-                        # Verificar archivos de configuración
-                        if file in PythonUtils.PYTHON_PATTERNS["config_files"]:
-                            python_files["config_files"].append(os.path.join(root, file))
-                        continue
-                    
-                    file_path = os.path.join(root, file)
-                    
-                    # Determinar tipo de archivo
-                    is_test = any(
-                        file.startswith(pattern.replace('*', '')) or file.endswith(pattern.replace('*', ''))
-                        for pattern in PythonUtils.PYTHON_PATTERNS["test_files"]
-                    )
-                    
-                    if is_test and include_tests:
-                        python_files["test_files"].append(file_path)
-                    elif not is_test:
-                        python_files["source_files"].append(file_path)
-                    else:
-                        python_files["other_files"].append(file_path)
+                    PythonUtils._classify_python_file(python_files, root, file, include_tests)
         
         except Exception:
             pass
         
         return python_files
     
+    @staticmethod
+    def scan_project(project_path: str) -> ProjectScan:
+        """
+        Analiza el proyecto con un único recorrido del árbol
+        
+        Reúne en una sola pasada lo que antes requería find_python_files,
+        detect_testing_framework, parse_requirements_file y la búsqueda de
+        entornos virtuales por separado.
+        
+        Args:
+            project_path: Directorio del proyecto
+            
+        Returns:
+            Archivos Python, framework de testing, requirements y entornos virtuales candidatos
+        """
+        python_files, root_names = PythonUtils._walk_python_files(project_path, True)
+        
+        return ProjectScan(
+            python_files=python_files,
+            testing_framework=PythonUtils._detect_framework(project_path, python_files, root_names),
+            requirements=PythonUtils.parse_requirements_file(os.path.join(project_path, "requirements.txt")),
+            venv_dirs=[name for name in PythonUtils.PYTHON_PATTERNS["venv_names"] if name in root_names],
+            file_summary={kind: len(files) for kind, files in python_files.items()}
+        )
+    
+    @staticmethod
+    def _walk_python_files(directory: str, include_tests: bool) -> Tuple[Dict[str, List[str]], Set[str]]:
+        """
+        Recorre el árbol por niveles leyendo cada nivel en paralelo
+        
+        Args:
+            directory: Directorio a buscar
+            include_tests: Si incluir archivos de test
+            
+        Returns:
+            Tupla (archivos Python por tipo, nombres de las entradas del directorio raíz)
+        """
+        python_files = {kind: [] for kind in PythonUtils.FILE_KINDS}
+        root_names = set()
+        
+        frontier = [directory]
+        is_root_level = True
+        while frontier:
+            next_frontier = []
+            for root, files, dirs, linked_dirs in _walk_executor().map(PythonUtils._scan_directory, frontier):
+                if is_root_level:
+                    root_names.update(files, dirs, linked_dirs)
+                for file in files:
+                    PythonUtils._classify_python_file(python_files, root, file, include_tests)
+                next_frontier.extend(
+                    os.path.join(root, name) for name in dirs if not PythonUtils._is_excluded_dir(name)
+                )
+            frontier = next_frontier
+            is_root_level = False
+        
+        return python_files, root_names
+    
+    @staticmethod
+    def _scan_directory(directory: str) -> Tuple[str, List[str], List[str], List[str]]:
+        """
+        Lee un directorio con una sola llamada a os.scandir
+        
+        Args:
+            directory: Directorio a leer
+            
+        Returns:
+            Tupla (directorio, archivos, subdirectorios, enlaces simbólicos a directorios)
+        """
+        files = []
+        dirs = []
+        linked_dirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(entry.name)
+                    elif entry.is_symlink():
+                        # Igual que os.walk: no se siguen enlaces simbólicos a directorios
+                        linked_dirs.append(entry.name)
+                    else:
+                        dirs.append(entry.name)
+        except OSError:
+            pass
+        return directory, files, dirs, linked_dirs
+    
+    @staticmethod
+    def _is_excluded_dir(name: str) -> bool:
+        """
+        Indica si un directorio debe omitirse al buscar archivos Python
+        
+        Args:
+            name: Nombre del directorio
+            
+        Returns:
+            True si debe omitirse
+        """
+        return name.startswith('.') or name in ['__pycache__', 'venv', 'env']
+    
+    @staticmethod
+    def _classify_python_file(python_files: Dict[str, List[str]], root: str, file: str,
+                              include_tests: bool) -> None:
+        """
+        Añade un archivo a la categoría que le corresponde
+        
+        Args:
+            python_files: Archivos organizados por tipo (se modifica)
+            root: Directorio que contiene el archivo
+            file: Nombre del archivo
+            include_tests: Si incluir archivos de test
+        """
+        kind = PythonUtils._python_file_kind(file, include_tests)
+        if kind is not None:
+            python_files[kind].append(os.path.join(root, file))
+    
+    @staticmethod
+    def _python_file_kind(file: str, include_tests: bool) -> Optional[str]:
+        """
+        Determina la categoría de un archivo
+        
+        Args:
+            file: Nombre del archivo
+            include_tests: Si incluir archivos de test
+            
+        Returns:
+            Categoría (clave de FILE_KINDS) o None si el archivo no interesa
+        """
+        if not file.endswith(PythonUtils._SRC_SUFFIXES):
+            # Verificar archivos de configuración
+            if file in PythonUtils._CONFIG_NAMES:
+                return "config_files"
+            return None
+        
+        # Determinar tipo de archivo según los patrones de PYTHON_PATTERNS["test_files"]
+        is_test = (
+            file.startswith(PythonUtils._TEST_PREFIXES)
+            or file.endswith(PythonUtils._TEST_SUFFIXES)
+            or file in PythonUtils._TEST_NAMES
+        )
+        
+        if is_test and include_tests:
+            return "test_files"
+        elif not is_test:
+            return "source_files"
+        else:
+            return "other_files"
+    
     @staticmethod
     def detect_testing_framework(project_path: str) -> Dict[str, Any]:
         """
         Detecta qué framework de testing usa el proyecto
         
+        El resultado se reutiliza mientras no cambie la firma del proyecto
+        (ver project_signature).
+        
+        Args:
+            project_path: Directorio del proyecto
+            
+        Returns:
+            Información sobre el framework detectado
+        """
+        signature = PythonUtils.project_signature(project_path)
+        if signature is None:
+            python_files = PythonUtils.find_python_files(project_path)
+            return PythonUtils._detect_framework(project_path, python_files)
+        
+        key = (os.path.abspath(project_path), signature)
+        detected = _FRAMEWORK_CACHE.get(key)
+        if detected is None:
+            python_files = PythonUtils.find_python_files(project_path)
+            detected = PythonUtils._detect_framework(project_path, python_files)
+            _FRAMEWORK_CACHE[key] = detected
+            if len(_FRAMEWORK_CACHE) > _FRAMEWORK_CACHE_MAX:
+                _FRAMEWORK_CACHE.pop(next(iter(_FRAMEWORK_CACHE)))
+        
+        return {
+            **detected,
+            "frameworks_found": list(detected["frameworks_found"]),
+            "config_files_found": list(detected["config_files_found"])
+        }
+    
+    @staticmethod
+    def directory_signature(directory: str) -> Optional[tuple]:
+        """
+        Firma barata del estado de un directorio para invalidar caches
+        
+        Combina el mtime del directorio y el de sus entradas de primer nivel,
+        obtenidos con un único os.scandir. Los cambios más profundos solo se
+        detectan si alteran alguna de esas entradas.
+        
+        Args:
+            directory: Directorio a firmar
+            
+        Returns:
+            Firma comparable, o None si el directorio no se puede leer
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return (
+                    os.stat(directory).st_mtime_ns,
+                    tuple(sorted((entry.name, entry.stat().st_mtime_ns) for entry in entries))
+                )
+        except OSError:
+            return None
+    
+    @staticmethod
+    def source_tree_signature(directory: str, suffixes: Optional[Tuple[str, ...]] = None,
+                              is_excluded_dir: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Firma del contenido de un árbol para reutilizar resultados de herramientas
+        
+        A diferencia de directory_signature, cubre todos los niveles: resume la
+        ruta, el mtime y el tamaño de cada archivo fuera de los directorios
+        excluidos, así que cualquier edición, alta o baja la cambia.
+        
+        Args:
+            directory: Directorio raíz
+            suffixes: Extensiones que entran en la firma (None para todos los archivos)
+            is_excluded_dir: Indica por nombre qué directorios omitir (por defecto los de Python)
+            
+        Returns:
+            Resumen hexadecimal, o None si el directorio no se puede leer
+        """
+        if is_excluded_dir is None:
+            is_excluded_dir = PythonUtils._is_excluded_dir
+        digest = hashlib.blake2b(digest_size=16)
+        pending = [directory]
+        try:
+            while pending:
+                current = pending.pop()
+                with os.scandir(current) as entries:
+                    for entry in sorted(entries, key=lambda entry: entry.name):
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not is_excluded_dir(entry.name):
+                                    pending.append(entry.path)
+                                continue
+                            if suffixes is not None and not entry.name.endswith(suffixes):
+                                continue
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        digest.update(f"{entry.path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode('utf-8', 'surrogateescape'))
+        except OSError:
+            return None
+        return digest.hexdigest()
+    
+    @staticmethod
+    def project_signature(directory: str) -> Optional[tuple]:
+        """
+        Firma de un proyecto para los caches de recorridos completos
+        
+        Une directory_signature (entradas de primer nivel, incluidos los
+        entornos virtuales que source_tree_signature omite) y
+        source_tree_signature (archivos de todos los niveles), así que un
+        archivo nuevo en un subpaquete también invalida el resultado.
+        
+        Args:
+            directory: Directorio del proyecto
+            
+        Returns:
+            Firma comparable, o None si el directorio no se puede leer
+        """
+        top_level = PythonUtils.directory_signature(directory)
+        if top_level is None:
+            return None
+        tree = PythonUtils.source_tree_signature(directory)
+        if tree is None:
+            return None
+        return top_level, tree
+    
+    @staticmethod
+    def _detect_framework(project_path: str, python_files: Dict[str, List[str]],
+                          root_names: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Detecta el framework de testing a partir de archivos ya recorridos
+        
         Args:
             project_path: Directorio del proyecto
+            python_files: Archivos Python organizados por tipo
+            root_names: Entradas del directorio raíz, si ya se conocen
             
         Returns:
             Información sobre el framework detectado
@@ -331,15 +666,16 @@ class PythonUtils:
             }
             
             for config_file, framework in config_files.items():
-                config_path = os.path.join(project_path, config_file)
-                if os.path.exists(config_path):
+                if root_names is not None:
+                    found = config_file in root_names
+                else:
+                    found = os.path.exists(os.path.join(project_path, config_file))
+                if found:
                     detected["config_files_found"].append(config_file)
                     if framework not in detected["frameworks_found"]:
                         detected["frameworks_found"].append(framework)
             
             # Buscar imports en archivos de test
-            python_files = PythonUtils.find_python_files(project_path)
-            
             framework_imports = {
                 "pytest": ["import pytest", "from pytest"],
                 "unittest": ["import unittest", "from unittest"],
@@ -449,46 +785,60 @@ class PythonUtils:
         if not output:
             return ""
         
-        lines = output.split('\n')
         formatted_lines = []
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Patrones comunes para pytest
-            if framework == "pytest":
-                if "PASSED" in line:
-                    formatted_lines.append(f"✅ {line}")
-                elif "FAILED" in line:
-                    formatted_lines.append(f"❌ {line}")
-                elif "SKIPPED" in line:
-                    formatted_lines.append(f"⏭️ {line}")
-                elif "ERROR" in line:
-                    formatted_lines.append(f"💥 {line}")
-                elif line.startswith("="):
-                    formatted_lines.append(f"📋 {line}")
-                elif "collected" in line:
-                    formatted_lines.append(f"🔍 {line}")
-                else:
-                    formatted_lines.append(f"   {line}")
-            
-            # Patrones para unittest
-            elif framework == "unittest":
-                if line.startswith("OK"):
-                    formatted_lines.append(f"✅ {line}")
-                elif "FAIL:" in line or "ERROR:" in line:
-                    formatted_lines.append(f"❌ {line}")
-                elif line.startswith("Ran"):
-                    formatted_lines.append(f"📊 {line}")
-                else:
-                    formatted_lines.append(f"   {line}")
+        for line in output.split('\n'):
+            formatted = PythonUtils.format_test_line(line, framework)
+            if formatted is not None:
+                formatted_lines.append(formatted)
+        
+        return '\n'.join(formatted_lines)
+    
+    @staticmethod
+    def format_test_line(line: str, framework: str = "pytest") -> Optional[str]:
+        """
+        Formatea una línea de salida de tests
+        
+        Args:
+            line: Línea cruda
+            framework: Framework usado
             
+        Returns:
+            Línea formateada, o None si la línea está vacía
+        """
+        line = line.strip()
+        if not line:
+            return None
+        
+        # Patrones comunes para pytest
+        if framework == "pytest":
+            if "PASSED" in line:
+                return f"✅ {line}"
+            elif "FAILED" in line:
+                return f"❌ {line}"
+            elif "SKIPPED" in line:
+                return f"⏭️ {line}"
+            elif "ERROR" in line:
+                return f"💥 {line}"
+            elif line.startswith("="):
+                return f"📋 {line}"
+            elif "collected" in line:
+                return f"🔍 {line}"
             else:
-                formatted_lines.append(f"   {line}")
+                return f"   {line}"
+        
+        # Patrones para unittest
+        elif framework == "unittest":
+            if line.startswith("OK"):
+                return f"✅ {line}"
+            elif "FAIL:" in line or "ERROR:" in line:
+                return f"❌ {line}"
+            elif line.startswith("Ran"):
+                return f"📊 {line}"
+            else:
+                return f"   {line}"
         
-        return '\n'.join(formatted_lines)
+        return f"   {line}"
     
     @staticmethod
     def format_lint_output(output: str, linter: str = "flake8") -> str:
@@ -505,40 +855,53 @@ class PythonUtils:
         if not output:
             return "✅ No se encontraron problemas de linting"
         
-        lines = output.split('\n')
         formatted_lines = []
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if linter == "flake8":
-                # flake8 format: file:line:col: code message
-                if re.match(r'.+:\d+:\d+: \w+ .+', line):
-                    # Determinar severidad por código
-                    if ' E' in line:  # Error
-                        formatted_lines.append(f"❌ {line}")
-                    elif ' W' in line:  # Warning
-                        formatted_lines.append(f"⚠️ {line}")
-                    else:
-                        formatted_lines.append(f"ℹ️ {line}")
-                else:
-                    formatted_lines.append(f"   {line}")
+        for line in output.split('\n'):
+            formatted = PythonUtils.format_lint_line(line, linter)
+            if formatted is not None:
+                formatted_lines.append(formatted)
+        
+        return '\n'.join(formatted_lines)
+    
+    @staticmethod
+    def format_lint_line(line: str, linter: str = "flake8") -> Optional[str]:
+        """
+        Formatea una línea de salida de linting
+        
+        Args:
+            line: Línea cruda
+            linter: Linter usado
             
-            elif linter == "pylint":
-                if line.startswith("*"):
-                    formatted_lines.append(f"📁 {line}")
-                elif "error" in line.lower():
-                    formatted_lines.append(f"❌ {line}")
-                elif "warning" in line.lower():
-                    formatted_lines.append(f"⚠️ {line}")
-                elif "convention" in line.lower():
-                    formatted_lines.append(f"ℹ️ {line}")
+        Returns:
+            Línea formateada, o None si la línea está vacía
+        """
+        line = line.strip()
+        if not line:
+            return None
+        
+        if linter == "flake8":
+            # flake8 format: file:line:col: code message
+            if re.match(r'.+:\d+:\d+: \w+ .+', line):
+                # Determinar severidad por código
+                if ' E' in line:  # Error
+                    return f"❌ {line}"
+                elif ' W' in line:  # Warning
+                    return f"⚠️ {line}"
                 else:
-                    formatted_lines.append(f"   {line}")
-            
+                    return f"ℹ️ {line}"
+            return f"   {line}"
+        
+        elif linter == "pylint":
+            if line.startswith("*"):
+                return f"📁 {line}"
+            elif "error" in line.lower():
+                return f"❌ {line}"
+            elif "warning" in line.lower():
+                return f"⚠️ {line}"
+            elif "convention" in line.lower():
+                return f"ℹ️ {line}"
             else:
-                formatted_lines.append(f"   {line}")
+                return f"   {line}"
         
-        return '\n'.join(formatted_lines)
+        return f"   {line}"
@@ -0,0 +1,32 @@
+"""
+Serialización JSON de respuestas para MCP Code Manager
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+def dumps_json(data: Any) -> str:
+    """
+    Serializa una respuesta a JSON indentado conservando caracteres no ASCII
+    
+    Usa orjson si está instalado (admitiendo claves no str, como json) y
+    recurre a json de la librería estándar para lo que orjson no admite
+    (enteros de más de 64 bits).
+    Los valores no serializables (Path, datetime...) se convierten con str().
+    
+    Args:
+        data: Datos a serializar
+        
+    Returns:
+        Texto JSON con indentación de 2 espacios
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2, default=str)
@@ -0,0 +1,43 @@
+"""
+Decorador de errores para los adaptadores de tools MCP
+"""
+import functools
+from typing import Callable, Tuple, Type
+
+from mcp.types import TextContent
+
+def tool_error_response(
+    prefix: str,
+    log_errors: bool = False,
+    handled: Tuple[Type[BaseException], ...] = (Exception,)
+) -> Callable:
+    """
+    Convierte cualquier excepción del adaptador en una respuesta de texto
+    
+    Los adaptadores de los mixins no propagan errores al servidor: devuelven
+    un único TextContent con el prefijo y el mensaje de la excepción.
+    
+    Args:
+        prefix: Texto que precede al mensaje del error (p. ej. "❌ Error copiando archivo")
+        log_errors: Si registrar además el error con self.logger del servidor
+        handled: Excepciones que se convierten en respuesta; el resto se propaga
+            al dispatcher de tools, que las registra como fallo de la herramienta
+    """
+    # El encabezado del mensaje es fijo: se compone una vez al decorar
+    head = f"{prefix}: "
+    
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except handled as e:
+                logger = getattr(args[0], "logger", None) if (log_errors and args) else None
+                if logger is not None:
+                    logger.log_error(e, f"Error en {func.__name__}", {
+                        "args": [str(arg) for arg in args[1:]],
+                        "kwargs": {key: str(value) for key, value in kwargs.items()}
+                    })
+                return [TextContent(type="text", text=head + str(e))]
+        return wrapper
+    return decorator
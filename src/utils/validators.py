@@ -3,12 +3,16 @@ Validadores para MCP Code Manager
 """
 import re
 import os
-from typing import List, Optional
+from typing import List, NewType, Optional
 from urllib.parse import urlparse
 from pathlib import Path
 
 from .exceptions import ValidationError
 
+# Valores ya validados: GitManager los recibe tal cual y no vuelve a validarlos
+ValidatedBranchName = NewType('ValidatedBranchName', str)
+ValidatedCommitMessage = NewType('ValidatedCommitMessage', str)
+
 def validate_repo_url(url: str) -> str:
     """
     Valida una URL de repositorio Git
@@ -146,7 +150,7 @@ def validate_element_type(element_type: str) -> str:
     
     return element_type
 
-def validate_git_branch_name(branch_name: str) -> str:
+def validate_git_branch_name(branch_name: str) -> ValidatedBranchName:
     """
     Valida un nombre de rama Git
     
@@ -180,9 +184,9 @@ def validate_git_branch_name(branch_name: str) -> str:
     if any(re.search(pattern, branch_name) for pattern in invalid_patterns):
         raise ValidationError(f"Nombre de rama contiene patrones inválidos: {branch_name}")
     
-    return branch_name
+    return ValidatedBranchName(branch_name)
 
-def validate_commit_message(message: str) -> str:
+def validate_commit_message(message: str) -> ValidatedCommitMessage:
     """
     Valida un mensaje de commit
     
@@ -206,7 +210,7 @@ def validate_commit_message(message: str) -> str:
     if len(message) > 500:
         raise ValidationError("Mensaje de commit no puede exceder 500 caracteres")
     
-    return message
+    return ValidatedCommitMessage(message)
 
 def validate_file_content(content: str, file_path: str = None) -> str:
     """
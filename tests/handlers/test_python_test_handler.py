@@ -0,0 +1,34 @@
+"""
+Tests para PythonTestHandler
+"""
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.handlers import python_test_handler
+from src.handlers.python_test_handler import PythonTestHandler
+
+class TestEnvironmentProbeCache:
+    """Tests para la invalidación del sondeo de entorno"""
+    
+    @pytest.fixture
+    def handler(self, tmp_path, monkeypatch):
+        """Fixture para PythonTestHandler con servicio y repositorio simulados"""
+        monkeypatch.setattr(python_test_handler, "_ENV_PROBE_CACHE", {})
+        handler = PythonTestHandler()
+        handler.python_service = MagicMock()
+        handler.python_service.install_packages = AsyncMock(return_value={
+            "message": "ok", "packages": ["requests"], "output": ""
+        })
+        handler._get_repo_path = AsyncMock(return_value=str(tmp_path))
+        return handler
+    
+    @pytest.mark.asyncio
+    async def test_install_in_subproject_invalidates_repo_probe(self, handler, tmp_path):
+        """Instalar en un subdirectorio descarta el sondeo guardado para el repositorio"""
+        python_test_handler._ENV_PROBE_CACHE[str(tmp_path)] = (time.monotonic(), {"has_python": True})
+        
+        await handler.install_packages("repo", ["requests"], venv_name="venv", base_path="backend")
+        
+        assert str(tmp_path) not in python_test_handler._ENV_PROBE_CACHE
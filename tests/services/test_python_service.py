@@ -0,0 +1,129 @@
+"""
+Tests para PythonService
+"""
+import asyncio
+
+import pytest
+
+from src.services.python_service import LintStreamParser, PytestStreamParser, PythonService
+from src.services import python_service
+
+# La excepción tal como la importa el servicio (utils.exceptions, no src.utils.exceptions)
+CodeAnalysisError = python_service.CodeAnalysisError
+
+class TestOutputStreamParsers:
+    """Tests para la conservación de la salida cruda"""
+    
+    def test_flake8_keeps_raw_output_beyond_issue_limit(self):
+        """La salida cruda de flake8 conserva todas las líneas aunque issues se limite a 20"""
+        parser = LintStreamParser("flake8")
+        lines = [f"mod.py:{i}:1: E501 line too long" for i in range(1, 31)]
+        for line in lines:
+            parser.feed(line)
+        
+        assert parser.raw_output == "\n".join(lines)
+        assert parser.analysis()["total_issues"] == 30
+        assert len(parser.analysis()["issues"]) == 20
+    
+    def test_pytest_keeps_raw_output_by_default(self):
+        """La salida cruda de pytest se conserva aunque no sea verbose"""
+        parser = PytestStreamParser()
+        parser.feed("tests/test_a.py ..")
+        parser.feed("===== 2 passed in 0.01s =====")
+        
+        assert parser.raw_output == "tests/test_a.py ..\n===== 2 passed in 0.01s ====="
+        assert parser.analysis()["summary"]["passed"] == 2
+    
+    def test_trimmed_parser_drops_raw_output(self):
+        """Con keep_raw=False la salida cruda no se conserva"""
+        parser = PytestStreamParser(keep_raw=False)
+        parser.feed("===== 1 failed in 0.01s =====")
+        
+        assert parser.raw_output == ""
+        assert parser.analysis()["summary"]["failed"] == 1
+
+class TestInstallBatching:
+    """Tests para la agrupación de instalaciones en un mismo entorno virtual"""
+    
+    @pytest.fixture
+    def service(self):
+        """Fixture para PythonService con pip simulado"""
+        service = PythonService()
+        service.pip_calls = []
+        service.release = asyncio.Event()
+        
+        async def fake_pip_install(packages, venv_path=None, requirements_file=None):
+            service.pip_calls.append(list(packages))
+            if len(service.pip_calls) == 1:
+                await service.release.wait()
+            if "bad-package" in packages:
+                raise CodeAnalysisError("Error instalando paquetes: bad-package")
+            return {
+                "success": True,
+                "message": f"Paquetes instalados exitosamente: packages: {', '.join(packages)}",
+                "packages": packages,
+                "venv_path": venv_path,
+                "output": "ok"
+            }
+        
+        service._pip_install = fake_pip_install
+        return service
+    
+    @pytest.mark.asyncio
+    async def test_single_install_starts_immediately(self, service):
+        """Una instalación sin otras en curso llama a pip enseguida"""
+        task = asyncio.ensure_future(service.install_packages(["requests"], "/tmp/venv"))
+        await asyncio.sleep(0.01)
+        
+        assert service.pip_calls == [["requests"]]
+        service.release.set()
+        result = await task
+        assert result["packages"] == ["requests"]
+    
+    @pytest.mark.asyncio
+    async def test_installs_during_pip_run_share_next_batch(self, service):
+        """Las peticiones que llegan mientras pip trabaja se instalan juntas después"""
+        first = asyncio.ensure_future(service.install_packages(["requests"], "/tmp/venv"))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(service.install_packages(["flask"], "/tmp/venv"))
+        third = asyncio.ensure_future(service.install_packages(["Flask", "black"], "/tmp/venv"))
+        await asyncio.sleep(0.01)
+        service.release.set()
+        
+        results = await asyncio.gather(first, second, third)
+        
+        assert service.pip_calls == [["requests"], ["flask", "black"]]
+        assert results[1]["packages"] == ["flask"]
+        assert results[1]["message"] == "Paquetes instalados exitosamente: packages: flask"
+        assert results[2]["packages"] == ["Flask", "black"]
+    
+    @pytest.mark.asyncio
+    async def test_failed_batch_retries_each_request(self, service):
+        """Un paquete erróneo en el lote solo hace fallar a la petición que lo pidió"""
+        first = asyncio.ensure_future(service.install_packages(["requests"], "/tmp/venv"))
+        await asyncio.sleep(0.01)
+        good = asyncio.ensure_future(service.install_packages(["flask"], "/tmp/venv"))
+        bad = asyncio.ensure_future(service.install_packages(["bad-package"], "/tmp/venv"))
+        await asyncio.sleep(0.01)
+        service.release.set()
+        
+        await first
+        assert (await good)["packages"] == ["flask"]
+        with pytest.raises(CodeAnalysisError, match="bad-package"):
+            await bad
+        assert ["flask"] in service.pip_calls[2:]
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_request_does_not_cancel_batch(self, service):
+        """Cancelar una petición no cancela la instalación de las demás del lote"""
+        first = asyncio.ensure_future(service.install_packages(["requests"], "/tmp/venv"))
+        await asyncio.sleep(0.01)
+        cancelled = asyncio.ensure_future(service.install_packages(["flask"], "/tmp/venv"))
+        other = asyncio.ensure_future(service.install_packages(["black"], "/tmp/venv"))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        service.release.set()
+        
+        await first
+        assert (await other)["packages"] == ["black"]
+        assert service.pip_calls == [["requests"], ["flask", "black"]]
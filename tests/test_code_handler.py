@@ -0,0 +1,88 @@
+"""
+Tests para CodeHandler
+"""
+import os
+import tempfile
+
+import pytest
+
+from src.handlers import code_handler
+from src.handlers.code_handler import CodeHandler
+
+USER_CS = """namespace App
+{
+    public class User
+    {
+        public int Id { get; set; }
+        public void Save() { }
+    }
+}
+"""
+
+class TestCodeHandler:
+    """Tests para el CodeHandler sobre una solución C# temporal"""
+    
+    @pytest.fixture
+    def handler(self, monkeypatch):
+        """Fixture para CodeHandler con la cache de resultados vacía"""
+        monkeypatch.setattr(code_handler, "_RESULT_CACHE", {})
+        return CodeHandler()
+    
+    @pytest.fixture
+    def repo_path(self):
+        """Fixture para un repositorio con una clase C#"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "User.cs"), 'w') as f:
+                f.write(USER_CS)
+            yield temp_dir
+    
+    @pytest.mark.asyncio
+    async def test_cached_result_is_not_shared(self, handler, repo_path):
+        """Modificar un resultado devuelto no altera el que se sirve desde la cache"""
+        first = await handler.find_class(repo_path, "User")
+        first["analysis"]["methods"].clear()
+        
+        second = await handler.find_class(repo_path, "User")
+        second["analysis"]["properties"].clear()
+        
+        third = await handler.find_class(repo_path, "User")
+        assert [method["name"] for method in third["analysis"]["methods"]] == ["Save"]
+        assert [prop["name"] for prop in third["analysis"]["properties"]] == ["Id"]
+    
+    @pytest.mark.asyncio
+    async def test_find_classes_reports_each_name(self, handler, repo_path):
+        """find_classes devuelve un resultado o un error por cada nombre pedido"""
+        results = await handler.find_classes(repo_path, ["User", "Order", "bad name!"])
+        
+        assert results["User"]["file_path"] == "User.cs"
+        assert "no encontrada" in results["Order"]["error"]
+        assert "inválido" in results["bad name!"]["error"]
+    
+    @pytest.mark.asyncio
+    async def test_find_elements_batch_matches_single_search(self, handler, repo_path):
+        """find_elements_batch devuelve lo mismo que find_elements nombre a nombre"""
+        results = await handler.find_elements_batch(repo_path, "class", ["User", "Order"])
+        
+        assert results["User"] == await handler.find_elements(repo_path, "class", "User")
+        assert results["Order"] == []
+    
+    @pytest.mark.asyncio
+    async def test_cache_discarded_when_sources_change(self, handler, repo_path):
+        """Añadir un archivo .cs invalida los resultados cacheados del repositorio"""
+        assert await handler.find_elements(repo_path, "class", "Order") == []
+        with open(os.path.join(repo_path, "Order.cs"), 'w') as f:
+            f.write("namespace App\n{\n    public class Order { }\n}\n")
+        
+        results = await handler.find_elements(repo_path, "class", "Order")
+        
+        assert [element["file_path"] for element in results] == ["Order.cs"]
+    
+    @pytest.mark.asyncio
+    async def test_undecodable_file_name(self, handler, repo_path):
+        """Un archivo .cs cuyo nombre no es UTF-8 válido no impide las búsquedas"""
+        with open(os.path.join(os.fsencode(repo_path), b"A\xff.cs"), 'w') as f:
+            f.write("class Other { }\n")
+        
+        result = await handler.find_class(repo_path, "User")
+        
+        assert result["file_path"] == "User.cs"
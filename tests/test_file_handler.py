@@ -215,6 +215,53 @@ class TestFileHandler:
                 repo_url="https://github.com/invalid/repo.git"
             )
     
+    @pytest.mark.asyncio
+    async def test_write_file_creates_new_file(self, file_handler, mock_repo_path):
+        """Test write_file crea el archivo si no existe"""
+        file_handler.file_manager.get_repo_path = AsyncMock(return_value=mock_repo_path)
+        
+        result = await file_handler.write_file(
+            repo_url="https://github.com/test/repo.git",
+            file_path="src/Models/Order.cs",
+            content="public class Order { }"
+        )
+        
+        assert result["status"] == "created"
+        with open(os.path.join(mock_repo_path, "src", "Models", "Order.cs")) as f:
+            assert f.read() == "public class Order { }"
+    
+    @pytest.mark.asyncio
+    async def test_write_file_updates_existing_file(self, file_handler, mock_repo_path):
+        """Test write_file actualiza el archivo si ya existe, resolviendo el repositorio una sola vez"""
+        file_handler.file_manager.get_repo_path = AsyncMock(return_value=mock_repo_path)
+        
+        result = await file_handler.write_file(
+            repo_url="https://github.com/test/repo.git",
+            file_path="src/Models/User.cs",
+            content="public class User { }\n"
+        )
+        
+        assert result["status"] == "updated"
+        assert result["changes"]["new_size"] == len("public class User { }\n")
+        assert file_handler.file_manager.get_repo_path.await_count == 1
+        with open(os.path.join(mock_repo_path, "src", "Models", "User.cs")) as f:
+            assert f.read() == "public class User { }\n"
+    
+    @pytest.mark.asyncio
+    async def test_write_file_with_resolved_repo_path(self, file_handler, mock_repo_path):
+        """Test write_file no resuelve el repositorio si recibe la ruta ya resuelta"""
+        file_handler.file_manager.get_repo_path = AsyncMock(return_value=mock_repo_path)
+        
+        result = await file_handler.write_file(
+            repo_url="https://github.com/test/repo.git",
+            file_path="Program.cs",
+            content="// nuevo",
+            repo_path=mock_repo_path
+        )
+        
+        assert result["status"] == "updated"
+        file_handler.file_manager.get_repo_path.assert_not_awaited()
+    
     def test_matches_exclude_pattern(self, file_handler):
         """Test función de coincidencia de patrones de exclusión"""
         assert file_handler._matches_exclude_pattern("bin", "bin") == True
@@ -0,0 +1,210 @@
+"""
+Tests para GitHandler
+"""
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+from git import Repo
+
+from src.handlers.git_handler import GitHandler
+
+# GitHandler importa el servicio relativo a src
+git_manager_module = sys.modules["services.git_manager"]
+
+class TestGitHandler:
+    """Tests para el GitHandler sobre repositorios locales reales"""
+
+    @pytest.fixture
+    def git_handler(self):
+        """Fixture para GitHandler"""
+        return GitHandler()
+
+    @pytest.fixture
+    def repo_path(self):
+        """Fixture para un repositorio Git temporal con un commit inicial"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            repo = Repo.init(temp_dir)
+            with repo.config_writer() as config:
+                config.set_value("user", "name", "Test User")
+                config.set_value("user", "email", "test@example.com")
+
+            with open(os.path.join(temp_dir, "README.md"), 'w') as f:
+                f.write("# Test\n")
+            repo.index.add(["README.md"])
+            repo.index.commit("Initial commit")
+
+            yield temp_dir
+
+    @pytest.mark.asyncio
+    async def test_commit_all_counts_files(self, git_handler, repo_path):
+        """Test commit_all añade modificados y nuevos y cuenta los archivos"""
+        with open(os.path.join(repo_path, "README.md"), 'a') as f:
+            f.write("Más texto\n")
+        with open(os.path.join(repo_path, "Program.cs"), 'w') as f:
+            f.write("class Program { }\n")
+
+        result = await git_handler.commit_all(repo_path, "Add Program")
+
+        assert result["status"] == "committed"
+        assert result["files_changed"] == 2
+        assert Repo(repo_path).head.commit.message.strip() == "Add Program"
+
+    @pytest.mark.asyncio
+    async def test_commit_all_ignores_user_locale(self, git_handler, repo_path, monkeypatch):
+        """Test commit_all interpreta la salida de git aunque el usuario use otro idioma"""
+        monkeypatch.setenv("LC_ALL", "es_ES.UTF-8")
+        monkeypatch.setenv("LANGUAGE", "es")
+        with open(os.path.join(repo_path, "Program.cs"), 'w') as f:
+            f.write("class Program { }\n")
+
+        result = await git_handler.commit_all(repo_path, "Add Program")
+
+        assert result["files_changed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_commit_all_nothing_to_commit(self, git_handler, repo_path):
+        """Test commit_all sin cambios devuelve un error claro"""
+        with pytest.raises(Exception, match="No hay cambios staged"):
+            await git_handler.commit_all(repo_path, "Empty commit")
+
+    @pytest.mark.asyncio
+    async def test_commit_all_runs_hooks(self, git_handler, repo_path):
+        """Test commit_all ejecuta los hooks del repositorio, igual que commit_changes"""
+        head = Repo(repo_path).head.commit.hexsha
+        hook_path = os.path.join(repo_path, ".git", "hooks", "pre-commit")
+        with open(hook_path, 'w') as f:
+            f.write("#!/bin/sh\necho 'rechazado por el hook' >&2\nexit 1\n")
+        os.chmod(hook_path, os.stat(hook_path).st_mode | stat.S_IXUSR)
+        with open(os.path.join(repo_path, "Program.cs"), 'w') as f:
+            f.write("class Program { }\n")
+
+        with pytest.raises(Exception, match="rechazado por el hook"):
+            await git_handler.commit_all(repo_path, "Add Program")
+
+        assert Repo(repo_path).head.commit.hexsha == head
+
+    @pytest.fixture
+    def repo_with_origin(self, repo_path):
+        """Fixture para un repositorio con origin un commit por delante"""
+        with tempfile.TemporaryDirectory() as remote_dir:
+            origin = Repo.init(remote_dir, bare=True)
+            local = Repo(repo_path)
+            local.create_remote("origin", remote_dir)
+            local.git.push("origin", local.active_branch.name)
+
+            # Otro clon sube un commit que el repositorio local aún no tiene
+            with tempfile.TemporaryDirectory() as other_dir:
+                other = Repo.clone_from(remote_dir, other_dir)
+                with other.config_writer() as config:
+                    config.set_value("user", "name", "Other User")
+                    config.set_value("user", "email", "other@example.com")
+                with open(os.path.join(other_dir, "Other.cs"), 'w') as f:
+                    f.write("class Other { }\n")
+                other.index.add(["Other.cs"])
+                other.index.commit("Add Other")
+                other.git.push("origin", local.active_branch.name)
+                other.close()
+
+            yield repo_path
+            origin.close()
+
+    @pytest.mark.asyncio
+    async def test_status_fetches_origin(self, git_handler, repo_with_origin):
+        """Test status hace fetch de origin y calcula los commits pendientes"""
+        result = await git_handler.status(repo_with_origin)
+
+        assert result["clean"] is True
+        assert result["behind"] == 1
+        assert result["ahead"] == 0
+
+    @pytest.mark.asyncio
+    async def test_status_not_blocked_by_clones(self, git_handler, repo_with_origin):
+        """Test status no espera a que terminen los clones que ocupan el pool de red"""
+        release = threading.Event()
+        clones = [git_manager_module._GIT_NETWORK_EXECUTOR.submit(release.wait, 10)
+                  for _ in range(git_manager_module._GIT_NETWORK_EXECUTOR._max_workers)]
+        started = time.monotonic()
+        try:
+            result = await git_handler.status(repo_with_origin)
+            elapsed = time.monotonic() - started
+        finally:
+            release.set()
+            for clone in clones:
+                clone.result()
+
+        assert elapsed < 5
+        assert result["behind"] == 1
+
+    @pytest.mark.asyncio
+    async def test_status_fetch_timeout(self, git_handler, repo_with_origin, monkeypatch):
+        """Test un fetch lento no retiene status más allá del límite"""
+        monkeypatch.setattr(git_manager_module, "_STATUS_FETCH_TIMEOUT", 0.1)
+        monkeypatch.setattr(git_manager_module, "_fetch_origin_blocking", lambda repo_path: time.sleep(1))
+
+        started = time.monotonic()
+        result = await git_handler.status(repo_with_origin)
+
+        assert time.monotonic() - started < 1
+        assert result["clean"] is True
+        assert result["behind"] == 0
+
+    @pytest.mark.asyncio
+    async def test_log_returns_commits(self, git_handler, repo_path):
+        """Test log devuelve los commits más recientes primero"""
+        repo = Repo(repo_path)
+        with open(os.path.join(repo_path, "Program.cs"), 'w') as f:
+            f.write("class Program { }\n")
+        repo.index.add(["Program.cs"])
+        repo.index.commit("Add Program")
+
+        result = await git_handler.log(repo_path, limit=10)
+
+        assert result["total_commits"] == 2
+        assert [commit["message"] for commit in result["commits"]] == ["Add Program", "Initial commit"]
+
+    @pytest.mark.asyncio
+    async def test_list_all_refs(self, git_handler, repo_path):
+        """Test list_all_refs devuelve ramas, etiquetas y remotos en una sola llamada"""
+        repo = Repo(repo_path)
+        current = repo.active_branch.name
+        repo.create_head("feature")
+        repo.create_tag("v1.0")
+        repo.create_remote("origin", "https://example.com/repo.git")
+
+        result = await git_handler.list_all_refs(repo_path)
+
+        assert sorted(branch["name"] for branch in result["branches"]) == sorted(["feature", current])
+        assert [branch["name"] for branch in result["branches"] if branch["current"]] == [current]
+        assert [tag["name"] for tag in result["tags"]] == ["v1.0"]
+        assert result["remotes"] == [{"name": "origin", "url": "https://example.com/repo.git"}]
+
+    @pytest.mark.asyncio
+    async def test_log_without_commits(self, git_handler):
+        """Test log en una rama sin commits devuelve una lista vacía"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Repo.init(temp_dir).close()
+
+            result = await git_handler.log(temp_dir)
+
+        assert result["total_commits"] == 0
+        assert result["message"].startswith("No hay commits")
+
+    @pytest.mark.asyncio
+    async def test_log_error_after_first_commit(self, git_handler, repo_path, monkeypatch):
+        """Test un fallo leyendo el historial a mitad se informa como error, no como rama vacía"""
+        real_iter_commits = Repo.iter_commits
+
+        def failing_iter_commits(self, *args, **kwargs):
+            commits = real_iter_commits(self, *args, **kwargs)
+            yield next(commits)
+            raise ValueError("objeto corrupto")
+
+        monkeypatch.setattr(Repo, "iter_commits", failing_iter_commits)
+
+        with pytest.raises(Exception, match="objeto corrupto"):
+            await git_handler.log(repo_path)
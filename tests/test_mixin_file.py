@@ -0,0 +1,64 @@
+"""
+Tests para FileAdapterMixin
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+from git import Repo
+
+# Los mixins importan los handlers relativos a src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from handlers.git_handler import GitHandler
+from mixin_file import FileAdapterMixin
+from mixin_git import GitAdapterMixin
+
+class _Adapters(GitAdapterMixin, FileAdapterMixin):
+    """Servidor mínimo con las herramientas de Git y de archivos"""
+    
+    def __init__(self):
+        super().__init__()
+        self.git_handler = GitHandler()
+
+class TestFileToolsInvalidateGitStatus:
+    """Tests para la coherencia entre las herramientas de archivos y git status"""
+    
+    @pytest.fixture
+    def repo_path(self):
+        """Fixture para un repositorio Git temporal con un commit inicial"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            repo = Repo.init(temp_dir)
+            with repo.config_writer() as config:
+                config.set_value("user", "name", "Test User")
+                config.set_value("user", "email", "test@example.com")
+            with open(os.path.join(temp_dir, "README.md"), 'w') as f:
+                f.write("# Test\n")
+            repo.index.add(["README.md"])
+            repo.index.commit("Initial commit")
+            repo.close()
+            yield temp_dir
+    
+    @pytest.fixture
+    def adapters(self):
+        """Fixture para el servidor mínimo"""
+        return _Adapters()
+    
+    @pytest.mark.asyncio
+    async def test_status_after_write_file(self, adapters, repo_path):
+        """Escribir un archivo justo después de un status limpio se refleja en el siguiente status"""
+        assert "limpio" in (await adapters._git_status(repo_path))[0].text
+        
+        await adapters._set_file_content_enhanced("", os.path.join(repo_path, "Program.cs"), "class Program { }\n")
+        
+        assert "1 untracked" in (await adapters._git_status(repo_path))[0].text
+    
+    @pytest.mark.asyncio
+    async def test_status_after_delete_file(self, adapters, repo_path):
+        """Borrar un archivo versionado se refleja en el siguiente status"""
+        assert "limpio" in (await adapters._git_status(repo_path))[0].text
+        
+        await adapters._delete_file("", os.path.join(repo_path, "README.md"))
+        
+        assert "limpio" not in (await adapters._git_status(repo_path))[0].text
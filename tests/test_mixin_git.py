@@ -0,0 +1,68 @@
+"""
+Tests para GitAdapterMixin
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Los mixins importan los handlers relativos a src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mixin_git import GitAdapterMixin
+
+class TestCachedGitRead:
+    """Tests para las lecturas Git compartidas entre llamadas concurrentes"""
+    
+    @pytest.fixture
+    def adapters(self):
+        """Fixture para el adaptador Git"""
+        return GitAdapterMixin()
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_follower(self, adapters, tmp_path):
+        """Cancelar a quien lanzó la lectura no cancela a quien esperaba el mismo resultado"""
+        calls = []
+        release = asyncio.Event()
+        
+        async def read():
+            calls.append(len(calls))
+            await release.wait()
+            return {"success": True, "call": len(calls)}
+        
+        key = (str(tmp_path), "status")
+        leader = asyncio.ensure_future(adapters._cached_git_read(key, 2.0, read))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(adapters._cached_git_read(key, 2.0, read))
+        await asyncio.sleep(0.01)
+        
+        leader.cancel()
+        await asyncio.sleep(0.01)
+        release.set()
+        
+        assert (await follower)["success"] is True
+        assert leader.cancelled()
+        assert len(calls) == 2
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_follower_keeps_leader_running(self, adapters, tmp_path):
+        """Cancelar a quien esperaba no afecta a la lectura en curso"""
+        release = asyncio.Event()
+        
+        async def read():
+            await release.wait()
+            return {"success": True}
+        
+        key = (str(tmp_path), "status")
+        leader = asyncio.ensure_future(adapters._cached_git_read(key, 2.0, read))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(adapters._cached_git_read(key, 2.0, read))
+        await asyncio.sleep(0.01)
+        
+        follower.cancel()
+        release.set()
+        
+        assert (await leader)["success"] is True
+        with pytest.raises(asyncio.CancelledError):
+            await follower
@@ -0,0 +1,93 @@
+"""
+Tests para PythonAdapterMixin
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+from mcp.types import TextContent
+
+# Los mixins importan los handlers relativos a src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import mixin_python
+from mixin_python import PythonAdapterMixin
+
+class _Adapters(PythonAdapterMixin):
+    """Adaptador con tools python_* simuladas que registran la concurrencia"""
+    
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+    
+    async def _python_freeze(self, repo_url: str, **kwargs):
+        """Simula python_freeze con una pequeña espera"""
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return [TextContent(type="text", text=f"freeze {repo_url}")]
+    
+    async def _python_lint(self, repo_url: str, **kwargs):
+        """Simula un python_lint que falla"""
+        raise RuntimeError("flake8 no disponible")
+
+class TestPythonBatch:
+    """Tests para python_batch"""
+    
+    @pytest.fixture
+    def adapters(self):
+        """Fixture para el adaptador simulado"""
+        return _Adapters()
+    
+    @staticmethod
+    def _texts(response):
+        """Textos de la respuesta de python_batch"""
+        return [content.text for content in response]
+    
+    @pytest.mark.asyncio
+    async def test_results_in_request_order(self, adapters):
+        """Las respuestas siguen el orden pedido e incluyen los errores de cada operación"""
+        response = await adapters._python_batch([
+            {"tool": "python_lint", "arguments": {"repo_url": "a"}},
+            {"tool": "python_freeze", "arguments": {"repo_url": "b"}},
+        ])
+        
+        assert self._texts(response) == [
+            "▶️ **python_lint**", "❌ Error en python_lint: flake8 no disponible",
+            "▶️ **python_freeze**", "freeze b",
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_entries_do_not_abort_batch(self, adapters):
+        """Las entradas mal formadas se informan sin impedir el resto del lote"""
+        response = await adapters._python_batch([
+            "python_freeze",
+            {"tool": "python_unknown"},
+            {"tool": "python_freeze", "arguments": ["b"]},
+            {"tool": "python_freeze", "arguments": {"repo_url": "c"}},
+        ])
+        texts = self._texts(response)
+        
+        assert texts[0] == "▶️ **#1**" and "inválida" in texts[1]
+        assert "no admitida" in texts[3]
+        assert "Argumentos inválidos" in texts[5]
+        assert texts[6:] == ["▶️ **python_freeze**", "freeze c"]
+    
+    @pytest.mark.asyncio
+    async def test_non_list_operations(self, adapters):
+        """Un valor que no es una lista se rechaza con un mensaje claro"""
+        response = await adapters._python_batch({"tool": "python_freeze"})
+        
+        assert "lista de operaciones" in response[0].text
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, adapters):
+        """No se ejecutan más de _BATCH_CONCURRENCY operaciones a la vez"""
+        operations = [{"tool": "python_freeze", "arguments": {"repo_url": str(i)}} for i in range(10)]
+        
+        response = await adapters._python_batch(operations)
+        
+        assert len(response) == 20
+        assert adapters.max_running == mixin_python._BATCH_CONCURRENCY
@@ -0,0 +1,48 @@
+"""
+Tests para PythonUtils
+"""
+import os
+import tempfile
+
+import pytest
+
+from src.utils.python_utils import PythonUtils
+
+class TestProjectSignature:
+    """Tests para las firmas usadas por los caches de proyectos Python"""
+    
+    @pytest.fixture
+    def project_path(self):
+        """Fixture para un proyecto Python con un subpaquete"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.makedirs(os.path.join(temp_dir, "src", "pkg"))
+            with open(os.path.join(temp_dir, "src", "pkg", "module.py"), 'w') as f:
+                f.write("VALUE = 1\n")
+            yield temp_dir
+    
+    def test_nested_file_changes_signature(self, project_path):
+        """Un archivo nuevo en un subpaquete cambia la firma del proyecto"""
+        before = PythonUtils.project_signature(project_path)
+        with open(os.path.join(project_path, "src", "pkg", "test_new.py"), 'w') as f:
+            f.write("def test_new():\n    assert True\n")
+        
+        assert PythonUtils.project_signature(project_path) != before
+    
+    def test_new_venv_changes_signature(self, project_path):
+        """Un entorno virtual nuevo en la raíz cambia la firma aunque su contenido se omita"""
+        before = PythonUtils.project_signature(project_path)
+        os.makedirs(os.path.join(project_path, "venv", "bin"))
+        
+        assert PythonUtils.project_signature(project_path) != before
+    
+    def test_missing_directory(self):
+        """Sin directorio no hay firma"""
+        assert PythonUtils.project_signature("/nonexistent/project") is None
+    
+    def test_detect_framework_sees_nested_test(self, project_path):
+        """La detección del framework se recalcula al aparecer un test en un subpaquete"""
+        assert "pytest" not in PythonUtils.detect_testing_framework(project_path)["frameworks_found"]
+        with open(os.path.join(project_path, "src", "pkg", "test_new.py"), 'w') as f:
+            f.write("import pytest\n\ndef test_new():\n    assert True\n")
+        
+        assert "pytest" in PythonUtils.detect_testing_framework(project_path)["frameworks_found"]